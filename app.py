@@ -9,16 +9,20 @@ from flask_compress import Compress
 from flask_mail import Mail, Message
 from flask_login import LoginManager, UserMixin, current_user, login_required, login_user, logout_user
 from database import db, init_app, sync_article_counts
-from models import Article, CryptoPrice, NewsSourceMetrics, CryptoGlossary, Subscription, Users
-from markupsafe import escape, Markup
+from models import Article, ArticleSymbol, CryptoPrice, CryptoSignal, NewsSourceMetrics, CryptoGlossary, Subscription, Users
+import sentiment_buckets
+from asset_registry import ASSETS
+from coin_metadata import coin_cache
+from tooltips import annotate_summary, get_injector
+from page_cache import dashboard_cache
 from flask_socketio import SocketIO, emit
 import json
+import base64
 from datetime import datetime, timedelta
 import stripe
 from sqlalchemy import desc
 import pandas as pd
 import numpy as np
-import re
 import requests
 from functools import wraps
 
@@ -84,22 +88,23 @@ app.config['LAST_SCRAPER_RUN'] = datetime.utcnow()
 # Import CryptoPriceTracker after database initialization
 from crypto_price_tracker import CryptoPriceTracker
 
-def broadcast_new_article(article):
-    """Broadcast new article to all connected clients"""
+def broadcast_new_articles(articles):
+    """Broadcast a batch of newly stored articles to all connected clients in one event"""
+    if not articles:
+        return
     try:
-        article_data = {
-            'id': article.id,
-            'title': article.title,
-            'summary': article.summary,
-            'source_name': article.source_name,
-            'created_at': article.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            'sentiment_label': article.sentiment_label,
-            'sentiment_score': article.sentiment_score
-        }
-        socketio.emit('new_article', article_data)
-        logger.info(f"Broadcasted new article: {article.title}")
+        socketio.emit('new_articles', {'articles': [{
+            'id': article['id'],
+            'title': article['title'],
+            'summary': article['summary'],
+            'source_name': article['source_name'],
+            'created_at': article['created_at'].strftime('%Y-%m-%d %H:%M:%S'),
+            'sentiment_label': article.get('sentiment_label'),
+            'sentiment_score': article.get('sentiment_score')
+        } for article in articles]})
+        logger.info(f"Broadcasted {len(articles)} new articles")
     except Exception as e:
-        logger.error(f"Error broadcasting article: {str(e)}")
+        logger.error(f"Error broadcasting articles: {str(e)}")
 
 def check_subscription(feature='basic'):
     """
@@ -204,43 +209,28 @@ def profile():
 
 @app.route('/')
 def dashboard():
+    # Anonymous visitors all see the same page, served from the cache between pipeline writes
+    cache_key = None if current_user.is_authenticated else request.url
+    if cache_key:
+        page = dashboard_cache.get(cache_key)
+        if page:
+            return page.response(request)
+    version = dashboard_cache.version
+
     try:
         logger.info("Starting dashboard view generation")
+        # Cleared when a query fails, so a partial page isn't cached
+        complete = True
         crypto_prices = []
         recent_articles = []
         news_sources = []
 
-        # Fetch crypto prices with error handling
-        try:
-            crypto_prices = CryptoPrice.query.filter(
-                CryptoPrice.price_usd.isnot(None),
-                CryptoPrice.percent_change_24h.isnot(None)
-            ).all()
-        except Exception as e:
-            logger.error(f"Error fetching crypto prices: {str(e)}")
-
-        # Fetch articles with error handling
-        try:
-            recent_articles = Article.query.filter(
-                Article.sentiment_score.isnot(None)
-            ).order_by(Article.created_at.desc()).limit(15).all()
-        except Exception as e:
-            logger.error(f"Error fetching articles: {str(e)}")
-
-        # Fetch news sources with error handling
-        try:
-            news_sources = NewsSourceMetrics.query.order_by(
-                NewsSourceMetrics.trust_score.desc()
-            ).all()
-        except Exception as e:
-            logger.error(f"Error fetching news sources: {str(e)}")
-
         # Fetch articles with error handling
         try:
             # Get last 15 articles
             recent_articles = Article.query.filter(
                 Article.sentiment_score.isnot(None)  # Ensure sentiment score exists
-            ).order_by(Article.created_at.desc()).limit(15).all()
+            ).order_by(Article.created_at.desc(), Article.id.desc()).limit(15).all()
 
             # Set default values for any None fields
             for article in recent_articles:
@@ -253,6 +243,7 @@ def dashboard():
         except Exception as e:
             logger.error(f"Error fetching articles: {str(e)}")
             recent_articles = []
+            complete = False
 
         # Fetch crypto prices with error handling
         try:
@@ -272,6 +263,7 @@ def dashboard():
         except Exception as e:
             logger.error(f"Error fetching crypto prices: {str(e)}")
             crypto_prices = []
+            complete = False
 
         # Fetch news sources with error handling
         try:
@@ -280,63 +272,31 @@ def dashboard():
         except Exception as e:
             logger.error(f"Error fetching news sources: {str(e)}")
             news_sources = []
+            complete = False
 
-        # Calculate signals once and store them
+        # Read the signals the pipeline stored
+        crypto_signals = {}
         try:
-            cutoff_time = datetime.utcnow() - timedelta(days=3)
-
-            # Calculate signals for all prices at once and store them
-            app.crypto_signals = {}
+            crypto_signals = stored_crypto_signals()
             for price in crypto_prices:
-                try:
-                    # Calculate and cache signal
-                    signals = calculate_crypto_signals(price.symbol)
-                    app.crypto_signals[price.symbol] = signals
-                    
-                    # Update price object with signals
-                    price.signal = signals['signal']
-                    price.confidence_score = signals['confidence']
-                    price.total_articles = signals['total_articles']
-
-                except Exception as e:
-                    logger.error(f"Error calculating sentiment for {price.symbol}: {str(e)}")
-                    default_signals = {'signal': 'hold', 'confidence': 50.0, 'total_articles': 0}
-                    price.signal = default_signals['signal']
-                    price.confidence_score = default_signals['confidence']
-                    price.total_articles = default_signals['total_articles']
-                    app.crypto_signals[price.symbol] = default_signals
-
-            logger.info(f"Calculated signals for {len(crypto_prices)} cryptocurrencies")
+                # Update price object with signals
+                signals = crypto_signals.get(price.symbol) or default_signals()
+                price.signal = signals['signal']
+                price.confidence_score = signals['confidence']
+                price.total_articles = signals['total_articles']
+
+            logger.info(f"Loaded signals for {len(crypto_prices)} cryptocurrencies")
 
         except Exception as e:
             logger.error(f"Error processing crypto data: {str(e)}")
+            complete = False
 
         # Prepare articles with enhanced summaries
+        injector = get_injector(crypto_prices)
         for article in recent_articles:
             try:
-                enhanced_summary = escape(article.summary)
-                logger.debug(f"Processing article {article.id} summary: {enhanced_summary[:100]}...")
-
                 # Add crypto price tooltips to the summary
-                for crypto in crypto_prices:
-                    pattern = re.compile(r'\b' + re.escape(crypto.symbol) + r'\b', re.IGNORECASE)
-                    if pattern.search(str(enhanced_summary)):
-                        tooltip_html = Markup(
-                            f'<span class="crypto-tooltip">{crypto.symbol}'
-                            f'<div class="tooltip-content">'
-                            f'<span class="tooltip-price">${crypto.price_usd:.2f}</span>'
-                            f'<span class="tooltip-change {("positive" if crypto.percent_change_24h > 0 else "negative")}">'
-                            f'{crypto.percent_change_24h:.1f}%</span>'
-                            f'</div></span>'
-                        )
-
-                        enhanced_summary = Markup(pattern.sub(str(tooltip_html), str(enhanced_summary)))
-                        logger.debug(f"Added tooltip for whole word match {crypto.symbol} in article {article.id}")
-                        logger.debug(f"Generated tooltip HTML: {tooltip_html}")
-                    else:
-                        logger.debug(f"No whole word match found for {crypto.symbol} in article {article.id}")
-
-                article.enhanced_summary = enhanced_summary
+                article.enhanced_summary = annotate_summary(injector, article.id, article.summary)
 
             except Exception as e:
                 logger.error(f"Error processing tooltips for article {article.id}: {str(e)}")
@@ -348,13 +308,18 @@ def dashboard():
             )
 
         logger.info("Successfully prepared all data for dashboard")
-        return render_template('dashboard.html', 
+        html = render_template('dashboard.html', 
                             articles=recent_articles,
                             crypto_prices=crypto_prices,
                             news_sources=news_sources,
-                            buy_signals=app.crypto_signals, #Use app.crypto_signals now.
+                            buy_signals=crypto_signals,
+                            next_cursor=encode_cursor(recent_articles[-1].created_at, recent_articles[-1].id)
+                                        if recent_articles else None,
                             last_scraper_run=app.config['LAST_SCRAPER_RUN'],
                             ga_tracking_id=app.config['GA_TRACKING_ID'])
+        if cache_key and complete:
+            return dashboard_cache.put(cache_key, version, html).response(request)
+        return html
     except Exception as e:
         logger.error(f"Error generating dashboard: {str(e)}")
         return "Error loading dashboard", 500
@@ -400,127 +365,127 @@ def get_term_details(term_name):
         logger.error(f"Error getting term details: {str(e)}")
         return "Error loading term details", 500
 
-# Add crypto_names dictionary at the top level
-crypto_names = {
-    'BTC': 'Bitcoin',
-    'ETH': 'Ethereum',
-    'USDT': 'Tether',
-    'BNB': 'Binance Coin',
-    'SOL': 'Solana',
-    'XRP': 'Ripple',
-    'AVAX': 'Avalanche',
-    'MEME': 'Memecoin',
-    'SEI': 'Sei Network',
-    'SUI': 'Sui',
-    'BONK': 'Bonk',
-    'WLD': 'Worldcoin',
-    'PYTH': 'Pyth Network',
-    'JUP': 'Jupiter',
-    'BLUR': 'Blur',
-    'HFT': 'Hashflow',
-    'WIF': 'Wif Token',
-    'STRK': 'Starknet',
-    'TIA': 'Celestia',
-    'DYM': 'Dymension',
-    'ORDI': 'Ordinals',
-    'USDC': 'USD Coin',
-    'ADA': 'Cardano',
-    'DOGE': 'Dogecoin',
-    'TON': 'Toncoin',
-    'TRX': 'TRON',
-    'DAI': 'Dai',
-    'MATIC': 'Polygon',
-    'DOT': 'Polkadot',
-    'WBTC': 'Wrapped Bitcoin',
-    'AVAX': 'Avalanche',
-    'SHIB': 'Shiba Inu',
-    'LEO': 'LEO Token',
-    'LTC': 'Litecoin',
-    'UNI': 'Uniswap',
-    'CAKE': 'PancakeSwap',
-    'LINK': 'Chainlink',
-    'ATOM': 'Cosmos',
-    'APE': 'ApeCoin',
-    'AAVE': 'Aave',
-    'MELANX': 'Melania Token',
-    'TRUMP': 'Trump Token',
-    'TUSD': 'True USD',
-    'KLAY': 'Klaytn',
-    'GT': 'Gatetoken',
-    'CHZ': 'Chiliz',
-    'XEC': 'Ecash',
-    'BEAM': 'Beam',
-    'VRA': 'Virtuals',
-    'NEAR': 'NEAR Protocol',
-    'RNDR': 'Render Token',
-    'ICP': 'Internet Computer',
-    'TAO': 'Bittensor',
-    'MASK': 'Mask Network',
-    'HYPE': 'Hypeliquid'
-}
+# Display names by symbol, from the asset registry
+crypto_names = ASSETS.names
+# Priced symbols, offered to every template
+SUPPORTED_CRYPTOS = tuple(ASSETS.coin_ids)
+
+def articles_mentioning(symbol, since):
+    """Articles created since ``since`` that mention ``symbol``, newest first.
+
+    Served by the ``ArticleSymbol`` mention index on ``(symbol, created_at)``
+    rather than a substring scan of every article.
+    """
+    return Article.query.join(ArticleSymbol, ArticleSymbol.article_id == Article.id).filter(
+        ArticleSymbol.symbol == symbol,
+        ArticleSymbol.created_at >= since
+    ).order_by(desc(ArticleSymbol.created_at)).all()
+
+def calculate_all_crypto_signals(symbols, price_data=None):
+    """Signals for every one of ``symbols``, keyed by symbol, from a single query.
 
-def calculate_crypto_signals(symbol, related_news=None, price_data=None):
-    """Calculate unified crypto signals across the application"""
+    Reads the incrementally kept sentiment buckets rather than the window's articles,
+    weighed by ``signals_from_counts``; ``price_data`` is an optional ``{symbol: CryptoPrice}``.
+    """
+    price_data = price_data or {}
     try:
-        if related_news is None:
-            # Get related news from last 3 days for signal calculation
-            cutoff_time = datetime.utcnow() - timedelta(days=3)
-            related_news = Article.query.filter(
-                db.and_(
-                    db.or_(
-                        Article.content.ilike(f'%{symbol}%'),
-                        Article.title.ilike(f'%{symbol}%')
-                    ),
-                    Article.created_at >= cutoff_time
-                )
-            ).order_by(desc(Article.created_at)).all()
+        counts = sentiment_buckets.window_counts(symbols)
+        return {symbol: signals_from_counts(counts[symbol], price_data.get(symbol)) for symbol in counts}
+    except Exception as e:
+        logger.error(f"Error calculating signals for {len(symbols)} symbols: {str(e)}")
+        return {symbol: {'signal': 'hold', 'confidence': 50.0, 'total_articles': 0} for symbol in symbols}
 
-        total_articles = len(related_news)
+def refresh_crypto_signals():
+    """Recompute the signal of every priced symbol and store them in ``CryptoSignal``.
 
-        if total_articles > 0:
-            positive_count = sum(1 for article in related_news if article.sentiment_label == 'positive')
-            neutral_count = sum(1 for article in related_news if article.sentiment_label == 'neutral')
-            negative_count = sum(1 for article in related_news if article.sentiment_label == 'negative')
+    Called by the pipeline after sentiment processing and price updates, so requests
+    only read the stored rows and every worker process sees the same values.
+    Returns the number of signals stored.
+    """
+    try:
+        prices = {price.symbol: price for price in CryptoPrice.query.all()}
+        signals = calculate_all_crypto_signals(list(prices), prices)
+        computed_at = datetime.utcnow()
+        sentiment_buckets.prune()
+        # Replaced in one transaction, so readers see either the old or the new set
+        db.session.execute(db.delete(CryptoSignal))
+        if signals:
+            db.session.execute(CryptoSignal.__table__.insert(), [
+                dict(values, symbol=symbol, computed_at=computed_at) for symbol, values in signals.items()
+            ])
+        db.session.commit()
+        dashboard_cache.bump()
+        logger.info(f"Refreshed signals for {len(signals)} cryptocurrencies")
+        return len(signals)
+    except Exception as e:
+        logger.error(f"Error refreshing crypto signals: {str(e)}")
+        db.session.rollback()
+        return 0
 
-            # Weight each sentiment type
-            weighted_score = (positive_count * 1.2 + neutral_count * 0.2 - negative_count * 0.8) / total_articles
+def default_signals():
+    """Signal for a symbol without a stored one"""
+    return {'signal': 'hold', 'confidence': 50.0, 'total_articles': 0}
 
-            if price_data and price_data.percent_change_24h:
-                price_weight = 0.5 if price_data.percent_change_24h > 2.0 else (-0.5 if price_data.percent_change_24h < -2.0 else 0)
-            else:
-                price_weight = 0
-
-            # Calculate final scores
-            total_score = weighted_score + price_weight
-            confidence = 50.0 + (total_score * 40.0) + (min(10.0, abs(price_data.percent_change_24h)) if price_data else 0)
-            confidence = min(95.0, max(5.0, confidence))
-
-            # Determine signal with consistent thresholds
-            if total_score > 0.4 and (price_data and price_data.percent_change_24h > 0):
-                signal = 'buy'
-            elif total_score < -0.4 and (price_data and price_data.percent_change_24h < 0):
-                signal = 'sell'
-            else:
-                signal = 'hold'
+def stored_crypto_signals():
+    """Every stored signal, keyed by symbol, in one query"""
+    return {row.symbol: row.to_dict() for row in CryptoSignal.query.all()}
+
+def stored_crypto_signal(symbol):
+    """The stored signal of ``symbol``, read by primary key"""
+    try:
+        row = db.session.get(CryptoSignal, ASSETS.resolve(symbol) or symbol.upper())
+        return row.to_dict() if row else default_signals()
+    except Exception as e:
+        logger.error(f"Error reading signal for {symbol}: {str(e)}")
+        return default_signals()
+
+def signals_from_counts(counts, price_data=None):
+    """Signal, confidence and article total from ``{sentiment_label: articles}`` counts"""
+    total_articles = sum(counts.values())
+
+    if total_articles > 0:
+        positive_count = counts.get('positive', 0)
+        neutral_count = counts.get('neutral', 0)
+        negative_count = counts.get('negative', 0)
+
+        # Weight each sentiment type
+        weighted_score = (positive_count * 1.2 + neutral_count * 0.2 - negative_count * 0.8) / total_articles
+
+        if price_data and price_data.percent_change_24h:
+            price_weight = 0.5 if price_data.percent_change_24h > 2.0 else (-0.5 if price_data.percent_change_24h < -2.0 else 0)
+        else:
+            price_weight = 0
+
+        # Calculate final scores
+        total_score = weighted_score + price_weight
+        confidence = 50.0 + (total_score * 40.0) + (min(10.0, abs(price_data.percent_change_24h)) if price_data else 0)
+        confidence = min(95.0, max(5.0, confidence))
+
+        # Determine signal with consistent thresholds
+        if total_score > 0.4 and (price_data and price_data.percent_change_24h > 0):
+            signal = 'buy'
+        elif total_score < -0.4 and (price_data and price_data.percent_change_24h < 0):
+            signal = 'sell'
         else:
-            confidence = 50.0
             signal = 'hold'
+    else:
+        confidence = 50.0
+        signal = 'hold'
 
-        return {
-            'signal': signal,
-            'confidence': confidence,
-            'total_articles': total_articles
-        }
-    except Exception as e:
-        logger.error(f"Error calculating signals for {symbol}: {str(e)}")
-        return {'signal': 'hold', 'confidence': 50.0, 'total_articles': 0}
+    return {
+        'signal': signal,
+        'confidence': confidence,
+        'total_articles': total_articles
+    }
 
 @app.route('/crypto/<symbol>')
 @check_subscription('basic')
 def crypto_detail(symbol):
     try:
         logger.info(f"Accessing crypto detail page for symbol: {symbol}")
-        symbol = symbol.upper()  # Normalize symbol to uppercase
+        # Accept names and coin ids as well as tickers
+        asset = ASSETS.lookup(symbol)
+        symbol = asset.symbol if asset else symbol.upper()
 
         # Get current price data
         crypto_price = CryptoPrice.query.filter(CryptoPrice.symbol == symbol).first()
@@ -532,19 +497,8 @@ def crypto_detail(symbol):
         # Get related news articles (from last 7 days)
         try:
             cutoff_time = datetime.utcnow() - timedelta(days=7)
-            coin_name = crypto_names.get(symbol, '')
-            related_news = Article.query.filter(
-                db.and_(
-                    db.or_(
-                        Article.content.ilike(f'%{symbol}%'),
-                        Article.title.ilike(f'%{symbol}%'),
-                        Article.content.ilike(f'%{coin_name}%'),
-                        Article.title.ilike(f'%{coin_name}%'),
-                        Article.content.ilike(f'%TRON%')  # Special case for TRX
-                    ),
-                    Article.created_at >= cutoff_time
-                )
-            ).order_by(desc(Article.created_at)).all()
+            # Mentions by ticker or coin name (e.g. 'TRON' for TRX) are both in the index
+            related_news = articles_mentioning(symbol, cutoff_time)
             logger.info(f"Found {len(related_news)} related articles for {symbol}")
 
             # Calculate news impact
@@ -564,13 +518,13 @@ def crypto_detail(symbol):
             related_news = []
             news_impact = {'positive': 0, 'negative': 0, 'neutral': 0, 'total_articles': 0}
 
-        # Use cached signals or recalculate if needed
-        signals = app.crypto_signals.get(symbol) or calculate_crypto_signals(symbol)
+        # Use the signal the pipeline stored
+        signals = stored_crypto_signal(symbol)
         recommendation = signals['signal']
 
-        # Get additional coin data
-        tracker = CryptoPriceTracker()
-        coin_data = tracker.get_coin_data(symbol)
+        # Get additional coin data from memory; a stale entry is refreshed in the background.
+        # Assets without a CoinGecko id have none
+        coin_data = coin_cache.get(symbol) if asset and asset.coin_id else None
 
         logger.info(f"Generated {recommendation} recommendation for {symbol}")
 
@@ -759,26 +713,12 @@ def disclaimer():
 
 @app.route('/search')
 def search():
-    query = request.args.get('q', '').lower()
+    query = request.args.get('q', '').strip()
     if not query:
         return redirect('/')
 
-    # Map common names to symbols
-    name_to_symbol = {
-        'bitcoin': 'BTC',
-        'ethereum': 'ETH',
-        'binance': 'BNB',
-        'cardano': 'ADA',
-        'solana': 'SOL',
-        'ripple': 'XRP',
-        'dogecoin': 'DOGE',
-        'polygon': 'MATIC',
-        'avalanche': 'AVAX',
-        'ondo': 'ONDO'  # Added Ondo token
-    }
-
-    # Try to find the symbol
-    symbol = name_to_symbol.get(query, query.upper())
+    # Tickers, names, aliases and coin ids all resolve through the asset registry
+    symbol = ASSETS.resolve(query) or query.upper()
 
     return redirect(f'/crypto/{symbol}')
 
@@ -799,20 +739,21 @@ def price_history(symbol):
         days = request.args.get('days', default=30, type=int)
 
         # Normalize symbol
-        symbol = symbol.upper()
+        asset = ASSETS.lookup(symbol)
+        symbol = asset.symbol if asset else symbol.upper()
 
-        # Initialize tracker
-        tracker = CryptoPriceTracker()
-
-        # Check if symbol exists in our tracked cryptocurrencies
-        if symbol not in tracker.crypto_ids:
+        # Only assets with a CoinGecko id have a price history
+        if asset is None or asset.coin_id is None:
             logger.error(f"Symbol {symbol} not found in supported cryptocurrencies")
             return jsonify({
                 'error': f'Cryptocurrency {symbol} is not supported',
                 'symbol': symbol,
-                'supported_symbols': list(tracker.crypto_ids.keys())
+                'supported_symbols': list(ASSETS.coin_ids)
             }), 404
 
+        # Initialize tracker
+        tracker = CryptoPriceTracker()
+
         # Get historical data using the tracker
         historical_data = tracker.get_historical_prices(symbol, days=days)
 
@@ -882,78 +823,126 @@ def serve_robots():
         logger.error(f"Error serving robots.txt: {str(e)}")
         return "User-agent: *\nAllow: /\n", 200, {'Content-Type': 'text/plain'}
 
-@app.route('/api/load-more-articles')
-def load_more_articles():
-    try:
-        page = request.args.get('page', 1, type=int)
-        per_page = 10
-
-        cutoff_time = datetime.utcnow() - timedelta(days=90)
-        articles = Article.query.filter(
-            Article.created_at >= cutoff_time,
-            Article.sentiment_score.isnot(None)
-        ).order_by(Article.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+# Days of articles the feed scrolls back through
+FEED_MAX_AGE_DAYS = int(os.environ.get('FEED_MAX_AGE_DAYS', 90))
+# Articles per feed page, by default and at most
+FEED_PAGE_SIZE = 10
+FEED_MAX_PAGE_SIZE = 50
 
-        if not articles.items:
-            return jsonify({'articles': [], 'has_more': False})
+def encode_cursor(created_at, article_id):
+    """Opaque feed cursor pointing just past the article at ``(created_at, article_id)``"""
+    raw = json.dumps([created_at.isoformat(), article_id]).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
 
-        # Process articles similar to dashboard
-        crypto_prices = getattr(app, 'crypto_prices', [])
-        news_sources = getattr(app, 'news_sources', [])
-        crypto_symbols = {crypto.symbol: crypto for crypto in crypto_prices}
+def decode_cursor(cursor):
+    """The ``(created_at, article_id)`` of a cursor from ``encode_cursor``; ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        created_at, article_id = json.loads(raw)
+        return datetime.fromisoformat(created_at), int(article_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
 
-        processed_articles = []
-        for article in articles.items:
-            try:
-                enhanced_summary = escape(article.summary)
-                for symbol, crypto in crypto_symbols.items():
-                    pattern = re.compile(r'\b' + re.escape(symbol) + r'\b', re.IGNORECASE)
-                    if pattern.search(str(enhanced_summary)):
-                        tooltip_html = Markup(
-                            f'<span class="crypto-tooltip">{symbol}'
-                            f'<div class="tooltip-content">'
-                            f'<span class="tooltip-price">${crypto.price_usd:.2f}</span>'
-                            f'<span class="tooltip-change {("positive" if crypto.percent_change_24h > 0 else "negative")}">'
-                            f'{crypto.percent_change_24h:.1f}%</span>'
-                            f'</div></span>'
-                        )
-                        enhanced_summary = Markup(pattern.sub(str(tooltip_html), str(enhanced_summary)))
+_feed_snapshot = None
 
-            except Exception as e:
-                logger.error(f"Error processing tooltips for article {article.id}: {str(e)}")
-                enhanced_summary = article.summary
+def feed_snapshot():
+    """Price tooltips and source trust scores shared by feed pages.
 
-            source_metrics = next(
-                (source for source in news_sources if source.source_name == article.source_name),
-                None
-            )
+    Reloaded only when the pipeline bumps the dashboard's data version, so feed
+    pages between runs don't read prices or sources.
+    """
+    global _feed_snapshot
+    version = dashboard_cache.version
+    if _feed_snapshot is None or _feed_snapshot['version'] != version:
+        prices = CryptoPrice.query.filter(
+            CryptoPrice.price_usd.isnot(None),
+            CryptoPrice.percent_change_24h.isnot(None)
+        ).all()
+        _feed_snapshot = {
+            'version': version,
+            'injector': get_injector(prices),
+            'trust_scores': {source.source_name: source.trust_score for source in NewsSourceMetrics.query.all()},
+        }
+    return _feed_snapshot
 
-            processed_article = {
-                'id': article.id,
-                'title': article.title,
-                'content': article.content,
-                'summary': str(enhanced_summary),
-                'source_name': article.source_name,
-                'created_at': article.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-                'sentiment_label': article.sentiment_label,
-                'sentiment_score': article.sentiment_score,
-                'url': article.url,
-                'source_url': article.source_url,
-                'source_metrics': {
-                    'trust_score': source_metrics.trust_score if source_metrics else None
-                } if source_metrics else None
-            }
-            processed_articles.append(processed_article)
+def feed_page(after=None, limit=FEED_PAGE_SIZE):
+    """One page of scored articles, newest first, after the decoded cursor ``after``.
+
+    Keyset pagination on ``(created_at, id)``: each page seeks into
+    ``ix_article_created_at_id`` instead of skipping earlier rows, so page 500
+    costs the same as page 1. Returns the rows and the next cursor, or None at the end.
+    """
+    query = db.select(
+        Article.id, Article.title, Article.summary, Article.source_name, Article.source_url,
+        Article.created_at, Article.sentiment_label, Article.sentiment_score
+    ).where(
+        Article.created_at >= datetime.utcnow() - timedelta(days=FEED_MAX_AGE_DAYS),
+        Article.sentiment_score.isnot(None)
+    )
+    if after:
+        created_at, article_id = after
+        # (created_at, id) < cursor, with a plain upper bound on created_at so the
+        # planner seeks the index instead of expanding the OR
+        query = query.where(
+            Article.created_at <= created_at,
+            db.or_(Article.created_at < created_at, Article.id < article_id)
+        )
+    # One extra row tells whether another page follows
+    rows = db.session.execute(
+        query.order_by(Article.created_at.desc(), Article.id.desc()).limit(limit + 1)
+    ).all()
+    next_cursor = encode_cursor(rows[limit - 1].created_at, rows[limit - 1].id) if len(rows) > limit else None
+    return rows[:limit], next_cursor
+
+@app.route('/api/articles')
+def article_feed():
+    try:
+        limit = min(max(request.args.get('limit', FEED_PAGE_SIZE, type=int), 1), FEED_MAX_PAGE_SIZE)
+        cursor = request.args.get('cursor')
+        try:
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        rows, next_cursor = feed_page(after, limit)
+
+        snapshot = feed_snapshot()
+        symbols = {}
+        if rows:
+            for article_id, symbol in db.session.execute(
+                db.select(ArticleSymbol.article_id, ArticleSymbol.symbol)
+                .where(ArticleSymbol.article_id.in_([row.id for row in rows]))
+            ):
+                symbols.setdefault(article_id, []).append(symbol)
+
+        articles = []
+        for row in rows:
+            try:
+                summary = annotate_summary(snapshot['injector'], row.id, row.summary)
+            except Exception as e:
+                logger.error(f"Error processing tooltips for article {row.id}: {str(e)}")
+                summary = row.summary
+            trust_score = snapshot['trust_scores'].get(row.source_name)
+            articles.append({
+                'id': row.id,
+                'title': row.title,
+                'summary': str(summary),
+                'source_name': row.source_name,
+                'created_at': row.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+                'sentiment_label': row.sentiment_label,
+                'sentiment_score': row.sentiment_score,
+                'source_url': row.source_url,
+                'symbols': sorted(symbols.get(row.id, [])),
+                'source_metrics': {'trust_score': trust_score} if trust_score is not None else None
+            })
 
         return jsonify({
-            'articles': processed_articles,
-            'has_more': articles.pages > page
+            'articles': articles,
+            'next_cursor': next_cursor,
+            'has_more': next_cursor is not None
         })
 
     except Exception as e:
-        logger.error(f"Error loading more articles: {str(e)}")
+        logger.error(f"Error loading article feed: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 with app.app_context():
@@ -979,11 +968,10 @@ def serve_static(filename):
 
 @app.context_processor
 def utility_processor():
-    tracker = CryptoPriceTracker()
     return {
         'crypto_names': crypto_names,
-        'supported_cryptos': list(tracker.crypto_ids.keys()),
-        'calculate_crypto_signals': calculate_crypto_signals
+        'supported_cryptos': SUPPORTED_CRYPTOS,
+        'calculate_crypto_signals': stored_crypto_signal
     }
 
 if __name__ == "__main__":
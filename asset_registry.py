@@ -0,0 +1,319 @@
+"""The crypto assets the app knows about, loaded once at import.
+
+One immutable ``AssetRegistry`` holds each asset's symbol, CoinGecko id, display
+name and aliases. The price tracker, search, coin pages, signal lookups, NLP and
+templates all read it, instead of each keeping its own table. Names resolve to
+symbols through a case-insensitive alias trie, one node per character of the name.
+
+Kept free of app, database and network imports so worker processes can use it.
+"""
+from types import MappingProxyType
+from typing import NamedTuple, Optional
+
+# CoinGecko id of every symbol whose price is tracked
+COIN_IDS = {
+    'BTC': 'bitcoin',
+    'ETH': 'ethereum',
+    'USDT': 'tether',
+    'BNB': 'binancecoin',
+    'SOL': 'solana',
+    'XRP': 'ripple',
+    'USDC': 'usd-coin',
+    'ADA': 'cardano',
+    'AVAX': 'avalanche-2',
+    'DOGE': 'dogecoin',
+    'TON': 'toncoin',
+    'MEME': 'memecoin-2',
+    'SEI': 'sei-network',
+    'SUI': 'sui',
+    'BONK': 'bonk',
+    'WLD': 'worldcoin-wld',
+    'PYTH': 'pyth-network',
+    'JUP': 'jupiter',
+    'BLUR': 'blur',
+    'HFT': 'hashflow',
+    'WIF': 'wif-token',
+    'STRK': 'starknet',
+    'TIA': 'celestia',
+    'DYM': 'dymension',
+    'ORDI': 'ordinals-token',
+    'TRX': 'tron',
+    'DAI': 'dai',
+    'MATIC': 'matic-network',
+    'DOT': 'polkadot',
+    'WBTC': 'wrapped-bitcoin',
+    'SHIB': 'shiba-inu',
+    'LEO': 'leo-token',
+    'LTC': 'litecoin',
+    'UNI': 'uniswap',
+    'CAKE': 'pancakeswap-token',
+    'LINK': 'chainlink',
+    'ATOM': 'cosmos',
+    'APE': 'apecoin',
+    'AAVE': 'aave',
+    'RPL': 'rocket-pool',
+    'REN': 'ren',
+    'MKR': 'maker-protocol',
+    'BAT': 'basic-attention-token',
+    'GMX': 'gmx',
+    'ARB': 'arbitrum',
+    'OP': 'optimism',
+    'GRT': 'the-graph',
+    'SNX': 'synthetix',
+    'CRV': 'curve-dao-token',
+    'LDO': 'lido-dao',
+    'APT': 'aptos',
+    'ALGO': 'algorand',
+    'FIL': 'filecoin',
+    'COMP': 'compound-coin',
+    'IMX': 'immutable-x',
+    'HBAR': 'hedera-hashgraph',
+    'XTZ': 'tezos',
+    'EOS': 'eos',
+    'BAL': 'balancer',
+    'SAND': 'the-sandbox',
+    '1INCH': '1inch',
+    'SUSHI': 'sushi',
+    'YFI': 'yearn-finance',
+    'RUNE': 'thorchain',
+    'KNC': 'kyber-network-crystal',
+    'ZRX': '0x',
+    'QNT': 'quant-network',
+    'EGLD': 'elrond-erd-2',
+    'XDC': 'xdce-crowd-sale',
+    'FLOW': 'flow',
+    'NEO': 'neo',
+    'KCS': 'kucoin-shares',
+    'ZEC': 'zcash',
+    'BTT': 'bittorrent',
+    'KAVA': 'kava',
+    'MANA': 'decentraland',
+    'TUSD': 'true-usd',
+    'KLAY': 'klaytn',
+    'GT': 'gatetoken',
+    'CHZ': 'chiliz',
+    'XEC': 'ecash',
+    'BEAM': 'beam',
+    'HT': 'huobi-token',
+    'FTM': 'fantom',
+    'IOTA': 'iota',
+    'AR': 'arweave',
+    'CSPR': 'casper-network',
+    'STX': 'stacks',
+    'RNDR': 'render-token',
+    'GALA': 'gala',
+    'DYDX': 'dydx',
+    'MINA': 'mina-protocol',
+    'CFX': 'conflux-token',
+    'WAXP': 'wax',
+    'ROSE': 'oasis-network',
+    'ENJ': 'enjincoin',
+    'VRA': 'virtuals',
+    'NEAR': 'near',
+    'ICP': 'internet-computer',
+    'TAO': 'bittensor',
+    'NEXO': 'nexo',
+    'CKB': 'nervos-network',
+    'WOO': 'woo-network',
+    'POLY': 'polymath',
+    'DASH': 'dash',
+    'ZIL': 'zilliqa',
+    'LRC': 'loopring',
+    'FLUX': 'flux',
+    'ONE': 'harmony',
+    'HOT': 'holotoken',
+    'ICX': 'icon',
+    'OCEAN': 'ocean-protocol',
+    'KDA': 'kadena',
+    'XEM': 'nem',
+    'TWT': 'trust-wallet-token',
+    'DCR': 'decred',
+    'GLM': 'golem',
+    'SKL': 'skale',
+    'JASMY': 'jasmycoin',
+    'AMP': 'amp-token',
+    'CELR': 'celer-network',
+    'QTUM': 'qtum',
+    'RVN': 'ravencoin',
+    'ONT': 'ontology',
+    'RSR': 'reserve-rights-token',
+    'ANKR': 'ankr',
+    'SC': 'siacoin',
+    'ONDO': 'ondo-finance',
+    'BCH': 'bitcoin-cash',
+    'XLM': 'stellar',
+    'OKB': 'okb',
+    'VET': 'vechain',
+    'INJ': 'injective-protocol',
+    'MASK': 'mask-network',
+    'TRUMP': 'trump-digital-trading-card',
+    'HYPE': 'hyperliquid-hype'
+}
+
+# Display names, including symbols named on the site but not priced
+DISPLAY_NAMES = {
+    'BTC': 'Bitcoin',
+    'ETH': 'Ethereum',
+    'USDT': 'Tether',
+    'BNB': 'Binance Coin',
+    'SOL': 'Solana',
+    'XRP': 'Ripple',
+    'AVAX': 'Avalanche',
+    'MEME': 'Memecoin',
+    'SEI': 'Sei Network',
+    'SUI': 'Sui',
+    'BONK': 'Bonk',
+    'WLD': 'Worldcoin',
+    'PYTH': 'Pyth Network',
+    'JUP': 'Jupiter',
+    'BLUR': 'Blur',
+    'HFT': 'Hashflow',
+    'WIF': 'Wif Token',
+    'STRK': 'Starknet',
+    'TIA': 'Celestia',
+    'DYM': 'Dymension',
+    'ORDI': 'Ordinals',
+    'USDC': 'USD Coin',
+    'ADA': 'Cardano',
+    'DOGE': 'Dogecoin',
+    'TON': 'Toncoin',
+    'TRX': 'TRON',
+    'DAI': 'Dai',
+    'MATIC': 'Polygon',
+    'DOT': 'Polkadot',
+    'WBTC': 'Wrapped Bitcoin',
+    'SHIB': 'Shiba Inu',
+    'LEO': 'LEO Token',
+    'LTC': 'Litecoin',
+    'UNI': 'Uniswap',
+    'CAKE': 'PancakeSwap',
+    'LINK': 'Chainlink',
+    'ATOM': 'Cosmos',
+    'APE': 'ApeCoin',
+    'AAVE': 'Aave',
+    'MELANX': 'Melania Token',
+    'TRUMP': 'Trump Token',
+    'TUSD': 'True USD',
+    'KLAY': 'Klaytn',
+    'GT': 'Gatetoken',
+    'CHZ': 'Chiliz',
+    'XEC': 'Ecash',
+    'BEAM': 'Beam',
+    'VRA': 'Virtuals',
+    'NEAR': 'NEAR Protocol',
+    'RNDR': 'Render Token',
+    'ICP': 'Internet Computer',
+    'TAO': 'Bittensor',
+    'MASK': 'Mask Network',
+    'HYPE': 'Hypeliquid'
+}
+
+# Crypto asset names and tickers, formatted as the title-cased name in article text
+CRYPTO_ASSETS = {
+    'bitcoin': 'BTC',
+    'btc': 'BTC',
+    'ethereum': 'ETH',
+    'eth': 'ETH',
+    'binance coin': 'BNB',
+    'bnb': 'BNB',
+    'cardano': 'ADA',
+    'ada': 'ADA',
+    'solana': 'SOL',
+    'sol': 'SOL',
+    'xrp': 'XRP',
+    'ripple': 'XRP',
+    'dogecoin': 'DOGE',
+    'doge': 'DOGE',
+    'polygon': 'MATIC',
+    'matic': 'MATIC',
+    'avalanche': 'AVAX',
+    'avax': 'AVAX'
+}
+
+# Other names search resolves
+SEARCH_ALIASES = {
+    'binance': 'BNB'
+}
+
+class Asset(NamedTuple):
+    """One crypto asset: its CoinGecko ``coin_id`` and display ``name`` may be None"""
+    symbol: str
+    coin_id: Optional[str]
+    name: Optional[str]
+    aliases: tuple
+
+def alias_key(name):
+    """How an alias is compared: case-folded, with runs of whitespace collapsed"""
+    return ' '.join(name.casefold().split())
+
+class AliasTrie:
+    """Case-insensitive alias -> symbol lookup in O(len(name)), walking one node per character"""
+    # Marks the node where an alias ends; never a character of a key
+    END = ''
+
+    def __init__(self, aliases):
+        # (alias, symbol) pairs; the first symbol given an alias keeps it
+        self.root = {}
+        for alias, symbol in aliases:
+            node = self.root
+            for char in alias_key(alias):
+                node = node.setdefault(char, {})
+            node.setdefault(self.END, symbol)
+
+    def get(self, name):
+        """The symbol ``name`` is an alias of, or None"""
+        node = self.root
+        for char in alias_key(name):
+            node = node.get(char)
+            if node is None:
+                return None
+        return node.get(self.END)
+
+class AssetRegistry:
+    """Every known asset, by symbol, with read-only views for the older per-module tables"""
+    def __init__(self, coin_ids, names, aliases):
+        aliases_by_symbol = {}
+        for alias, symbol in aliases.items():
+            aliases_by_symbol.setdefault(symbol, []).append(alias)
+        symbols = list(dict.fromkeys([*coin_ids, *names]))
+        self.assets = MappingProxyType({
+            symbol: Asset(symbol, coin_ids.get(symbol), names.get(symbol), tuple(aliases_by_symbol.get(symbol, ())))
+            for symbol in symbols
+        })
+        # {symbol: coin_id} of the priced assets, as CryptoPriceTracker.crypto_ids
+        self.coin_ids = MappingProxyType(dict(coin_ids))
+        # {symbol: display name}, as the templates' crypto_names
+        self.names = MappingProxyType(dict(names))
+        # Symbols first, so a ticker never resolves to another asset's name or id;
+        # readable coin ids ('shiba-inu' as 'shiba inu') come last
+        self.trie = AliasTrie([
+            *((symbol, symbol) for symbol in symbols),
+            *((name, symbol) for symbol, name in names.items()),
+            *((alias, symbol) for alias, symbol in aliases.items()),
+            *((coin_id, symbol) for symbol, coin_id in coin_ids.items()),
+            *((coin_id.replace('-', ' '), symbol) for symbol, coin_id in coin_ids.items()),
+        ])
+
+    def __contains__(self, symbol):
+        return symbol in self.assets
+
+    def __iter__(self):
+        return iter(self.assets)
+
+    def resolve(self, name):
+        """The symbol of a ticker, display name, alias or coin id in any case, or None"""
+        return self.trie.get(name) if name else None
+
+    def lookup(self, name):
+        """The ``Asset`` a ticker, display name, alias or coin id resolves to, or None"""
+        return self.assets.get(self.resolve(name) or (name or '').upper())
+
+    def name(self, symbol):
+        """Display name of ``symbol``, or the symbol itself"""
+        return self.names.get(symbol, symbol)
+
+    def tracked(self):
+        """``{symbol: display name or None}`` for every known symbol, priced ones first"""
+        return {symbol: asset.name for symbol, asset in self.assets.items()}
+
+ASSETS = AssetRegistry(COIN_IDS, DISPLAY_NAMES, {**CRYPTO_ASSETS, **SEARCH_ALIASES})
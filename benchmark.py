@@ -0,0 +1,1248 @@
+"""Performance benchmarks for the ingestion and analysis pipeline.
+
+Run ``python benchmark.py <command> --help`` for the options of each benchmark.
+Benchmarks never touch the network: feeds are served from a local HTTP stand-in
+and database work runs against a throwaway SQLite file. The one exception is
+``record``, which downloads the live feeds once into fixtures for later replay.
+"""
+# Patch before anything else, exactly like main.py, so the stand-in server and the
+# scraper share the same cooperative runtime they run under in production.
+import eventlet
+eventlet.monkey_patch()
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# The app refuses to start without a database; point it at a scratch SQLite file
+# before anything imports it.
+os.environ.setdefault('DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='newsbench-'), 'bench.db')}")
+
+logger = logging.getLogger(__name__)
+
+
+def build_rss_feed(name, entries=50, start=None, full_content=False):
+    """Build a synthetic RSS 2.0 document with ``entries`` items, newest first.
+
+    With ``full_content`` every item also carries a ``content:encoded`` article body.
+    """
+    start = start or datetime.utcnow()
+    items = []
+    for i in range(entries):
+        published = format_datetime((start - timedelta(minutes=15 * i)).replace(tzinfo=timezone.utc), usegmt=True)
+        # Number stories from the oldest so a feed grown by a few items keeps its old links
+        number = entries - i
+        slug = f"{name.lower().replace(' ', '-')}-story-{number}"
+        items.append(
+            f"<item><title>{name} story {number}: Bitcoin rally lifts ETH and SOL</title>"
+            f"<link>https://example.com/{slug}</link><guid>https://example.com/{slug}</guid>"
+            f"<pubDate>{published}</pubDate>"
+            f"<description><![CDATA[<p>Bitcoin (BTC) extended its <b>rally</b> as ETF inflows surged. "
+            f"Analysts remain bullish despite regulation concerns.</p><p>Story {number} from {name}.</p>]]></description>"
+            + (f"<content:encoded><![CDATA[{build_article_html(number)}]]></content:encoded>" if full_content else "")
+            + "</item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/"><channel>'
+        f"<title>{name}</title><link>https://example.com/</link><description>{name} feed</description>"
+        + ''.join(items) + '</channel></rss>'
+    ).encode('utf-8')
+
+
+def build_article_html(number, paragraphs=8):
+    """Full-content article HTML shaped like a feed's content:encoded body"""
+    body = ''.join(
+        f"<p>Paragraph {p} of story {number}: Bitcoin (BTC) traded near record highs while "
+        f"<a href=\"https://example.com/eth\">Ethereum</a> lagged. Traders cited ETF flows, "
+        f"liquidations and a <strong>volatile</strong> funding market.</p>"
+        for p in range(paragraphs)
+    )
+    return (
+        f"<figure><img src=\"https://example.com/img/{number}.jpg\" alt=\"chart\"/>"
+        f"<figcaption>Price chart for story {number}</figcaption></figure>"
+        f"<!-- tracking pixel --><script>window.dataLayer = [];</script>{body}"
+        f"<aside><ul><li><a href=\"/related\">Related coverage</a></li></ul></aside>"
+    )
+
+
+def load_html_corpus(corpus_dir=None, size=400):
+    """HTML documents for cleaning benchmarks.
+
+    Reads the description/content/summary fields of every feed file in ``corpus_dir``
+    (for example one written by ``record``); without one, builds a synthetic mix of short
+    feed snippets and full-content article bodies.
+    """
+    documents = []
+    if corpus_dir:
+        import feedparser
+        for name in sorted(os.listdir(corpus_dir)):
+            path = os.path.join(corpus_dir, name)
+            if not os.path.isfile(path) or name.endswith('.json'):
+                continue
+            with open(path, 'rb') as f:
+                feed = feedparser.parse(f.read())
+            for entry in feed.entries:
+                documents.append(entry.get('description', ''))
+                for content in entry.get('content', []):
+                    documents.append(content.value)
+                documents.append(entry.get('summary', ''))
+        documents = [document for document in documents if document]
+        if not documents:
+            raise SystemExit(f"No feed documents found in {corpus_dir}")
+        return documents
+
+    for i in range(size):
+        if i % 2:
+            documents.append(build_article_html(i, paragraphs=4 + i % 12))
+        else:
+            documents.append(f"<p>Bitcoin <b>rally</b> story {i} as ETF inflows surge.</p>")
+    return documents
+
+
+def build_sentiment_corpus(size=2000, seed=7):
+    """Synthetic article texts for sentiment benchmarks, from one-line headlines to long bodies.
+
+    Mixes lexicon words with words that contain them ('enterprise', 'bank', 'know'), negations,
+    punctuation and mixed case, so substring and negation handling is exercised as well.
+    """
+    import random
+    from text_analysis import POSITIVE_PATTERNS, NEGATIVE_PATTERNS, NEGATION_WORDS
+
+    rng = random.Random(seed)
+    lexicon = list(POSITIVE_PATTERNS) + list(NEGATIVE_PATTERNS)
+    filler = ['bitcoin', 'ethereum', 'traders', 'market', 'enterprise', 'issue', 'bank', 'again',
+              'know', 'tanker', 'crackdown', 'ETF-backed', 'sell-offs', 'pursue', 'banner', 'the',
+              'a', 'of', 'price', 'week', 'analysts', 'said', 'on-chain', 'funding', '2024']
+    documents = []
+    for i in range(size):
+        words = rng.randint(5, 40) if i % 4 else rng.randint(200, 2500)
+        tokens = []
+        for _ in range(words):
+            roll = rng.random()
+            if roll < 0.12:
+                token = rng.choice(lexicon)
+            elif roll < 0.14:
+                token = rng.choice(NEGATION_WORDS)
+            else:
+                token = rng.choice(filler)
+            if rng.random() < 0.1:
+                token = token.upper() if rng.random() < 0.5 else token.capitalize()
+            tokens.append(token + rng.choice(['', '', '', ',', '.', '!', "'s"]))
+        documents.append(' '.join(tokens))
+    return documents
+
+
+def reference_sentiment(text):
+    """The original per-pattern ``analyze_sentiment`` scan, without logging, as the parity reference"""
+    import re
+    from text_analysis import POSITIVE_PATTERNS, NEGATIVE_PATTERNS, NEGATION_WORDS
+
+    if not text or not isinstance(text, str):
+        return 0.0, 'neutral'
+    text = re.sub(r'[^\w\s-]', ' ', text.lower())
+    weighted_pos_score = weighted_neg_score = 0
+    total_matches = 0
+    for sentence in [s.strip() for s in text.split('.') if s.strip()]:
+        has_negation = any(neg in sentence for neg in NEGATION_WORDS)
+        for pattern, weight in POSITIVE_PATTERNS.items():
+            if pattern in sentence:
+                if has_negation:
+                    weighted_neg_score += weight
+                else:
+                    weighted_pos_score += weight
+                total_matches += 1
+        for pattern, weight in NEGATIVE_PATTERNS.items():
+            if pattern in sentence:
+                if has_negation:
+                    weighted_pos_score += weight * 0.5
+                else:
+                    weighted_neg_score += weight
+                total_matches += 1
+    if total_matches == 0:
+        return 0.0, 'neutral'
+    score = (weighted_pos_score - weighted_neg_score) / max(total_matches, 1)
+    if score > 0.2:
+        return score, 'positive'
+    if score < -0.1:
+        return score, 'negative'
+    return score, 'neutral'
+
+
+class FeedStandIn:
+    """Local HTTP server that serves canned feed bodies with an optional per-path delay.
+
+    Bodies carry a content-derived ETag and conditional requests get a 304, like the
+    real feeds. ``requests_served`` and ``bytes_served`` count traffic per run.
+    """
+
+    def __init__(self, routes):
+        # routes: {path: (body_bytes, delay_seconds)}
+        self.routes = routes
+        self.requests_served = 0
+        self.bytes_served = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                route = stand_in.routes.get(self.path)
+                if route is None:
+                    self.send_error(404)
+                    return
+                body, delay = route
+                if delay:
+                    time.sleep(delay)
+                etag = f'"{hashlib.sha1(body).hexdigest()}"'
+                stand_in.requests_served += 1
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(body)
+                stand_in.bytes_served += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class QueryCounter:
+    """Count SQL statements sent to an engine while the context is active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _on_execute(self, *args):
+        self.count += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+        event.listen(self.engine, 'before_cursor_execute', self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+        event.remove(self.engine, 'before_cursor_execute', self._on_execute)
+
+
+class StageTimer:
+    """Accumulate wall-clock time per pipeline stage by wrapping module attributes.
+
+    ``wrap`` swaps ``owner.name`` for a timed wrapper until the context exits; INSERT
+    statements sent to ``engine`` are timed separately as the ``insert`` stage.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine
+        self.totals = {}
+        self._wrapped = []
+        self._insert_started = threading.local()
+
+    def wrap(self, owner, name, stage):
+        original = getattr(owner, name)
+
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.totals[stage] = self.totals.get(stage, 0.0) + time.perf_counter() - started
+
+        setattr(owner, name, timed)
+        self._wrapped.append((owner, name, original))
+
+    def _before_execute(self, conn, cursor, statement, *args):
+        self._insert_started.value = time.perf_counter() if statement.lstrip().upper().startswith('INSERT') else None
+
+    def _after_execute(self, *args):
+        started = getattr(self._insert_started, 'value', None)
+        if started is not None:
+            self.totals['insert'] = self.totals.get('insert', 0.0) + time.perf_counter() - started
+
+    def __enter__(self):
+        if self.engine is not None:
+            from sqlalchemy import event
+            event.listen(self.engine, 'before_cursor_execute', self._before_execute)
+            event.listen(self.engine, 'after_cursor_execute', self._after_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for owner, name, original in reversed(self._wrapped):
+            setattr(owner, name, original)
+        if self.engine is not None:
+            from sqlalchemy import event
+            event.remove(self.engine, 'before_cursor_execute', self._before_execute)
+            event.remove(self.engine, 'after_cursor_execute', self._after_execute)
+
+
+def load_fixtures(fixture_dir):
+    """Feed bodies written by ``record`` as ``{source name: (file name, body)}``"""
+    with open(os.path.join(fixture_dir, 'manifest.json')) as f:
+        manifest = json.load(f)
+    fixtures = {}
+    for name, meta in manifest['sources'].items():
+        with open(os.path.join(fixture_dir, meta['file']), 'rb') as f:
+            fixtures[name] = (meta['file'], f.read())
+    return fixtures
+
+
+def seed_articles(urls, source_name='Seed', texts=None, titles=None, created=None):
+    """Insert placeholder articles for ``urls`` in one statement, with ``texts`` as their content
+    and optionally their own ``titles`` and ``created`` timestamps"""
+    from app import db
+    from models import Article
+
+    now = datetime.utcnow()
+    db.session.execute(Article.__table__.insert(), [
+        {'title': titles[i] if titles else f'Seeded {i}', 'content': texts[i] if texts else 'seeded',
+         'summary': 'seeded', 'source_url': url, 'source_name': source_name,
+         'created_at': created[i] if created else now, 'category': 'Crypto Markets',
+         'published': False, 'accuracy_verified': False, 'trust_impact': 0.0}
+        for i, url in enumerate(urls)
+    ])
+    db.session.commit()
+
+
+def bench_fetch(args):
+    """Compare sequential and concurrent feed download wall-clock time"""
+    from scraper import NewsSource, fetch_feed, fetch_feeds
+
+    delays = [float(d) for d in args.delays.split(',')]
+    routes = {f"/feed{i}": (build_rss_feed(f"Source {i}", args.entries), delay) for i, delay in enumerate(delays)}
+
+    with FeedStandIn(routes) as stand_in:
+        sources = [NewsSource(f"Source {i}", f"{stand_in.base_url}/feed{i}", is_rss=True) for i in range(len(delays))]
+
+        started = time.perf_counter()
+        for source in sources:
+            fetch_feed(source, timeout=args.timeout)
+        sequential = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = fetch_feeds(sources, timeout=args.timeout, budget=args.budget)
+        concurrent = time.perf_counter() - started
+
+    failed = [name for name, result in results.items() if not result.ok]
+    print(f"feeds:              {len(sources)} (delays: {', '.join(f'{d:.2f}s' for d in delays)})")
+    print(f"slowest single feed: {max(delays):.2f}s")
+    print(f"sequential fetch:   {sequential:.2f}s")
+    print(f"concurrent fetch:   {concurrent:.2f}s")
+    print(f"speedup:            {sequential / concurrent:.1f}x")
+    if failed:
+        print(f"failed/timed out:   {', '.join(failed)}")
+
+
+def bench_dedup(args):
+    """Queries and time spent de-duplicating one feed against a seeded database"""
+    import feedparser
+    from app import app, db
+    from models import Article
+    from scraper import NewsSource, FeedFetchResult, find_existing_urls, process_feed
+
+    body = build_rss_feed('Dedup', args.entries)
+    links = [entry.link for entry in feedparser.parse(body).entries]
+    source = NewsSource('Dedup', 'http://stand-in.invalid/dedup', is_rss=True)
+
+    with app.app_context():
+        seed_articles(links[:args.existing] + [f'https://example.com/unrelated-{i}' for i in range(args.padding)])
+
+        with QueryCounter(db.engine) as counter:
+            started = time.perf_counter()
+            per_entry = {link for link in links if Article.query.filter_by(source_url=link).first()}
+            per_entry_time = time.perf_counter() - started
+        per_entry_queries = counter.count
+
+        with QueryCounter(db.engine) as counter:
+            started = time.perf_counter()
+            batched = find_existing_urls(links)
+            batched_time = time.perf_counter() - started
+        batched_queries = counter.count
+
+        assert per_entry == batched, "batched lookup disagrees with per-entry lookup"
+
+        with QueryCounter(db.engine) as counter:
+            started = time.perf_counter()
+            added = process_feed(source, FeedFetchResult(source, content=body, status_code=200))
+            run_time = time.perf_counter() - started
+        run_queries = counter.count
+
+    print(f"feed entries:            {len(links)} ({args.existing} already stored, {args.padding} unrelated rows)")
+    print(f"per-entry lookup:        {per_entry_queries} queries, {per_entry_time * 1000:.1f} ms")
+    print(f"batched IN lookup:       {batched_queries} queries, {batched_time * 1000:.1f} ms")
+    print(f"full process_feed run:   {run_queries} queries, {run_time * 1000:.1f} ms, {added} articles added")
+    print(f"process_feed before:     ~{run_queries - batched_queries + per_entry_queries} queries (per-entry lookup)")
+
+
+def bench_clean(args):
+    """Documents per second for in-process vs process-pool HTML cleaning"""
+    import html_cleaner
+
+    documents = load_html_corpus(args.corpus, args.size)
+    total_bytes = sum(len(document) for document in documents)
+
+    started = time.perf_counter()
+    expected = html_cleaner.clean_html_batch(documents, workers=0)
+    inline_time = time.perf_counter() - started
+
+    # Warm the pool first so process start-up is not billed to the measured run
+    html_cleaner.clean_html_batch(documents[:args.workers * 8], workers=args.workers, min_bytes=0)
+    started = time.perf_counter()
+    pooled = html_cleaner.clean_html_batch(documents, workers=args.workers, min_bytes=0)
+    pool_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    routed = html_cleaner.clean_html_batch(documents, workers=args.workers)
+    default_time = time.perf_counter() - started
+    html_cleaner.shutdown_pool()
+
+    print(f"documents:            {len(documents)} ({total_bytes / 1024:.0f} KiB, "
+          f"{'corpus ' + args.corpus if args.corpus else 'synthetic'})")
+    print(f"in-process:           {len(documents) / inline_time:.1f} docs/s ({inline_time:.2f}s)")
+    print(f"pool ({args.workers} workers):     {len(documents) / pool_time:.1f} docs/s ({pool_time:.2f}s)")
+    print(f"default routing:      {len(documents) / default_time:.1f} docs/s ({default_time:.2f}s, "
+          f"{'pool' if total_bytes >= html_cleaner.CLEANER_MIN_BYTES else 'in-process'} "
+          f"under HTML_CLEANER_MIN_BYTES={html_cleaner.CLEANER_MIN_BYTES})")
+    print(f"output parity:        {'identical' if pooled == expected == routed else 'MISMATCH'}")
+
+
+def bench_engines(args):
+    """Per-document latency and output parity of each HTML cleaner engine"""
+    import html_cleaner
+
+    documents = load_html_corpus(args.corpus, args.size)
+    # The trafilatura engine is the original cleaning chain, so it is the parity reference
+    reference = [html_cleaner.clean_html_content(document, engine='trafilatura') for document in documents]
+    routed = {}
+    for document in documents:
+        name = html_cleaner.select_engine(document)
+        routed[name] = routed.get(name, 0) + 1
+
+    print(f"documents:   {len(documents)} ({'corpus ' + args.corpus if args.corpus else 'synthetic'}); "
+          f"auto routing: {', '.join(f'{name} {count}' for name, count in sorted(routed.items()))}")
+    print(f"{'engine':<12} {'mean ms':>8} {'p95 ms':>8} {'identical':>10} {'word overlap':>13}")
+    for engine in list(html_cleaner.ENGINES) + ['auto']:
+        latencies = []
+        outputs = []
+        for document in documents:
+            started = time.perf_counter()
+            outputs.append(html_cleaner.clean_html_content(document, engine=engine))
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        identical = sum(1 for output, expected in zip(outputs, reference) if output == expected)
+        overlaps = []
+        for output, expected in zip(outputs, reference):
+            words, expected_words = set(output.split()), set(expected.split())
+            union = words | expected_words
+            overlaps.append(len(words & expected_words) / len(union) if union else 1.0)
+        print(f"{engine:<12} {sum(latencies) / len(latencies) * 1000:>8.2f} "
+              f"{latencies[int(len(latencies) * 0.95) - 1] * 1000:>8.2f} "
+              f"{identical / len(documents):>10.0%} {sum(overlaps) / len(overlaps):>13.1%}")
+
+
+def bench_record(args):
+    """Download every configured feed once and save the raw bodies as replay fixtures"""
+    from scraper import SOURCES, fetch_feeds
+
+    os.makedirs(args.out, exist_ok=True)
+    sources = [source for source in SOURCES if source.is_rss]
+    results = fetch_feeds(sources)
+    manifest = {'recorded_at': datetime.utcnow().isoformat(), 'sources': {}}
+    for source in sources:
+        result = results.get(source.name)
+        if result is None or not result.ok:
+            print(f"{source.name:<16} failed: {result.error if result else 'no result'}")
+            continue
+        file_name = f"{source.name.lower().replace(' ', '-')}.xml"
+        with open(os.path.join(args.out, file_name), 'wb') as f:
+            f.write(result.content)
+        manifest['sources'][source.name] = {'file': file_name, 'url': source.url, 'etag': result.etag,
+                                            'last_modified': result.last_modified}
+        print(f"{source.name:<16} {len(result.content) / 1024:.0f} KiB -> {file_name}")
+    with open(os.path.join(args.out, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def bench_ingest(args):
+    """Replay feeds through scrape_articles() into a fresh database and time each stage"""
+    import feedparser
+    import html_cleaner
+    import scraper
+    from app import app, db
+
+    if args.fixtures:
+        fixtures = load_fixtures(args.fixtures)
+        feeds = {name: (f"/{file_name}", body) for name, (file_name, body) in fixtures.items()}
+    else:
+        feeds = {f"Source {i}": (f"/feed{i}", build_rss_feed(f"Source {i}", args.entries, full_content=args.full_content))
+                 for i in range(args.sources)}
+    entries = sum(len(feedparser.parse(body).entries) for _, body in feeds.values())
+    if args.workers is not None:
+        html_cleaner.CLEANER_WORKERS = args.workers
+    # Synthetic feeds can be far longer than anything a real source serves
+    scraper.FEED_ENTRY_LIMIT = max(scraper.FEED_ENTRY_LIMIT, entries)
+
+    with FeedStandIn({path: (body, 0) for path, body in feeds.values()}) as stand_in, app.app_context():
+        scraper.SOURCES = [scraper.NewsSource(name, f"{stand_in.base_url}{path}", is_rss=True)
+                           for name, (path, _) in feeds.items()]
+        with StageTimer(db.engine) as timer, QueryCounter(db.engine) as counter:
+            timer.wrap(scraper, 'fetch_feeds', 'fetch')
+            timer.wrap(feedparser, 'parse', 'parse')
+            timer.wrap(scraper, 'clean_html_batch', 'clean')
+            started = time.perf_counter()
+            added = scraper.scrape_articles()
+            total = time.perf_counter() - started
+
+    stages = ['fetch', 'parse', 'clean', 'insert']
+    other = total - sum(timer.totals.get(stage, 0.0) for stage in stages)
+    print(f"feeds:            {len(feeds)} ({'fixtures ' + args.fixtures if args.fixtures else 'synthetic'}), "
+          f"{entries} entries, {stand_in.bytes_served / 1024:.0f} KiB served")
+    print(f"articles added:   {added}")
+    print(f"wall time:        {total:.2f}s ({entries / total:.0f} entries/s)")
+    print(f"queries:          {counter.count} ({counter.count / max(entries, 1):.2f} per entry)")
+    for stage in stages:
+        elapsed = timer.totals.get(stage, 0.0)
+        print(f"  {stage:<15} {elapsed:>7.2f}s {elapsed / total:>5.0%}")
+    print(f"  {'other':<15} {other:>7.2f}s {other / total:>5.0%}  (dedup lookups, metrics, feed state)")
+
+
+def bench_sentiment(args):
+    """Texts per second and score parity of analyze_sentiment against the original scan"""
+    import text_analysis
+
+    if args.corpus:
+        import html_cleaner
+        texts = [html_cleaner.clean_html_content(document) for document in load_html_corpus(args.corpus)]
+    else:
+        texts = build_sentiment_corpus(args.size)
+    total_chars = sum(len(text) for text in texts)
+    text_analysis.get_matcher()  # Compile outside the timed run
+
+    started = time.perf_counter()
+    expected = [reference_sentiment(text) for text in texts]
+    reference_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [text_analysis.analyze_sentiment(text) for text in texts]
+    matcher_time = time.perf_counter() - started
+
+    mismatches = sum(1 for got, want in zip(actual, expected) if got != want)
+    print(f"texts:             {len(texts)} ({total_chars / 1024:.0f} KiB, "
+          f"{'corpus ' + args.corpus if args.corpus else 'synthetic'}), lexicon {text_analysis.LEXICON_VERSION}")
+    print(f"per-pattern scan:  {len(texts) / reference_time:.0f} texts/s ({reference_time:.2f}s)")
+    print(f"compiled matcher:  {len(texts) / matcher_time:.0f} texts/s ({matcher_time:.2f}s, "
+          f"{reference_time / matcher_time:.1f}x)")
+    print(f"score parity:      {'identical' if not mismatches else f'{mismatches} MISMATCHES'}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def reference_format_assets(text):
+    """The original per-asset ``\\b{asset}\\b`` substitution loop, as the parity reference"""
+    import re
+    from text_analysis import CRYPTO_ASSETS
+
+    for asset in CRYPTO_ASSETS:
+        text = re.compile(rf'\b{asset}\b', re.IGNORECASE).sub(asset.title(), text)
+    return text
+
+
+def bench_assets(args):
+    """Asset name formatting: per-asset regex loop vs the combined normalizer, on long articles"""
+    import random
+    import text_analysis
+
+    rng = random.Random(11)
+    mentions = list(text_analysis.CRYPTO_ASSETS) + ['Bitcoin', 'BTC', 'Binance Coin', 'ETH', 'XRP']
+    # Words that contain an alias but must not be rewritten
+    decoys = ['solar', 'ethos', 'adapt', 'bnbs', 'ripples', 'dogecoins', 'Polygonal', 'avalanches']
+    texts = []
+    for text in build_sentiment_corpus(args.size):
+        words = text.split()
+        for _ in range(max(1, len(words) // 20)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(mentions + decoys))
+        texts.append(' '.join(words))
+    extended = text_analysis.ASSET_NORMALIZER.extended(
+        {'BTC': 'bitcoin', 'USDT': 'tether', '1INCH': '1inch', 'AVAX': 'avalanche-2', 'NEAR': 'near'})
+
+    started = time.perf_counter()
+    expected = [reference_format_assets(text) for text in texts]
+    reference_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    actual = [text_analysis.format_assets(text) for text in texts]
+    combined_time = time.perf_counter() - started
+
+    started = time.perf_counter()
+    [extended.normalize(text) for text in texts]
+    extended_time = time.perf_counter() - started
+
+    mismatches = sum(1 for got, want in zip(actual, expected) if got != want)
+    print(f"texts:              {len(texts)} ({sum(len(text) for text in texts) / 1024:.0f} KiB)")
+    print(f"per-asset loop:     {len(texts) / reference_time:.0f} texts/s ({reference_time:.2f}s), "
+          f"{len(text_analysis.CRYPTO_ASSETS)} passes per text")
+    print(f"combined regex:     {len(texts) / combined_time:.0f} texts/s ({combined_time:.2f}s, "
+          f"{reference_time / combined_time:.1f}x)")
+    print(f"extended coverage:  {len(texts) / extended_time:.0f} texts/s ({extended_time:.2f}s, "
+          f"{len(extended.replacements)} aliases)")
+    print(f"output parity:      {'identical' if not mismatches else f'{mismatches} MISMATCHES'}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def bench_nlp(args):
+    """Articles per second for process_articles in-process, across worker processes, and from the cache"""
+    import resource
+    import nlp_processor
+    import sentiment_cache
+    from app import app, db
+    from models import Article, SentimentCacheEntry
+    from sqlalchemy import delete, update
+
+    def run(label, workers, cold=True):
+        db.session.execute(update(Article).values(sentiment_label=None, sentiment_score=None))
+        if cold:
+            db.session.execute(delete(SentimentCacheEntry))
+            sentiment_cache.get_cache().clear()
+        db.session.commit()
+        started = time.perf_counter()
+        processed = nlp_processor.process_articles(chunk_size=args.chunk_size, workers=workers)
+        elapsed = time.perf_counter() - started
+        print(f"{label + ':':<20} {processed / elapsed:.0f} articles/s ({elapsed:.2f}s), "
+              f"peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB")
+
+    texts = build_sentiment_corpus(args.articles)
+    with app.app_context():
+        seed_articles([f'https://example.com/nlp-{i}' for i in range(len(texts))], texts=texts)
+        print(f"articles:            {len(texts)} ({sum(len(text) for text in texts) / 1024:.0f} KiB), "
+              f"chunks of {args.chunk_size}")
+        run('in-process', 0)
+        if args.workers:
+            run(f'{args.workers} workers', args.workers)
+        run('cached re-run', args.workers)
+        nlp_processor._pool.shutdown()
+
+
+def legacy_related_news(symbol, since):
+    """The original substring query of the per-symbol signal calculation, as the baseline"""
+    from app import db
+    from models import Article
+    from sqlalchemy import desc
+
+    return Article.query.filter(
+        db.and_(
+            db.or_(
+                Article.content.ilike(f'%{symbol}%'),
+                Article.title.ilike(f'%{symbol}%')
+            ),
+            Article.created_at >= since
+        )
+    ).order_by(desc(Article.created_at)).all()
+
+
+def build_mention_corpus(size, seed=13):
+    """Synthetic ``(titles, texts)`` of short articles mentioning dashboard symbols by ticker or
+    name, mixed with people, organizations and words that contain a ticker"""
+    import random
+    from app import crypto_names
+
+    rng = random.Random(seed)
+    words = ['market', 'traders', 'rally', 'price', 'week', 'analysts', 'said', 'funding', 'the', 'a', 'of',
+             # Words containing a ticker, which substring matching counts as mentions
+             'SOLUTION', 'method', 'ethics', 'patron', 'electronic', 'adapt', 'linkage', 'atomic', 'uniform']
+    others = ['Gary Gensler said', 'BlackRock filed', 'the SEC', 'Coinbase listed', 'Vitalik Buterin wrote']
+    mentions = sorted(crypto_names) + list(crypto_names.values())
+    titles, texts = [], []
+    for i in range(size):
+        tokens = [rng.choice(words) for _ in range(rng.randint(20, 80))]
+        for _ in range(rng.randint(0, 3)):
+            tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(mentions))
+        tokens.insert(rng.randrange(len(tokens) + 1), rng.choice(others))
+        titles.append(f"{rng.choice(mentions)} {rng.choice(words)} {i}")
+        texts.append(' '.join(tokens) + '.')
+    return titles, texts
+
+
+def bench_symbols(args):
+    """Related-news lookups for every dashboard symbol: substring scans vs the mention index"""
+    import random
+    import nlp_processor
+    from app import app, articles_mentioning, crypto_names, db
+
+    rng = random.Random(17)
+    symbols = sorted(crypto_names)
+    titles, texts = build_mention_corpus(args.articles)
+    now = datetime.utcnow()
+    created = [now - timedelta(days=args.days * rng.random()) for _ in texts]
+
+    with app.app_context():
+        for start in range(0, len(texts), 10000):
+            end = min(start + 10000, len(texts))
+            seed_articles([f'https://example.com/symbols-{i}' for i in range(start, end)],
+                          texts=texts[start:end], titles=titles[start:end], created=created[start:end])
+        print(f"articles:          {len(texts)} over {args.days} days, {len(symbols)} symbols, 3-day window")
+        since = now - timedelta(days=3)
+
+        started = time.perf_counter()
+        legacy = {symbol: len(legacy_related_news(symbol, since)) for symbol in symbols}
+        legacy_time = time.perf_counter() - started
+        db.session.rollback()
+
+        started = time.perf_counter()
+        written = nlp_processor.backfill_article_symbols(chunk_size=args.chunk_size, workers=args.workers)
+        backfill_time = time.perf_counter() - started
+        nlp_processor._pool.shutdown()
+
+        started = time.perf_counter()
+        indexed = {symbol: len(articles_mentioning(symbol, since)) for symbol in symbols}
+        indexed_time = time.perf_counter() - started
+
+        print(f"backfill:          {len(texts) / backfill_time:.0f} articles/s ({backfill_time:.2f}s, "
+              f"{written} mention rows)")
+        print(f"substring scans:   {legacy_time * 1000 / len(symbols):.1f} ms/symbol ({legacy_time:.2f}s per "
+              f"dashboard pass, {sum(legacy.values())} matches)")
+        print(f"mention index:     {indexed_time * 1000 / len(symbols):.1f} ms/symbol ({indexed_time:.2f}s per "
+              f"dashboard pass, {sum(indexed.values())} matches, {legacy_time / indexed_time:.0f}x)")
+
+
+def bench_signals(args):
+    """Dashboard signals: one window scan per symbol vs one read of the sentiment buckets"""
+    import random
+    import nlp_processor
+    import sentiment_buckets
+    from app import app, calculate_all_crypto_signals, db, signals_from_counts
+    from crypto_price_tracker import CryptoPriceTracker
+    from models import Article
+    from sqlalchemy import case, update
+
+    rng = random.Random(19)
+    symbols = sorted(CryptoPriceTracker().crypto_ids)
+    titles, texts = build_mention_corpus(args.articles)
+    now = datetime.utcnow()
+    created = [now - timedelta(days=args.days * rng.random()) for _ in texts]
+
+    with app.app_context():
+        for start in range(0, len(texts), 10000):
+            end = min(start + 10000, len(texts))
+            seed_articles([f'https://example.com/signals-{i}' for i in range(start, end)],
+                          texts=texts[start:end], titles=titles[start:end], created=created[start:end])
+        db.session.execute(update(Article).values(sentiment_label=case(
+            (Article.id % 5 < 2, 'positive'), (Article.id % 5 == 2, 'negative'), else_='neutral')))
+        db.session.commit()
+        # The backfill fills the sentiment buckets incrementally, chunk by chunk
+        nlp_processor.backfill_article_symbols(workers=0)
+        print(f"articles:          {len(texts)} over {args.days} days, {len(symbols)} symbols")
+        incremental_mismatches = sentiment_buckets.verify(symbols)
+        started = time.perf_counter()
+        sentiment_buckets.rebuild()
+        rebuild_time = time.perf_counter() - started
+        rebuilt_mismatches = sentiment_buckets.verify(symbols)
+
+        started = time.perf_counter()
+        with QueryCounter(db.engine) as counter:
+            # One scan of the window's labelled articles per symbol
+            expected = {symbol: signals_from_counts(sentiment_buckets.scan_counts([symbol])[symbol])
+                        for symbol in symbols}
+        per_symbol_time = time.perf_counter() - started
+        per_symbol_queries = counter.count
+
+        started = time.perf_counter()
+        with QueryCounter(db.engine) as counter:
+            actual = calculate_all_crypto_signals(symbols)
+        batched_time = time.perf_counter() - started
+
+        mismatches = sum(1 for symbol in symbols if actual[symbol] != expected[symbol])
+        print(f"per symbol scans:  {per_symbol_time * 1000:.0f} ms, {per_symbol_queries} queries")
+        print(f"bucket read:       {batched_time * 1000:.0f} ms, {counter.count} queries "
+              f"({per_symbol_time / batched_time:.0f}x)")
+        print(f"bucket rebuild:    {rebuild_time * 1000:.0f} ms")
+        print(f"bucket parity:     {len(incremental_mismatches) or 'identical'} (incremental), "
+              f"{len(rebuilt_mismatches) or 'identical'} (rebuilt) vs window scan")
+        print(f"signal parity:     {'identical' if not mismatches else f'{mismatches} MISMATCHES'}")
+        if mismatches or incremental_mismatches or rebuilt_mismatches:
+            raise SystemExit(1)
+
+
+def reference_tooltips(summary, prices):
+    """The original per-symbol compile/search/sub tooltip loop, as the parity reference"""
+    import re
+    from markupsafe import Markup, escape
+
+    enhanced_summary = escape(summary)
+    for crypto in prices:
+        pattern = re.compile(r'\b' + re.escape(crypto.symbol) + r'\b', re.IGNORECASE)
+        if pattern.search(str(enhanced_summary)):
+            tooltip_html = Markup(
+                f'<span class="crypto-tooltip">{crypto.symbol}'
+                f'<div class="tooltip-content">'
+                f'<span class="tooltip-price">${crypto.price_usd:.2f}</span>'
+                f'<span class="tooltip-change {("positive" if crypto.percent_change_24h > 0 else "negative")}">'
+                f'{crypto.percent_change_24h:.1f}%</span>'
+                f'</div></span>'
+            )
+            enhanced_summary = Markup(pattern.sub(str(tooltip_html), str(enhanced_summary)))
+    return enhanced_summary
+
+
+def bench_tooltips(args):
+    """Summary tooltips: the per-symbol regex loop vs the shared injector, and cached pages"""
+    import random
+    import re
+    from types import SimpleNamespace
+    import tooltips
+    from crypto_price_tracker import CryptoPriceTracker
+
+    rng = random.Random(23)
+    prices = [SimpleNamespace(symbol=symbol, price_usd=rng.uniform(0.01, 70000), percent_change_24h=rng.uniform(-9, 9))
+              for symbol in sorted(CryptoPriceTracker().crypto_ids)]
+    _, texts = build_mention_corpus(args.size)
+    summaries = [' '.join(text.split()[:40]) for text in texts]
+    # The dashboard shows 15 summaries per page
+    pages = [summaries[i:i + 15] for i in range(0, len(summaries), 15)]
+
+    started = time.perf_counter()
+    expected = [reference_tooltips(summary, prices) for summary in summaries]
+    reference_time = time.perf_counter() - started
+
+    compiles = []
+    original_compile = re.compile
+    re.compile = lambda *a, **k: compiles.append(a) or original_compile(*a, **k)
+    try:
+        tooltips.get_injector(prices)
+        compiles.clear()
+        started = time.perf_counter()
+        actual = [tooltips.get_injector(prices).annotate(summary) for summary in summaries]
+        injector_time = time.perf_counter() - started
+        for cold in (True, False):
+            started = time.perf_counter()
+            for number, page in enumerate(pages):
+                injector = tooltips.get_injector(prices)
+                [tooltips.annotate_summary(injector, number * 15 + i, summary) for i, summary in enumerate(page)]
+            cached_time = time.perf_counter() - started
+    finally:
+        re.compile = original_compile
+
+    mismatches = sum(1 for got, want in zip(actual, expected) if str(got) != str(want))
+    print(f"summaries:         {len(summaries)}, {len(prices)} priced symbols")
+    print(f"per-symbol loop:   {reference_time * 1000 / len(pages):.2f} ms/page ({len(prices)} compiles per summary)")
+    print(f"injector:          {injector_time * 1000 / len(pages):.2f} ms/page "
+          f"({reference_time / injector_time:.0f}x, {len(compiles)} compiles)")
+    print(f"cached:            {cached_time * 1000 / len(pages):.2f} ms/page")
+    print(f"output parity:     {'identical' if not mismatches else f'{mismatches} MISMATCHES'}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def bench_dashboard(args):
+    """Anonymous dashboard hits: rendered per request vs the page cache, and 304 revalidation"""
+    import gzip
+    import random
+    from app import app, db, refresh_crypto_signals
+    from crypto_price_tracker import CryptoPriceTracker
+    from models import Article, CryptoPrice
+    from page_cache import dashboard_cache
+    from sqlalchemy import update
+
+    rng = random.Random(29)
+    titles, texts = build_mention_corpus(args.articles)
+    client = app.test_client()
+
+    def timed(headers, hits):
+        started = time.perf_counter()
+        with QueryCounter(engine) as counter:
+            for _ in range(hits):
+                response = client.get('/', headers=headers)
+        return response, (time.perf_counter() - started) * 1000 / hits, counter.count / hits
+
+    with app.app_context():
+        seed_articles([f'https://example.com/dashboard-{i}' for i in range(len(texts))], texts=texts, titles=titles)
+        db.session.execute(update(Article).values(sentiment_score=0.1, sentiment_label='positive'))
+        for symbol in CryptoPriceTracker().crypto_ids:
+            db.session.add(CryptoPrice(symbol=symbol, price_usd=rng.uniform(0.01, 70000),
+                                       percent_change_24h=rng.uniform(-9, 9)))
+        db.session.commit()
+        refresh_crypto_signals()
+        engine = db.engine
+
+    gzip_headers = {'Accept-Encoding': 'gzip'}
+    rendered = []
+    started = time.perf_counter()
+    with QueryCounter(engine) as counter:
+        for _ in range(args.hits):
+            dashboard_cache.bump()
+            rendered.append(client.get('/', headers=gzip_headers))
+    uncached_time = (time.perf_counter() - started) * 1000 / args.hits
+    uncached_queries = counter.count / args.hits
+    cached, cached_time, cached_queries = timed(gzip_headers, args.hits)
+    plain, _, _ = timed({}, 1)
+    etag = cached.headers['ETag']
+    revalidated, revalidate_time, revalidate_queries = timed(dict(gzip_headers, **{'If-None-Match': etag}), args.hits)
+
+    with app.app_context():
+        price = CryptoPrice.query.first()
+        price.price_usd *= 2
+        db.session.commit()
+    dashboard_cache.bump()
+    changed = client.get('/', headers=dict(gzip_headers, **{'If-None-Match': etag}))
+
+    html = gzip.decompress(rendered[-1].get_data())
+    failures = [name for name, failed in (
+        ('status', any(response.status_code != 200 for response in rendered + [cached, plain])),
+        ('gzip body', gzip.decompress(cached.get_data()) != html),
+        ('identity body', plain.get_data() != html or 'Content-Encoding' in plain.headers),
+        ('304', revalidated.status_code != 304 or revalidated.get_data()),
+        ('queries on hit', cached_queries or revalidate_queries),
+        ('bump', changed.status_code != 200 or changed.headers['ETag'] == etag),
+    ) if failed]
+    print(f"articles:          {len(texts)}, {args.hits} hits each, page {len(html) // 1024} KiB "
+          f"({len(cached.get_data()) // 1024} KiB gzip)")
+    print(f"rendered:          {uncached_time:.2f} ms/hit, {uncached_queries:.0f} queries")
+    print(f"cached:            {cached_time:.2f} ms/hit ({uncached_time / cached_time:.0f}x), {cached_queries:.0f} queries")
+    print(f"304 revalidation:  {revalidate_time:.2f} ms/hit, {revalidate_queries:.0f} queries")
+    print(f"checks:            {'passed' if not failures else 'FAILED ' + ', '.join(failures)}")
+    if failures:
+        raise SystemExit(1)
+
+
+def bench_feed(args):
+    """Article feed pages: OFFSET pagination vs the (created_at, id) keyset cursor, at page 1 and deep"""
+    import random
+    from app import FEED_PAGE_SIZE, app, db, decode_cursor, feed_page
+    from models import Article
+    from sqlalchemy import update
+
+    rng = random.Random(31)
+    now = datetime.utcnow()
+    # Whole seconds, so many articles share a created_at and the id tiebreak matters
+    created = [(now - timedelta(days=60 * rng.random())).replace(microsecond=0) for _ in range(args.articles)]
+    pages = [1, args.page]
+
+    def legacy_page(page):
+        # The old endpoint: OFFSET plus COUNT(*) over 90 days of articles
+        return Article.query.filter(
+            Article.created_at >= datetime.utcnow() - timedelta(days=90),
+            Article.sentiment_score.isnot(None)
+        ).order_by(Article.created_at.desc()).paginate(page=page, per_page=FEED_PAGE_SIZE, error_out=False).items
+
+    def timed(fetch):
+        started = time.perf_counter()
+        for _ in range(args.repeat):
+            fetch()
+        return (time.perf_counter() - started) * 1000 / args.repeat
+
+    with app.app_context():
+        for start in range(0, args.articles, 10000):
+            end = min(start + 10000, args.articles)
+            seed_articles([f'https://example.com/feed-{i}' for i in range(start, end)], created=created[start:end])
+        db.session.execute(update(Article).values(sentiment_score=0.1, sentiment_label='positive'))
+        db.session.commit()
+        ordered = db.session.execute(
+            db.select(Article.id, Article.created_at).order_by(Article.created_at.desc(), Article.id.desc())
+        ).all()
+
+        walked = []
+        rows, cursor = feed_page()
+        walked.extend(row.id for row in rows)
+        while cursor:
+            rows, cursor = feed_page(decode_cursor(cursor))
+            walked.extend(row.id for row in rows)
+
+        print(f"articles:          {args.articles}, {FEED_PAGE_SIZE} per page, {args.repeat} reads each")
+        for page in pages:
+            skip = (page - 1) * FEED_PAGE_SIZE
+            after = (ordered[skip - 1].created_at, ordered[skip - 1].id) if skip else None
+            offset_time = timed(lambda: legacy_page(page))
+            keyset_time = timed(lambda: feed_page(after))
+            print(f"page {page:<5}        OFFSET {offset_time:.2f} ms, cursor {keyset_time:.2f} ms")
+
+        client = app.test_client()
+        first = client.get('/api/articles').get_json()
+        second = client.get(f"/api/articles?cursor={first['next_cursor']}").get_json()
+        bad = client.get('/api/articles?cursor=not-a-cursor')
+
+    expected = [row.id for row in ordered]
+    failures = [name for name, failed in (
+        ('walk', walked != expected),
+        ('endpoint pages', [a['id'] for a in first['articles'] + second['articles']] != expected[:2 * FEED_PAGE_SIZE]),
+        ('bad cursor', bad.status_code != 400),
+    ) if failed]
+    print(f"cursor walk:       {len(walked)} articles in {len(walked) // FEED_PAGE_SIZE + 1} pages")
+    print(f"checks:            {'passed' if not failures else 'FAILED ' + ', '.join(failures)}")
+    if failures:
+        raise SystemExit(1)
+
+
+def bench_registry(args):
+    """Asset name resolution through the registry's alias trie, and parity with the tables it replaced"""
+    import random
+    from asset_registry import ASSETS, CRYPTO_ASSETS, alias_key
+
+    # The name table search() used to keep
+    legacy_search = {'bitcoin': 'BTC', 'ethereum': 'ETH', 'binance': 'BNB', 'cardano': 'ADA', 'solana': 'SOL',
+                     'ripple': 'XRP', 'dogecoin': 'DOGE', 'polygon': 'MATIC', 'avalanche': 'AVAX', 'ondo': 'ONDO'}
+    expected = dict(legacy_search)
+    expected.update({alias: symbol for alias, symbol in CRYPTO_ASSETS.items()})
+    expected.update({symbol.lower(): symbol for symbol in ASSETS})
+    # A display name shared with another asset's ticker resolves to the ticker
+    expected.update({name: symbol for symbol, name in ASSETS.names.items() if alias_key(name).upper() not in ASSETS})
+
+    rng = random.Random(37)
+    queries = [rng.choice([name, name.upper(), name.title(), f'  {name} ']) for name in expected]
+    queries = (queries * (args.lookups // len(queries) + 1))[:args.lookups]
+    started = time.perf_counter()
+    for query in queries:
+        ASSETS.resolve(query)
+    resolve_time = time.perf_counter() - started
+
+    mismatches = {name: (ASSETS.resolve(name), symbol) for name, symbol in expected.items()
+                  if ASSETS.resolve(name) != symbol}
+    print(f"assets:            {len(ASSETS.assets)} ({len(ASSETS.coin_ids)} priced), {len(expected)} names checked")
+    print(f"resolve:           {resolve_time * 1e9 / len(queries):.0f} ns/name over {len(queries)} lookups")
+    print(f"name parity:       {'identical' if not mismatches else f'{len(mismatches)} MISMATCHES {mismatches}'}")
+    if mismatches:
+        raise SystemExit(1)
+
+
+def bench_coindata(args):
+    """Coin page latency with a slow CoinGecko stand-in: in-request fetches vs the background cache"""
+    import app as app_module
+    import coin_metadata
+    from app import app, db
+    from asset_registry import ASSETS
+    from models import CryptoPrice
+
+    calls = []
+
+    def slow_fetch(symbol):
+        calls.append(symbol)
+        time.sleep(args.latency)
+        return {'market_cap': 1e9, 'total_volume': 1e8, 'circulating_supply': 1e6, 'total_supply': 2e6,
+                'market_cap_rank': 1, 'reddit_subscribers': None, 'twitter_followers': None, 'telegram_users': None}
+
+    symbols = list(ASSETS.coin_ids)[:args.symbols]
+    with app.app_context():
+        for symbol in symbols:
+            db.session.add(CryptoPrice(symbol=symbol, price_usd=1.0, percent_change_24h=0.5))
+        db.session.commit()
+    client = app.test_client()
+
+    def use_cache(cache):
+        # app imported the module's cache by name
+        coin_metadata.coin_cache = app_module.coin_cache = cache
+        return cache
+
+    def page_time(symbol):
+        started = time.perf_counter()
+        response = client.get(f'/crypto/{symbol}')
+        return (time.perf_counter() - started) * 1000, response
+
+    # What the page used to pay: the upstream call inside the request
+    use_cache(coin_metadata.CoinMetadataCache(lambda symbol: None))
+    started = time.perf_counter()
+    slow_fetch(symbols[0])
+    inline_time = (time.perf_counter() - started) * 1000 + page_time(symbols[0])[0]
+
+    cache = use_cache(coin_metadata.CoinMetadataCache(slow_fetch, ttl=args.ttl, retry=args.ttl))
+    calls.clear()
+
+    cold = [page_time(symbol)[0] for symbol in symbols]
+    # Concurrent misses for one symbol while its first fetch is in flight
+    burst = [cache.refresh(symbols[0]) for _ in range(args.burst)] + [cache.get(symbols[0]) for _ in range(args.burst)]
+    cache.warm(symbols)
+    for future in list(cache.inflight.values()):
+        future.result()
+    warm_calls = len(calls)
+    warm = [page_time(symbol) for symbol in symbols]
+    time.sleep(args.ttl * 1.1)
+    stale = [page_time(symbol) for symbol in symbols]
+    for future in list(cache.inflight.values()):
+        future.result()
+
+    worst = max(cold + [ms for ms, _ in warm + stale])
+    failures = [name for name, failed in (
+        ('coalescing', warm_calls != len(symbols)),
+        ('burst', len({id(future) for future in burst[:args.burst]}) != 1),
+        ('warm data', any(b'1,000,000,000' not in response.get_data() for _, response in warm)),
+        ('stale served', any(b'1,000,000,000' not in response.get_data() for _, response in stale)),
+        ('stale refreshed', len(calls) != 2 * len(symbols)),
+        ('latency', worst >= args.latency * 1000),
+    ) if failed]
+    print(f"symbols:           {len(symbols)}, upstream latency {args.latency * 1000:.0f} ms")
+    print(f"in-request fetch:  {inline_time:.1f} ms/page")
+    print(f"cold cache:        {sum(cold) / len(cold):.1f} ms/page (refresh scheduled, page without coin data)")
+    print(f"warm cache:        {sum(ms for ms, _ in warm) / len(warm):.1f} ms/page")
+    print(f"stale cache:       {sum(ms for ms, _ in stale) / len(stale):.1f} ms/page (stale data, refreshed behind)")
+    print(f"upstream calls:    {warm_calls} for {len(symbols)} cold symbols and a burst of {2 * args.burst} misses")
+    print(f"checks:            {'passed' if not failures else 'FAILED ' + ', '.join(failures)}")
+    if failures:
+        raise SystemExit(1)
+
+
+def bench_entities(args):
+    """Documents per second of the spaCy entity stage, in-process and across worker processes"""
+    import nlp_processor
+    from app import app, db
+    from models import Article, ArticleEntity
+    from sqlalchemy import delete, func, select, update
+
+    def run(label, workers):
+        db.session.execute(delete(ArticleEntity))
+        db.session.execute(update(Article).values(entity_model=None))
+        db.session.commit()
+        started = time.perf_counter()
+        processed = nlp_processor.extract_article_entities(chunk_size=args.chunk_size, workers=workers,
+                                                           model=args.model)
+        elapsed = time.perf_counter() - started
+        counts = dict(db.session.execute(select(ArticleEntity.label, func.count()).group_by(ArticleEntity.label)).all())
+        print(f"{label + ':':<20} {processed / elapsed:.0f} docs/s ({elapsed:.2f}s), entities {counts}")
+
+    titles, texts = build_mention_corpus(args.articles)
+    with app.app_context():
+        seed_articles([f'https://example.com/entities-{i}' for i in range(len(texts))], texts=texts, titles=titles)
+        print(f"articles:            {len(texts)}, model {args.model}, chunks of {args.chunk_size}")
+        run('in-process', 0)
+        if args.workers:
+            run(f'{args.workers} workers', args.workers)
+        nlp_processor._pool.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    fetch_parser = subparsers.add_parser('fetch', help='sequential vs concurrent feed downloads')
+    fetch_parser.add_argument('--delays', default='0.5,1.0,1.5,2.0',
+                              help='comma separated response delay per stand-in feed, in seconds')
+    fetch_parser.add_argument('--entries', type=int, default=50, help='items per synthetic feed')
+    fetch_parser.add_argument('--timeout', type=float, default=15, help='per-source deadline in seconds')
+    fetch_parser.add_argument('--budget', type=float, default=45, help='overall fetch budget in seconds')
+    fetch_parser.set_defaults(func=bench_fetch)
+
+    dedup_parser = subparsers.add_parser('dedup', help='per-entry vs batched URL de-duplication')
+    dedup_parser.add_argument('--entries', type=int, default=500, help='items in the synthetic feed')
+    dedup_parser.add_argument('--existing', type=int, default=450, help='feed items already in the database')
+    dedup_parser.add_argument('--padding', type=int, default=20000, help='unrelated articles seeded alongside')
+    dedup_parser.set_defaults(func=bench_dedup)
+
+    clean_parser = subparsers.add_parser('clean', help='HTML cleaning throughput, in-process vs process pool')
+    clean_parser.add_argument('--corpus', help='directory of recorded feed files (default: synthetic corpus)')
+    clean_parser.add_argument('--size', type=int, default=400, help='synthetic corpus size')
+    clean_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='pool worker processes')
+    clean_parser.set_defaults(func=bench_clean)
+
+    engines_parser = subparsers.add_parser('engines', help='latency and output parity of each HTML cleaner engine')
+    engines_parser.add_argument('--corpus', help='directory of recorded feed files (default: synthetic corpus)')
+    engines_parser.add_argument('--size', type=int, default=400, help='synthetic corpus size')
+    engines_parser.set_defaults(func=bench_engines)
+
+    record_parser = subparsers.add_parser('record', help='save the live feeds as replay fixtures (uses the network)')
+    record_parser.add_argument('--out', default='fixtures', help='directory for the feed bodies and manifest.json')
+    record_parser.set_defaults(func=bench_record)
+
+    ingest_parser = subparsers.add_parser('ingest', help='end-to-end scrape_articles() throughput on replayed feeds')
+    ingest_parser.add_argument('--fixtures', help='directory written by record (default: synthetic feeds)')
+    ingest_parser.add_argument('--sources', type=int, default=4, help='synthetic feeds')
+    ingest_parser.add_argument('--entries', type=int, default=1000, help='items per synthetic feed')
+    ingest_parser.add_argument('--full-content', action='store_true', help='give synthetic items a full article body')
+    ingest_parser.add_argument('--workers', type=int, help='HTML cleaning pool size (default: HTML_CLEANER_WORKERS)')
+    ingest_parser.set_defaults(func=bench_ingest)
+
+    sentiment_parser = subparsers.add_parser('sentiment', help='analyze_sentiment throughput and score parity')
+    sentiment_parser.add_argument('--corpus', help='directory of recorded feed files (default: synthetic texts)')
+    sentiment_parser.add_argument('--size', type=int, default=2000, help='synthetic corpus size')
+    sentiment_parser.set_defaults(func=bench_sentiment)
+
+    assets_parser = subparsers.add_parser('assets', help='asset name formatting throughput and output parity')
+    assets_parser.add_argument('--size', type=int, default=2000, help='synthetic corpus size')
+    assets_parser.set_defaults(func=bench_assets)
+
+    nlp_parser = subparsers.add_parser('nlp', help='process_articles throughput: in-process, worker processes and cached')
+    nlp_parser.add_argument('--articles', type=int, default=20000, help='unprocessed articles to seed')
+    nlp_parser.add_argument('--chunk-size', type=int, default=500, help='articles per chunk')
+    nlp_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    nlp_parser.set_defaults(func=bench_nlp)
+
+    symbols_parser = subparsers.add_parser('symbols', help='related-news lookups: substring scans vs the mention index')
+    symbols_parser.add_argument('--articles', type=int, default=100000, help='articles to seed')
+    symbols_parser.add_argument('--days', type=int, default=10, help='days the seeded articles are spread over')
+    symbols_parser.add_argument('--chunk-size', type=int, default=500, help='articles per backfill chunk')
+    symbols_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='backfill worker processes')
+    symbols_parser.set_defaults(func=bench_symbols)
+
+    signals_parser = subparsers.add_parser('signals', help='dashboard signals: per-symbol scans vs the sentiment buckets')
+    signals_parser.add_argument('--articles', type=int, default=20000, help='articles to seed')
+    signals_parser.add_argument('--days', type=int, default=5, help='days the seeded articles are spread over')
+    signals_parser.set_defaults(func=bench_signals)
+
+    tooltips_parser = subparsers.add_parser('tooltips', help='summary price tooltips: per-symbol loop vs shared injector')
+    tooltips_parser.add_argument('--size', type=int, default=3000, help='summaries to annotate')
+    tooltips_parser.set_defaults(func=bench_tooltips)
+
+    dashboard_parser = subparsers.add_parser('dashboard', help='anonymous dashboard hits: rendered vs cached and 304s')
+    dashboard_parser.add_argument('--articles', type=int, default=2000, help='articles to seed')
+    dashboard_parser.add_argument('--hits', type=int, default=50, help='requests per variant')
+    dashboard_parser.set_defaults(func=bench_dashboard)
+
+    feed_parser = subparsers.add_parser('feed', help='article feed pages: OFFSET vs keyset cursor')
+    feed_parser.add_argument('--articles', type=int, default=20000, help='articles to seed')
+    feed_parser.add_argument('--page', type=int, default=500, help='deep page to compare with page 1')
+    feed_parser.add_argument('--repeat', type=int, default=20, help='reads per page')
+    feed_parser.set_defaults(func=bench_feed)
+
+    registry_parser = subparsers.add_parser('registry', help='asset name resolution through the alias trie')
+    registry_parser.add_argument('--lookups', type=int, default=200000, help='names to resolve')
+    registry_parser.set_defaults(func=bench_registry)
+
+    coindata_parser = subparsers.add_parser('coindata', help='coin page latency: in-request fetch vs background cache')
+    coindata_parser.add_argument('--symbols', type=int, default=10, help='coin pages to request')
+    coindata_parser.add_argument('--latency', type=float, default=0.5, help='seconds per upstream call')
+    coindata_parser.add_argument('--ttl', type=float, default=2.0, help='cache TTL in seconds')
+    coindata_parser.add_argument('--burst', type=int, default=50, help='concurrent misses for one symbol')
+    coindata_parser.set_defaults(func=bench_coindata)
+
+    entities_parser = subparsers.add_parser('entities', help='spaCy entity extraction throughput in docs/s')
+    entities_parser.add_argument('--articles', type=int, default=5000, help='articles to seed')
+    entities_parser.add_argument('--model', default='blank', help="installed spaCy pipeline, or 'blank'")
+    entities_parser.add_argument('--chunk-size', type=int, default=500, help='articles per chunk')
+    entities_parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='worker processes')
+    entities_parser.set_defaults(func=bench_entities)
+
+    args = parser.parse_args()
+    # Configure logging before the app modules do, so their DEBUG output stays quiet
+    logging.basicConfig(level=logging.WARNING)
+    # trafilatura logs an ERROR for every snippet it cannot parse as a page
+    logging.getLogger('trafilatura').setLevel(logging.CRITICAL)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
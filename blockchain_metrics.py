@@ -1,6 +1,6 @@
 import os
 import logging
-import requests
+from http_client import get_client
 from datetime import datetime, timedelta
 
 logging.basicConfig(level=logging.DEBUG)
@@ -21,7 +21,7 @@ class EtherscanClient:
                 'tag': 'latest',
                 'apikey': self.api_key
             }
-            response = requests.get(self.base_url, params=params)
+            response = get_client().get(self.base_url, params=params)
             response.raise_for_status()
             data = response.json()
             if data['status'] == '1':
@@ -47,7 +47,7 @@ class EtherscanClient:
                 'apikey': self.api_key
             }
 
-            response = requests.get(self.base_url, params=params)
+            response = get_client().get(self.base_url, params=params)
             if response.status_code != 200:
                 logger.error(f"Error response from Etherscan: {response.status_code}")
                 return []
@@ -78,7 +78,7 @@ class EtherscanClient:
                 'apikey': self.api_key
             }
             
-            response = requests.get(self.base_url, params=params)
+            response = get_client().get(self.base_url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -98,7 +98,7 @@ class EtherscanClient:
                 'apikey': self.api_key
             }
 
-            response = requests.get(self.base_url, params=params)
+            response = get_client().get(self.base_url, params=params)
             if response.status_code != 200:
                 logger.error(f"Error response from Etherscan gas oracle: {response.status_code}")
                 return None
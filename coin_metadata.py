@@ -0,0 +1,137 @@
+"""CoinGecko coin metadata for the coin pages, served from memory and refreshed in the background.
+
+``/coins/{id}`` requests are paced and can back off for up to a minute on a 429,
+so they never run in a request. ``CoinMetadataCache.get`` only reads memory: a
+stale or missing entry schedules a refresh on a background worker and the page
+shows the stale data, or none, meanwhile (stale-while-revalidate). Refreshes of a
+symbol already being fetched join that fetch, so concurrent misses make one
+upstream call. ``warm_coin_data`` keeps the top symbols fresh from the scheduler.
+"""
+import logging
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from asset_registry import ASSETS
+from crypto_price_tracker import CryptoPriceTracker
+
+logger = logging.getLogger(__name__)
+
+# Seconds coin data stays fresh, spread by up to ±10% per symbol so entries don't all expire together
+COIN_DATA_TTL = int(os.environ.get('COIN_DATA_TTL', 900))
+# Seconds stale coin data is still shown while its refresh is pending
+COIN_DATA_MAX_AGE = int(os.environ.get('COIN_DATA_MAX_AGE', 6 * 3600))
+# Seconds before a failed fetch of a symbol is retried
+COIN_DATA_RETRY = int(os.environ.get('COIN_DATA_RETRY', 120))
+# Symbols the scheduled warmer keeps fresh, in registry order (largest first)
+COIN_DATA_WARM_TOP = int(os.environ.get('COIN_DATA_WARM_TOP', 25))
+# Seconds between warmer runs
+COIN_DATA_WARM_INTERVAL = int(os.environ.get('COIN_DATA_WARM_INTERVAL', 300))
+
+class CoinEntry:
+    """Cached coin data of one symbol; ``data`` is None until a fetch succeeds"""
+    def __init__(self, data, fetched_at, expires_at, retry_at=0.0):
+        self.data = data
+        self.fetched_at = fetched_at
+        self.expires_at = expires_at
+        self.retry_at = retry_at
+
+class CoinMetadataCache:
+    """Per-symbol coin data kept fresh by one background worker.
+
+    ``fetch(symbol)`` returns the data or None; a single worker runs every fetch,
+    so the shared tracker's request pacing holds across refreshes.
+    """
+    def __init__(self, fetch, ttl=COIN_DATA_TTL, max_age=COIN_DATA_MAX_AGE, retry=COIN_DATA_RETRY):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.max_age = max_age
+        self.retry = retry
+        self.entries = {}
+        self.inflight = {}
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='coin-data')
+        self.fetches = 0
+
+    def ttl_for(self, symbol):
+        """Freshness of ``symbol``'s data: the TTL spread by a stable per-symbol offset"""
+        return self.ttl * (0.9 + 0.2 * (zlib.crc32(symbol.encode('utf-8')) % 1000) / 1000)
+
+    def get(self, symbol, now=None):
+        """Cached data of ``symbol`` without blocking, or None.
+
+        A missing or expired entry schedules a refresh; expired data is still
+        returned until it is ``max_age`` old.
+        """
+        if symbol not in ASSETS.coin_ids:
+            return None
+        now = now or time.time()
+        with self.lock:
+            entry = self.entries.get(symbol)
+        if entry is None or now >= entry.expires_at:
+            self.refresh(symbol, now)
+        if entry is not None and entry.data is not None and now - entry.fetched_at <= self.max_age:
+            return entry.data
+        return None
+
+    def refresh(self, symbol, now=None):
+        """Fetch ``symbol`` in the background, joining a fetch already in flight.
+
+        Returns the fetch's future, or None while a failed fetch waits out its retry delay.
+        """
+        now = now or time.time()
+        with self.lock:
+            future = self.inflight.get(symbol)
+            if future is not None:
+                return future
+            entry = self.entries.get(symbol)
+            if entry is not None and now < entry.retry_at:
+                return None
+            future = self.executor.submit(self._load, symbol)
+            self.inflight[symbol] = future
+            return future
+
+    def _load(self, symbol):
+        try:
+            data = self.fetch(symbol)
+        except Exception as e:
+            logger.error(f"Error refreshing coin data for {symbol}: {str(e)}")
+            data = None
+        now = time.time()
+        with self.lock:
+            self.fetches += 1
+            del self.inflight[symbol]
+            if data is not None:
+                self.entries[symbol] = CoinEntry(data, now, now + self.ttl_for(symbol))
+            else:
+                # Keep serving what we had; try again after the retry delay
+                entry = self.entries.get(symbol) or CoinEntry(None, 0.0, 0.0)
+                entry.retry_at = now + self.retry
+                self.entries[symbol] = entry
+        return data
+
+    def warm(self, symbols, horizon=0, now=None):
+        """Refresh the ``symbols`` that are missing or expire within ``horizon`` seconds;
+        returns the futures of the fetches started or joined"""
+        now = now or time.time()
+        futures = []
+        for symbol in symbols:
+            with self.lock:
+                entry = self.entries.get(symbol)
+            if entry is None or entry.expires_at <= now + horizon:
+                future = self.refresh(symbol, now)
+                if future is not None:
+                    futures.append(future)
+        return futures
+
+# One tracker for every refresh, so its request pacing spans them
+coin_cache = CoinMetadataCache(CryptoPriceTracker().get_coin_data)
+
+def warm_coin_data():
+    """Scheduled: start refreshes of the top symbols that would expire before the next run"""
+    futures = coin_cache.warm(list(ASSETS.coin_ids)[:COIN_DATA_WARM_TOP], horizon=COIN_DATA_WARM_INTERVAL)
+    if futures:
+        logger.info(f"Warming coin data for {len(futures)} symbols")
+    return len(futures)
@@ -4,6 +4,9 @@ import requests
 from datetime import datetime, timedelta
 from database import db
 from models import CryptoPrice
+from asset_registry import ASSETS
+from http_client import get_client
+from page_cache import dashboard_cache
 import time
 
 logging.basicConfig(level=logging.DEBUG)
@@ -15,144 +18,8 @@ class CryptoPriceTracker:
         self.last_request_time = 0
         self.min_request_interval = 1.2  # Minimum time between requests in seconds
         self.api_key = os.environ.get('COINGECKO_API_KEY', '')  # Get API key from environment variable
-        self.crypto_ids = {
-            'BTC': 'bitcoin',
-            'ETH': 'ethereum',
-            'USDT': 'tether',
-            'BNB': 'binancecoin',
-            'SOL': 'solana',
-            'XRP': 'ripple',
-            'USDC': 'usd-coin',
-            'ADA': 'cardano',
-            'AVAX': 'avalanche-2',
-            'DOGE': 'dogecoin',
-            'TON': 'toncoin',
-            'MEME': 'memecoin-2',
-            'SEI': 'sei-network',
-            'SUI': 'sui',
-            'BONK': 'bonk',
-            'WLD': 'worldcoin-wld',
-            'PYTH': 'pyth-network',
-            'JUP': 'jupiter',
-            'BLUR': 'blur',
-            'HFT': 'hashflow',
-            'WIF': 'wif-token',
-            'STRK': 'starknet',
-            'TIA': 'celestia',
-            'DYM': 'dymension',
-            'ORDI': 'ordinals-token',
-            'TRX': 'tron',
-            'DAI': 'dai',
-            'MATIC': 'matic-network',
-            'DOT': 'polkadot',
-            'WBTC': 'wrapped-bitcoin',
-            'SHIB': 'shiba-inu',
-            'LEO': 'leo-token',
-            'LTC': 'litecoin',
-            'UNI': 'uniswap',
-            'CAKE': 'pancakeswap-token',
-            'LINK': 'chainlink',
-            'ATOM': 'cosmos',
-            'APE': 'apecoin',
-            'AAVE': 'aave',
-            'RPL': 'rocket-pool',
-            'REN': 'ren',
-            'MKR': 'maker-protocol',
-            'BAT': 'basic-attention-token',
-            'GMX': 'gmx',
-            'ARB': 'arbitrum',
-            'OP': 'optimism',
-            'GRT': 'the-graph',
-            'SNX': 'synthetix',
-            'CRV': 'curve-dao-token',
-            'LDO': 'lido-dao',
-            'APT': 'aptos',
-            'ALGO': 'algorand',
-            'FIL': 'filecoin',
-            'COMP': 'compound-coin',
-            'IMX': 'immutable-x',
-            'HBAR': 'hedera-hashgraph',
-            'XTZ': 'tezos',
-            'EOS': 'eos',
-            'BAL': 'balancer',
-            'SAND': 'the-sandbox',
-            '1INCH': '1inch',
-            'SUSHI': 'sushi',
-            'YFI': 'yearn-finance',
-            'RUNE': 'thorchain',
-            'KNC': 'kyber-network-crystal',
-            'ZRX': '0x',
-            'QNT': 'quant-network',
-            'EGLD': 'elrond-erd-2',
-            'XDC': 'xdce-crowd-sale',
-            'FLOW': 'flow',
-            'NEO': 'neo',
-            'KCS': 'kucoin-shares',
-            'ZEC': 'zcash',
-            'BTT': 'bittorrent',
-            'KAVA': 'kava',
-            'MANA': 'decentraland',
-            'TUSD': 'true-usd',
-            'KLAY': 'klaytn',
-            'GT': 'gatetoken',
-            'CHZ': 'chiliz',
-            'XEC': 'ecash',
-            'BEAM': 'beam',
-            'HT': 'huobi-token',
-            'FTM': 'fantom',
-            'IOTA': 'iota',
-            'AR': 'arweave',
-            'CSPR': 'casper-network',
-            'STX': 'stacks',
-            'RNDR': 'render-token',
-            'GALA': 'gala',
-            'DYDX': 'dydx',
-            'MINA': 'mina-protocol',
-            'CFX': 'conflux-token',
-            'WAXP': 'wax',
-            'ROSE': 'oasis-network',
-            'ENJ': 'enjincoin',
-            'VRA': 'virtuals',
-            'NEAR': 'near',
-            'ICP': 'internet-computer',
-            'TAO': 'bittensor',
-            'NEXO': 'nexo',
-            'CKB': 'nervos-network',
-            'WOO': 'woo-network',
-            'POLY': 'polymath',
-            'DASH': 'dash',
-            'ZIL': 'zilliqa',
-            'LRC': 'loopring',
-            'FLUX': 'flux',
-            'ONE': 'harmony',
-            'HOT': 'holotoken',
-            'ICX': 'icon',
-            'OCEAN': 'ocean-protocol',
-            'KDA': 'kadena',
-            'XEM': 'nem',
-            'TWT': 'trust-wallet-token',
-            'DCR': 'decred',
-            'GLM': 'golem',
-            'SKL': 'skale',
-            'JASMY': 'jasmycoin',
-            'AMP': 'amp-token',
-            'CELR': 'celer-network',
-            'QTUM': 'qtum',
-            'RVN': 'ravencoin',
-            'ONT': 'ontology',
-            'RSR': 'reserve-rights-token',
-            'ANKR': 'ankr',
-            'SC': 'siacoin',
-            'ONDO': 'ondo-finance',
-            'BCH': 'bitcoin-cash',
-            'XLM': 'stellar',
-            'OKB': 'okb',
-            'VET': 'vechain',
-            'INJ': 'injective-protocol',
-            'MASK': 'mask-network',
-            'TRUMP': 'trump-digital-trading-card',
-            'HYPE': 'hyperliquid-hype'
-        }
+        # Shared, read-only; loaded once by the asset registry
+        self.crypto_ids = ASSETS.coin_ids
 
     def _rate_limit_wait(self):
         """Ensure we don't exceed API rate limits with exponential backoff"""
@@ -164,8 +31,12 @@ class CryptoPriceTracker:
             time.sleep(wait_time)
         self.last_request_time = time.time()
 
-    def _make_request(self, url, params=None, max_retries=3):
-        """Make a request to the CoinGecko API with improved error handling"""
+    def _make_request(self, url, params=None):
+        """Make a request to the CoinGecko API with improved error handling.
+
+        Retries and back-off (including 429 ``Retry-After`` waits) are handled by the
+        shared HTTP client; this only paces requests and decodes the response.
+        """
         headers = {
             'Accept': 'application/json',
             'User-Agent': 'CryptoIntelligence/1.0',
@@ -173,31 +44,22 @@ class CryptoPriceTracker:
         }
         logger.info("Making API request with key present: %s", bool(self.api_key))
 
-        for attempt in range(max_retries):
-            try:
-                self._rate_limit_wait()
-                logger.debug(f"Making request to {url} with params {params}")
-
-                response = requests.get(url, params=params, headers=headers, timeout=10)
+        try:
+            self._rate_limit_wait()
+            logger.debug(f"Making request to {url} with params {params}")
 
-                if response.status_code == 429:  # Rate limit reached
-                    retry_after = int(response.headers.get('Retry-After', 60))
-                    logger.warning(f"Rate limit hit. Waiting {retry_after} seconds")
-                    time.sleep(retry_after)
-                    continue
+            response = get_client().get(url, params=params, headers=headers)
 
-                response.raise_for_status()
-                return response.json()
+            if response.status_code == 429:  # Still rate limited after the client's retries
+                logger.warning(f"Rate limit hit for {url}, giving up after retries")
+                return None
 
-            except requests.exceptions.RequestException as e:
-                logger.error(f"Request error on attempt {attempt + 1}: {str(e)}")
-                if attempt < max_retries - 1:
-                    sleep_time = (attempt + 1) * 2
-                    logger.info(f"Retrying in {sleep_time} seconds...")
-                    time.sleep(sleep_time)
-                continue
+            response.raise_for_status()
+            return response.json()
 
-        return None
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request error for {url}: {str(e)}")
+            return None
 
     def fetch_current_prices(self):
         """Fetch current prices for all tracked cryptocurrencies"""
@@ -245,6 +107,7 @@ class CryptoPriceTracker:
                     price.last_updated = update['last_updated']
 
                 db.session.commit()
+                dashboard_cache.bump()
                 logger.info(f"Successfully updated prices for {len(updates)} cryptocurrencies")
                 return True
 
@@ -291,7 +154,7 @@ class CryptoPriceTracker:
             logger.error(f"Error fetching coin data for {symbol}: {str(e)}")
             return None
 
-    def get_historical_prices(self, symbol, days=30, interval='daily', max_retries=3):
+    def get_historical_prices(self, symbol, days=30, interval='daily'):
         """Fetch historical price data with improved validation and error handling"""
         try:
             logger.info(f"Fetching historical data for {symbol} with {days} days interval {interval}")
@@ -312,58 +175,28 @@ class CryptoPriceTracker:
 
             logger.info(f"Making market chart request to: {api_url}")
             logger.info(f"With params: {params}")
-            logger.info(f"API Key present: {bool(self.api_key)}")
 
-            headers = {
-                'Accept': 'application/json',
-                'User-Agent': 'CryptoIntelligence/1.0',
-                'x-cg-demo-api-key': self.api_key
-            }
-
-            for attempt in range(max_retries):
-                try:
-                    self._rate_limit_wait()
-                    logger.info(f"Making request to {api_url} with params {params} (attempt {attempt + 1})")
+            data = self._make_request(api_url, params)
 
-                    response = requests.get(api_url, params=params, headers=headers, timeout=10)
+            if not data or 'prices' not in data:
+                error_msg = f"Failed to fetch data for {symbol}"
+                logger.error(f"{error_msg}: {data}")
+                return {'error': error_msg, 'retry_after': 30}
 
-                    if response.status_code == 429:
-                        retry_after = int(response.headers.get('Retry-After', 60))
-                        logger.warning(f"Rate limit hit, waiting {retry_after} seconds")
-                        time.sleep(retry_after)
-                        continue
+            # Ensure both prices and total_volumes are present and properly formatted
+            prices = data.get('prices', [])
+            volumes = data.get('total_volumes', [])
 
-                    response.raise_for_status()
-                    data = response.json()
+            # If no volume data, create empty volume data points matching price timestamps
+            if not volumes and prices:
+                volumes = [[price[0], 0] for price in prices]
 
-                    if not data or 'prices' not in data:
-                        logger.error(f"Invalid response data for {symbol}: {data}")
-                        continue
-
-                    # Ensure both prices and total_volumes are present and properly formatted
-                    prices = data.get('prices', [])
-                    volumes = data.get('total_volumes', [])
-
-                    # If no volume data, create empty volume data points matching price timestamps
-                    if not volumes and prices:
-                        volumes = [[price[0], 0] for price in prices]
-
-                    logger.info(f"Successfully fetched {len(prices)} price points for {symbol}")
-                    logger.debug(f"First price point: {prices[0] if prices else 'No data'}")
-                    return {
-                        'prices': prices,
-                        'total_volumes': volumes
-                    }
-
-                except requests.exceptions.RequestException as e:
-                    logger.error(f"Request error on attempt {attempt + 1}: {str(e)}")
-                    if attempt < max_retries - 1:
-                        time.sleep(2 ** attempt)  # Exponential backoff
-                    continue
-
-            error_msg = f"Failed to fetch data for {symbol} after {max_retries} attempts due to rate limits"
-            logger.error(error_msg)
-            return {'error': error_msg, 'retry_after': 30}
+            logger.info(f"Successfully fetched {len(prices)} price points for {symbol}")
+            logger.debug(f"First price point: {prices[0] if prices else 'No data'}")
+            return {
+                'prices': prices,
+                'total_volumes': volumes
+            }
 
         except Exception as e:
             logger.error(f"Error fetching historical data for {symbol}: {str(e)}")
@@ -24,6 +24,163 @@ def init_app(app):
 
         # Create all tables
         db.create_all()
+        ensure_columns()
+        ensure_indexes()
+
+def ensure_columns():
+    """Add any model columns missing from tables that predate them.
+
+    ``create_all`` never alters existing tables, so nullable columns added to a model
+    later are created here with ``ALTER TABLE ... ADD COLUMN``.
+    """
+    import logging
+    from sqlalchemy import inspect, text
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing or not column.nullable:
+                continue
+            column_type = column.type.compile(dialect=db.engine.dialect)
+            try:
+                with db.engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logging.info(f"Added column {column.name} to {table.name}")
+            except Exception as e:
+                logging.error(f"Could not add column {column.name} to {table.name}: {str(e)}")
+
+def ensure_indexes():
+    """Create any model indexes missing from tables that predate them.
+
+    ``create_all`` only creates indexes together with new tables, so indexes added to
+    existing models have to be created separately. A unique index missing from an
+    existing table may first need duplicate rows removed, so it is left to
+    ``python migrate.py unique-indexes`` and only logged here.
+    """
+    import logging
+    from sqlalchemy import inspect
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    for table in db.metadata.sorted_tables:
+        existing = {index['name'] for index in inspector.get_indexes(table.name)} if table.name in existing_tables else set()
+        for index in table.indexes:
+            if index.name in existing:
+                continue
+            if index.unique and table.name in existing_tables:
+                logging.warning(f"Unique index {index.name} is missing from {table.name}; "
+                                f"run `python migrate.py unique-indexes` to create it")
+                continue
+            try:
+                index.create(bind=db.engine, checkfirst=True)
+            except Exception as e:
+                logging.error(f"Could not create index {index.name} on {table.name}: {str(e)}")
+
+def create_unique_indexes():
+    """Create the unique indexes missing from existing tables, removing the rows that
+    would violate them first. Raises if an index can't be created, since
+    ``insert_ignore`` relies on it to skip duplicates. Returns the indexes created.
+    """
+    import logging
+    from sqlalchemy import inspect
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    created = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing = {index['name'] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if not index.unique or index.name in existing:
+                continue
+            removed = remove_duplicates(index)
+            if removed:
+                logging.warning(f"Removed {removed} rows from {table.name} duplicating {index.name}")
+            index.create(bind=db.engine, checkfirst=True)
+            logging.info(f"Created unique index {index.name} on {table.name}")
+            created.append(index.name)
+    return created
+
+def remove_duplicates(index, batch_size=500):
+    """Delete the rows of ``index``'s table that repeat another row's values in the
+    index columns, keeping the lowest ``id`` of each group. Rows of other tables that
+    reference a removed row are pointed at the kept one, or deleted when the reference
+    is part of their primary key. Returns the number of rows removed.
+    """
+    from sqlalchemy import and_, case, delete, func, select, update
+    table = index.table
+    keep = select(func.min(table.c.id).label('keep_id'), *index.columns).group_by(*index.columns).subquery()
+    with db.engine.begin() as connection:
+        kept = dict(connection.execute(
+            select(table.c.id, keep.c.keep_id)
+            .join(keep, and_(*(column == keep.c[column.name] for column in index.columns)))
+            .where(table.c.id != keep.c.keep_id)
+        ).all())
+        ids = sorted(kept)
+        for start in range(0, len(ids), batch_size):
+            batch = ids[start:start + batch_size]
+            for other in db.metadata.sorted_tables:
+                for foreign_key in other.foreign_keys:
+                    if foreign_key.column.table is not table:
+                        continue
+                    column = foreign_key.parent
+                    if column.primary_key:
+                        connection.execute(delete(other).where(column.in_(batch)))
+                    else:
+                        connection.execute(update(other).where(column.in_(batch)).values(
+                            {column.name: case({duplicate: kept[duplicate] for duplicate in batch}, value=column)}))
+            connection.execute(delete(table).where(table.c.id.in_(batch)))
+    return len(ids)
+
+def insert_ignore(model):
+    """Build an INSERT for ``model`` that skips rows violating a unique constraint"""
+    from sqlalchemy import insert
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert as pg_insert
+        return pg_insert(model).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(model).on_conflict_do_nothing()
+    return insert(model).prefix_with('IGNORE')
+
+def insert_accumulate(model, keys, columns):
+    """Build an INSERT for ``model`` that, when a row with the same ``keys`` exists,
+    adds the inserted ``columns`` to it instead"""
+    dialect = db.engine.dialect.name
+    if dialect in ('postgresql', 'sqlite'):
+        if dialect == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        statement = dialect_insert(model)
+        return statement.on_conflict_do_update(
+            index_elements=keys,
+            set_={column: getattr(model, column) + statement.excluded[column] for column in columns})
+    from sqlalchemy.dialects.mysql import insert as mysql_insert
+    statement = mysql_insert(model)
+    return statement.on_duplicate_key_update(
+        {column: getattr(model, column) + statement.inserted[column] for column in columns})
+
+def insert_ignore_returning(model, rows, key, *columns):
+    """Insert ``rows`` in one statement, skipping unique-constraint violations, and
+    return ``columns`` for the rows that were inserted.
+
+    Uses ``RETURNING`` where the dialect supports it with executemany (PostgreSQL,
+    SQLite). Elsewhere the rows are read back by their unique ``key`` column, which can
+    also return rows a concurrent writer inserted first.
+    """
+    from sqlalchemy import select
+    if not rows:
+        return []
+    statement = insert_ignore(model)
+    if db.engine.dialect.insert_executemany_returning:
+        return db.session.execute(statement.returning(*columns), rows).all()
+    db.session.execute(statement, rows)
+    keys = [row[key.key] for row in rows]
+    return db.session.execute(select(*columns).where(key.in_(keys))).all()
 
 def sync_article_counts():
     """Sync article counts for all news sources"""
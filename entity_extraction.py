@@ -0,0 +1,94 @@
+"""Named entity extraction with spaCy, the optional entity stage of NLP processing.
+
+Kept free of app and database imports so ``extract_entities`` can run in worker
+processes. Nothing here downloads a model: the pipeline is either an installed
+package or path (e.g. ``en_core_web_sm``) or ``'blank'``, a blank English pipeline
+that only has the asset ``EntityRuler``s.
+"""
+import logging
+import os
+from collections import Counter
+
+import spacy
+
+from asset_registry import ASSETS
+
+logger = logging.getLogger(__name__)
+
+# Texts per nlp.pipe batch
+ENTITY_BATCH_SIZE = int(os.environ.get('NLP_ENTITY_BATCH_SIZE', 64))
+# Entity labels stored: ASSET comes from the EntityRuler, the others from the model's NER
+ENTITY_LABELS = ('ORG', 'PERSON', 'ASSET')
+# Components of the trained English pipelines that entity recognition doesn't use
+UNUSED_COMPONENTS = ['tagger', 'morphologizer', 'parser', 'senter', 'attribute_ruler', 'lemmatizer', 'textcat']
+# Longest stored entity name, the width of ArticleEntity.name
+MAX_NAME_LENGTH = 200
+
+def asset_patterns(assets=ASSETS):
+    """``EntityRuler`` phrase patterns for every asset of an ``AssetRegistry``: its ticker,
+    display name and readable CoinGecko id.
+
+    Returns the ticker patterns, matched case-sensitively, and the name patterns, matched
+    in any case. Each pattern's id is its symbol. Tickers also match the title-cased
+    form ``format_assets`` writes ('Btc') for assets that have it as an alias.
+    """
+    tickers = {}
+    phrases = {}
+    for asset in assets.assets.values():
+        tickers.setdefault(asset.symbol, asset.symbol)
+        if asset.symbol.lower() in asset.aliases:
+            tickers.setdefault(asset.symbol.title(), asset.symbol)
+    for asset in assets.assets.values():
+        if asset.name:
+            phrases.setdefault(asset.name.lower(), asset.symbol)
+    for asset in assets.assets.values():
+        if not asset.coin_id or any(char.isdigit() for char in asset.coin_id):
+            continue  # Disambiguated ids such as 'avalanche-2' never appear in text
+        phrases.setdefault(asset.coin_id.replace('-', ' '), asset.symbol)
+    return ([{'label': 'ASSET', 'pattern': ticker, 'id': symbol} for ticker, symbol in tickers.items()],
+            [{'label': 'ASSET', 'pattern': phrase, 'id': symbol} for phrase, symbol in phrases.items()])
+
+def load_pipeline(model, patterns):
+    """Load ``model`` without the components NER doesn't need and add the asset ``EntityRuler``s.
+
+    Phrase patterns rather than token patterns: a ``PhraseMatcher`` looks tokens up in a
+    hash table, while the token ``Matcher`` tries every pattern at every token.
+    """
+    if model == 'blank':
+        nlp = spacy.blank('en')
+    else:
+        nlp = spacy.load(model, exclude=UNUSED_COMPONENTS)
+    ticker_patterns, name_patterns = patterns
+    # Before the statistical NER, so asset matches take precedence over its guesses
+    before = 'ner' if 'ner' in nlp.pipe_names else None
+    nlp.add_pipe('entity_ruler', name='asset_names', before=before,
+                 config={'phrase_matcher_attr': 'LOWER'}).add_patterns(name_patterns)
+    nlp.add_pipe('entity_ruler', name='asset_tickers', before=before).add_patterns(ticker_patterns)
+    logger.info(f"Loaded entity pipeline {model} ({', '.join(nlp.pipe_names)}, "
+                f"{len(ticker_patterns) + len(name_patterns)} asset patterns)")
+    return nlp
+
+_pipelines = {}
+
+def get_pipeline(model):
+    """The pipeline for ``model`` with the registry's assets, loaded once per process"""
+    if model not in _pipelines:
+        _pipelines[model] = load_pipeline(model, asset_patterns())
+    return _pipelines[model]
+
+def entity_name(ent):
+    """The stored name of a spaCy entity: the symbol of an asset, otherwise its text"""
+    if ent.label_ == 'ASSET' and ent.ent_id_:
+        return ent.ent_id_
+    return ' '.join(ent.text.split())[:MAX_NAME_LENGTH]
+
+def extract_entities(rows, model, batch_size=ENTITY_BATCH_SIZE):
+    """Pool task: the ``ArticleEntity`` rows for a chunk of ``(id, title, content)`` article rows"""
+    nlp = get_pipeline(model)
+    texts = (f"{title}. {content or ''}"[:nlp.max_length] for _, title, content in rows)
+    entities = []
+    for (article_id, _, _), doc in zip(rows, nlp.pipe(texts, batch_size=batch_size)):
+        counts = Counter((ent.label_, entity_name(ent)) for ent in doc.ents if ent.label_ in ENTITY_LABELS)
+        entities.extend({'article_id': article_id, 'label': label, 'name': name, 'mention_count': count}
+                        for (label, name), count in counts.items())
+    return entities
@@ -0,0 +1,231 @@
+"""HTML to plain text cleaning for feed content.
+
+Kept free of app and database imports so the cleaning functions can run in worker
+processes without booting the web application.
+"""
+import logging
+import os
+import re
+from functools import partial
+from html.parser import HTMLParser as HTMLParser2
+
+import trafilatura
+from bs4 import BeautifulSoup, Comment
+
+from worker_pool import SharedPool
+
+logger = logging.getLogger(__name__)
+
+# Worker processes used by clean_html_batch; 0 cleans in-process
+CLEANER_WORKERS = int(os.environ.get('HTML_CLEANER_WORKERS', min(4, os.cpu_count() or 1)))
+# Batches with less HTML than this (in characters) are cleaned in-process. Cleaning
+# blocks the eventlet hub that serves the web requests, at roughly half a millisecond
+# per KiB, so only a batch too small to stall it (~20 ms) skips the pool; a typical
+# feed, 100-200 KiB of entries, is cleaned off the hub
+CLEANER_MIN_BYTES = int(os.environ.get('HTML_CLEANER_MIN_BYTES', 32 * 1024))
+
+class MLStripper(HTMLParser2):
+    def __init__(self):
+        super().__init__()
+        self.reset()
+        self.fed = []
+    def handle_data(self, data):
+        self.fed.append(data)
+    def get_data(self):
+        return ''.join(self.fed)
+
+def strip_tags(html):
+    """Strip HTML tags from content"""
+    try:
+        if not html:
+            return ""
+        s = MLStripper()
+        s.feed(html)
+        return s.get_data()
+    except Exception as e:
+        logger.error(f"Error stripping HTML tags: {str(e)}")
+        return re.sub(r'<[^>]+>', '', html)
+
+# Tags whose whole subtree is dropped from the cleaned text
+UNWANTED_TAGS = [
+    "script", "style", "iframe", "form", "nav", "header", "footer",
+    "aside", "noscript", "figure", "figcaption", "time", "button",
+    "meta", "link", "img", "svg", "path", "source", "picture"
+]
+# Tags that end a run of text, so their neighbours are not glued together
+BLOCK_TAGS = {"p", "br", "div", "li", "ul", "ol", "h1", "h2", "h3", "h4", "h5", "h6",
+              "blockquote", "pre", "tr", "td", "th", "hr", "section"}
+# Void elements never get an end tag, so they must not open a skipped subtree
+VOID_TAGS = {"img", "meta", "link", "source", "path", "br", "hr"}
+
+# Engine used for every document; 'auto' routes each one by size and structure
+CLEANER_ENGINE = os.environ.get('HTML_CLEANER_ENGINE', 'auto')
+# Documents shorter than this with no page-level markup go to the tag stripper
+CLEANER_SNIPPET_SIZE = int(os.environ.get('HTML_CLEANER_SNIPPET_SIZE', 2000))
+# Documents at least this long, or carrying page-level markup, go to trafilatura
+CLEANER_PAGE_SIZE = int(os.environ.get('HTML_CLEANER_PAGE_SIZE', 20000))
+
+_PAGE_MARKUP = re.compile(r'<(?:html|body|head|article|main|nav|header|footer|table|iframe|form)\b', re.IGNORECASE)
+
+class TextStripper(MLStripper):
+    """Streaming ``MLStripper`` that drops unwanted subtrees and breaks text at block tags"""
+    skipped_tags = frozenset(UNWANTED_TAGS) - VOID_TAGS
+
+    def __init__(self):
+        super().__init__()
+        self.skip_depth = 0
+    def handle_starttag(self, tag, attrs):
+        if tag in self.skipped_tags:
+            self.skip_depth += 1
+        elif tag in BLOCK_TAGS:
+            self.fed.append(' ')
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.fed.append(' ')
+    def handle_endtag(self, tag):
+        if tag in self.skipped_tags:
+            self.skip_depth = max(0, self.skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self.fed.append(' ')
+    def handle_data(self, data):
+        if not self.skip_depth:
+            self.fed.append(data)
+
+def clean_with_stripper(html_content):
+    """Fast path for short snippets: one streaming pass, no tree is built"""
+    html_content = html_content.replace('\xa0', ' ')
+    html_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', html_content)
+    try:
+        s = TextStripper()
+        s.feed(html_content)
+        s.close()
+        text = s.get_data()
+    except Exception as e:
+        logger.warning(f"Streaming tag stripper failed: {str(e)}, falling back to BeautifulSoup")
+        return clean_with_soup(html_content)
+    return re.sub(r'\s+', ' ', text.replace('\xa0', ' ')).strip()
+
+def clean_with_soup(html_content):
+    """Parse the document with BeautifulSoup and drop boilerplate tags"""
+    html_content = html_content.replace('\xa0', ' ')
+    html_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', html_content)
+
+    try:
+        soup = BeautifulSoup(html_content, 'html.parser')
+    except Exception as e:
+        logger.error(f"BeautifulSoup parsing failed: {str(e)}")
+        return strip_tags(html_content)
+
+    try:
+        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
+            comment.extract()
+    except Exception as e:
+        logger.warning(f"Error removing HTML comments: {str(e)}")
+
+    for element in soup.find_all(UNWANTED_TAGS):
+        try:
+            element.decompose()
+        except Exception as e:
+            logger.warning(f"Error removing {element.name} tag: {str(e)}")
+
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+
+    for p in soup.find_all("p"):
+        p.replace_with(f"\n{p.get_text()}\n")
+
+    text = soup.get_text(separator=' ')
+
+    text = re.sub(r'<[^>]+>', '', text)
+    text = re.sub(r'&nbsp;|&amp;|&lt;|&gt;|&quot;|&#39;|&[a-zA-Z]+;', ' ', text)
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'\n\s*\n', '\n', text)
+    return text.strip()
+
+def clean_with_trafilatura(html_content):
+    """Main-content extraction for full pages, falling back to BeautifulSoup"""
+    try:
+        downloaded = trafilatura.extract(html_content, include_links=False, include_images=False,
+                                         include_tables=False, no_fallback=False)
+        if downloaded:
+            logger.debug("Successfully cleaned content using trafilatura")
+            return downloaded.strip()
+    except Exception as e:
+        logger.warning(f"Trafilatura extraction failed: {str(e)}, falling back to BeautifulSoup")
+    return clean_with_soup(html_content)
+
+ENGINES = {
+    'strip': clean_with_stripper,
+    'soup': clean_with_soup,
+    'trafilatura': clean_with_trafilatura,
+}
+
+def select_engine(html_content):
+    """Pick the cheapest engine that handles a document of this size and structure"""
+    size = len(html_content)
+    if size >= CLEANER_PAGE_SIZE or _PAGE_MARKUP.search(html_content):
+        return 'trafilatura'
+    if size < CLEANER_SNIPPET_SIZE:
+        return 'strip'
+    return 'soup'
+
+def clean_html_content(html_content, engine=None):
+    """Clean HTML content and extract readable text with enhanced cleaning.
+
+    ``engine`` names one of ``ENGINES``; by default (``HTML_CLEANER_ENGINE``, normally
+    'auto') each document is routed by ``select_engine``.
+    """
+    try:
+        if not html_content:
+            return ""
+
+        engine = engine or CLEANER_ENGINE
+        if engine == 'auto':
+            engine = select_engine(html_content)
+        logger.debug(f"Starting HTML content cleaning with {engine} engine (length: {len(html_content)})")
+
+        text = ENGINES[engine](html_content)
+        logger.debug(f"Completed HTML cleaning. Final length: {len(text)}")
+        return text
+
+    except Exception as e:
+        logger.error(f"Error cleaning HTML content: {str(e)}")
+        cleaned = strip_tags(html_content)
+        if cleaned:
+            return cleaned.strip()
+        return ""
+
+def _clean_chunk(documents, engine=None):
+    """Pool task: clean one chunk of documents"""
+    return [clean_html_content(document, engine=engine) for document in documents]
+
+_pool = SharedPool('HTML cleaning')
+
+def shutdown_pool():
+    """Stop the cleaning pool, if one is running"""
+    _pool.shutdown()
+
+def clean_html_batch(documents, workers=None, engine=None, min_bytes=None):
+    """Clean a batch of HTML documents, returning the texts in input order.
+
+    Batches are spread over a process pool of ``workers`` processes (default
+    ``HTML_CLEANER_WORKERS``). With no workers, a batch under ``min_bytes`` of HTML
+    (default ``HTML_CLEANER_MIN_BYTES``), or a broken pool the documents are cleaned
+    in this process instead. ``engine`` is passed on to ``clean_html_content``.
+    """
+    documents = list(documents)
+    workers = CLEANER_WORKERS if workers is None else workers
+    min_bytes = CLEANER_MIN_BYTES if min_bytes is None else min_bytes
+    clean = partial(clean_html_content, engine=engine)
+
+    if workers <= 0 or len(documents) < 2 or sum(len(document or '') for document in documents) < min_bytes:
+        return [clean(document) for document in documents]
+
+    with _pool.lock:
+        try:
+            chunksize = max(1, len(documents) // (workers * 4))
+            return _pool.get(workers).map(partial(_clean_chunk, engine=engine), documents, chunksize=chunksize)
+        except (EOFError, OSError) as e:
+            logger.error(f"HTML cleaning pool failed, cleaning in-process: {str(e)}")
+            _pool.shutdown()
+    return [clean(document) for document in documents]
@@ -0,0 +1,116 @@
+"""Shared HTTP client for every outbound integration.
+
+One ``requests.Session`` keeps a keep-alive connection pool per host, so repeated
+calls to the same API reuse their TCP/TLS connections. Retries, back-off and the
+default timeout are set here once instead of at each call site, and every request
+is counted in per-host metrics.
+"""
+import logging
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+HTTP_TIMEOUT = float(os.environ.get('HTTP_TIMEOUT', 10))  # Default per-request timeout in seconds
+HTTP_RETRIES = int(os.environ.get('HTTP_RETRIES', 3))
+HTTP_BACKOFF = float(os.environ.get('HTTP_BACKOFF', 1))  # Back-off factor between retries
+HTTP_POOL_HOSTS = int(os.environ.get('HTTP_POOL_HOSTS', 20))  # Hosts with a pooled connection set
+HTTP_POOL_SIZE = int(os.environ.get('HTTP_POOL_SIZE', 10))  # Keep-alive connections kept per host
+
+class HostMetrics:
+    """Request counters for a single host"""
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.status_codes = {}
+
+    def as_dict(self):
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'avg_ms': round(self.total_time / self.requests * 1000, 1) if self.requests else 0.0,
+            'max_ms': round(self.max_time * 1000, 1),
+            'status_codes': dict(self.status_codes),
+        }
+
+class HttpClient:
+    """Pooled, retrying HTTP client shared by the scraper and the API clients.
+
+    Connection errors, 429 and 5xx responses are retried with exponential back-off
+    (honouring ``Retry-After``). Once retries run out the last response is returned
+    rather than raised, so callers still see the final status code.
+    """
+    def __init__(self, timeout=HTTP_TIMEOUT, retries=HTTP_RETRIES, backoff=HTTP_BACKOFF,
+                 pool_hosts=HTTP_POOL_HOSTS, pool_size=HTTP_POOL_SIZE):
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry_strategy = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=["GET", "HEAD", "OPTIONS"],
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_connections=pool_hosts, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Send a request through the shared pool and record it against the URL's host.
+
+        For ``stream=True`` requests the recorded time ends when the headers arrive.
+        """
+        started = time.monotonic()
+        response = None
+        try:
+            response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            return response
+        finally:
+            self._record(urlsplit(url).netloc, time.monotonic() - started, response)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def _record(self, host, elapsed, response):
+        with self._lock:
+            metrics = self._metrics.setdefault(host, HostMetrics())
+            metrics.requests += 1
+            metrics.total_time += elapsed
+            metrics.max_time = max(metrics.max_time, elapsed)
+            if response is None or response.status_code >= 400:
+                metrics.errors += 1
+            status = response.status_code if response is not None else 'error'
+            metrics.status_codes[status] = metrics.status_codes.get(status, 0) + 1
+
+    def metrics(self):
+        """Snapshot of the per-host request metrics"""
+        with self._lock:
+            return {host: metrics.as_dict() for host, metrics in self._metrics.items()}
+
+    def log_metrics(self):
+        for host, metrics in sorted(self.metrics().items()):
+            logger.info(f"HTTP {host}: {metrics['requests']} requests, {metrics['errors']} errors, "
+                        f"avg {metrics['avg_ms']} ms, max {metrics['max_ms']} ms, status {metrics['status_codes']}")
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """Return the process-wide ``HttpClient``, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
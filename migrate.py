@@ -0,0 +1,26 @@
+"""Schema migrations too slow or destructive to run while the app starts."""
+import argparse
+import logging
+import sys
+
+from app import app
+from database import create_unique_indexes
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Database migrations for existing installs')
+    parser.add_argument('command', choices=['unique-indexes'],
+                        help='remove duplicate rows and create the unique indexes missing from existing tables')
+    args = parser.parse_args()
+    with app.app_context():
+        try:
+            created = create_unique_indexes()
+        except Exception as e:
+            logger.error(f"Could not create unique indexes: {str(e)}")
+            sys.exit(1)
+        logger.info(f"Created {len(created)} unique indexes: {', '.join(created) or 'none missing'}")
@@ -43,7 +43,30 @@ class NewsSourceMetrics(db.Model):
     def __repr__(self):
         return f'<NewsSourceMetrics {self.source_name}: {self.trust_score}>'
 
+class FeedState(db.Model):
+    """Per-source feed polling state used to skip unchanged downloads"""
+    id = db.Column(db.Integer, primary_key=True)
+    source_name = db.Column(db.String(100), unique=True, nullable=False)
+    etag = db.Column(db.String(255))
+    last_modified = db.Column(db.String(100))
+    body_hash = db.Column(db.String(64))  # sha256 of the last parsed feed body
+    last_entry_id = db.Column(db.String(1000))  # GUID (or link) of the newest entry seen
+    last_entry_published = db.Column(db.DateTime)
+    last_fetched = db.Column(db.DateTime)
+    last_changed = db.Column(db.DateTime)
+    poll_interval = db.Column(db.Float)  # Adaptive seconds between polls
+    next_poll_at = db.Column(db.DateTime)
+
+    def __repr__(self):
+        return f'<FeedState {self.source_name}>'
+
 class Article(db.Model):
+    __table_args__ = (
+        db.Index('ix_article_source_url', 'source_url', unique=True),
+        # Keyset order of the article feed
+        db.Index('ix_article_created_at_id', 'created_at', 'id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(500), nullable=False)
     content = db.Column(db.Text, nullable=False)
@@ -55,12 +78,66 @@ class Article(db.Model):
     published = db.Column(db.Boolean, default=False)
     sentiment_score = db.Column(db.Float)
     sentiment_label = db.Column(db.String(20))
+    lexicon_version = db.Column(db.String(20))  # Sentiment lexicon that produced the score
+    entity_model = db.Column(db.String(100))  # Entity pipeline that produced the ArticleEntity rows
     accuracy_verified = db.Column(db.Boolean, default=False)
     trust_impact = db.Column(db.Float, default=0.0)
 
     def __repr__(self):
         return f'<Article {self.title}>'
 
+class ArticleSymbol(db.Model):
+    """A crypto symbol mentioned by an article, indexed during NLP processing"""
+    __table_args__ = (
+        db.Index('ix_article_symbol_symbol_created_at', 'symbol', 'created_at'),
+    )
+
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    symbol = db.Column(db.String(10), primary_key=True)
+    mention_count = db.Column(db.Integer, nullable=False, default=1)
+    in_title = db.Column(db.Boolean, nullable=False, default=False)
+    created_at = db.Column(db.DateTime)  # Copy of Article.created_at, so the index covers time windows
+
+    def __repr__(self):
+        return f'<ArticleSymbol {self.article_id}:{self.symbol}>'
+
+class ArticleEntity(db.Model):
+    """An organization, person or asset named in an article, from the entity extraction stage"""
+    __table_args__ = (
+        db.Index('ix_article_entity_label_name', 'label', 'name'),
+    )
+
+    article_id = db.Column(db.Integer, db.ForeignKey('article.id'), primary_key=True)
+    label = db.Column(db.String(20), primary_key=True)  # 'ORG', 'PERSON' or 'ASSET'
+    name = db.Column(db.String(200), primary_key=True)  # Entity text, or the symbol of an asset
+    mention_count = db.Column(db.Integer, nullable=False, default=1)
+
+    def __repr__(self):
+        return f'<ArticleEntity {self.article_id}:{self.label}:{self.name}>'
+
+class SymbolSentimentBucket(db.Model):
+    """Labelled articles mentioning a symbol, per sentiment, created within one hour"""
+    symbol = db.Column(db.String(10), primary_key=True)
+    hour = db.Column(db.DateTime, primary_key=True)  # Start of the hour, from ArticleSymbol.created_at
+    positive = db.Column(db.Integer, nullable=False, default=0)
+    neutral = db.Column(db.Integer, nullable=False, default=0)
+    negative = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f'<SymbolSentimentBucket {self.symbol}@{self.hour}>'
+
+class SentimentCacheEntry(db.Model):
+    """Sentiment of a normalized text under one lexicon version"""
+    __tablename__ = 'sentiment_cache'
+    text_hash = db.Column(db.String(64), primary_key=True)  # sha256 of the normalized text
+    lexicon_version = db.Column(db.String(20), primary_key=True)
+    sentiment_score = db.Column(db.Float, nullable=False)
+    sentiment_label = db.Column(db.String(20), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<SentimentCacheEntry {self.text_hash[:12]}@{self.lexicon_version}>'
+
 class DistributionLog(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     article_id = db.Column(db.Integer, db.ForeignKey('article.id'), nullable=False)
@@ -79,6 +156,20 @@ class CryptoPrice(db.Model):
     def __repr__(self):
         return f'<CryptoPrice {self.symbol}: ${self.price_usd:.2f}>'
 
+class CryptoSignal(db.Model):
+    """Latest trading signal of a symbol, refreshed by the pipeline so requests only read it"""
+    symbol = db.Column(db.String(10), primary_key=True)
+    signal = db.Column(db.String(10), nullable=False)  # 'buy', 'sell' or 'hold'
+    confidence = db.Column(db.Float, nullable=False)
+    total_articles = db.Column(db.Integer, nullable=False, default=0)
+    computed_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {'signal': self.signal, 'confidence': self.confidence, 'total_articles': self.total_articles}
+
+    def __repr__(self):
+        return f'<CryptoSignal {self.symbol}: {self.signal}>'
+
 class CryptoGlossary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     term = db.Column(db.String(100), unique=True, nullable=False)
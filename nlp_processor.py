@@ -1,10 +1,17 @@
+import argparse
 import logging
 import os
-import re
-from app import db
-from models import Article
+import sys
+from app import app, db
+from models import Article, ArticleEntity, ArticleSymbol
 import time
-from pathlib import Path
+from functools import partial
+from sqlalchemy import delete, func, select, true, update
+import sentiment_buckets
+from asset_registry import ASSETS
+from sentiment_cache import get_cache, text_key
+from text_analysis import ASSET_NORMALIZER, LEXICON_VERSION, SymbolMatcher, analyze_articles, index_symbols
+from worker_pool import SharedPool
 
 # Configure logging with more detail
 logging.basicConfig(
@@ -13,208 +20,342 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def analyze_sentiment(text):
-    """Analyze sentiment using crypto-specific lexicon and contextual analysis"""
+# Articles read, analysed and committed together
+NLP_CHUNK_SIZE = int(os.environ.get('NLP_CHUNK_SIZE', 500))
+# Worker processes analysing chunks in parallel; 0 analyses in-process
+NLP_WORKERS = int(os.environ.get('NLP_WORKERS', min(4, os.cpu_count() or 1)))
+# 'all' also formats every symbol and coin id the price tracker knows, not just the major assets
+NLP_ASSET_COVERAGE = os.environ.get('NLP_ASSET_COVERAGE', 'core')
+# spaCy pipeline for the entity stage: an installed package such as 'en_core_web_sm', or
+# 'blank' for assets only; unset skips the stage
+NLP_ENTITY_MODEL = os.environ.get('NLP_ENTITY_MODEL', '')
+
+# Articles without sentiment, and articles with empty sentiment to reprocess
+UNPROCESSED = (Article.sentiment_label.is_(None)) | (Article.sentiment_label == '')
+# Articles scored under a lexicon other than the current one
+STALE = (Article.sentiment_label.isnot(None) & (Article.sentiment_label != '') &
+         (Article.lexicon_version.is_(None) | (Article.lexicon_version != LEXICON_VERSION)))
+
+_pool = SharedPool('sentiment')
+
+def read_chunk(where, after_id, limit):
+    """Next ``limit`` ``(id, title, content, created_at, sentiment_label)`` rows matching ``where``
+    with an id above ``after_id``"""
+    return [tuple(row) for row in db.session.execute(
+        select(Article.id, Article.title, Article.content, Article.created_at, Article.sentiment_label)
+        .where(where, Article.id > after_id)
+        .order_by(Article.id)
+        .limit(limit)
+    )]
+
+def read_windows(where, chunk_size, workers):
+    """Yield windows of up to ``workers`` chunks (at least one) of ``read_chunk`` rows matching ``where``.
+
+    The next window is read after the caller has handled the previous one, so rows
+    the caller updates to no longer match ``where`` are never read twice.
+    """
+    last_id = 0
+    while True:
+        window = []
+        while len(window) < max(workers, 1):
+            chunk = read_chunk(where, last_id, chunk_size)
+            if not chunk:
+                break
+            window.append(chunk)
+            last_id = chunk[-1][0]
+        if not window:
+            return
+        yield window
+
+def asset_normalizer():
+    """The asset normalizer for ``NLP_ASSET_COVERAGE``"""
+    if NLP_ASSET_COVERAGE == 'all':
+        return ASSET_NORMALIZER.extended(ASSETS.coin_ids)
+    return ASSET_NORMALIZER
+
+def tracked_symbols():
+    """``{symbol: coin name or None}`` for every symbol the price tracker follows or the dashboard names"""
+    return ASSETS.tracked()
+
+def symbol_matcher():
+    """The ``SymbolMatcher`` for ``tracked_symbols``"""
+    return SymbolMatcher(tracked_symbols())
+
+def with_cached_scores(chunk, cache):
+    """Turn each ``read_chunk`` row into ``(id, title, content, cached)``,
+    where ``cached`` is the row's cached ``(score, label)`` or None.
+
+    Also returns the cache key of every row with content, by article id.
+    """
+    keys = {article_id: text_key(f"{title}. {content}")
+            for article_id, title, content, *_ in chunk if content and isinstance(content, str)}
+    cached = cache.get_many(keys.values())
+    return [row[:3] + (cached.get(keys.get(row[0])),) for row in chunk], keys
+
+def analyze_chunks(chunks, workers, normalizer=None, format_text=True, symbols=None):
+    """Run ``analyze_articles`` over ``chunks``, across the worker pool when there is more than one"""
+    return map_chunks(partial(analyze_articles, normalizer=normalizer, format_text=format_text, symbols=symbols),
+                      chunks, workers)
+
+def map_chunks(task, chunks, workers):
+    """Run the pool task ``task`` over ``chunks``, across the worker pool when there is more than one"""
+    if workers > 0 and len(chunks) > 1:
+        with _pool.lock:
+            try:
+                return _pool.get(workers).map_chunks(task, chunks)
+            except (EOFError, OSError) as e:
+                logger.error(f"NLP pool failed, running in-process: {str(e)}")
+                _pool.shutdown()
+    return [task(chunk) for chunk in chunks]
+
+def track_sentiment(article_ids, mentions, created, labels, updates=()):
+    """Move the symbol sentiment buckets of ``article_ids`` from their stored mentions and
+    ``labels`` to ``mentions`` (None keeps the stored ones) and the labels in ``updates``.
+
+    Reads the stored mentions, so call it before ``replace_symbols``; committed with the
+    caller's transaction.
+    """
+    stored = db.session.execute(
+        select(ArticleSymbol.article_id, ArticleSymbol.symbol).where(ArticleSymbol.article_id.in_(article_ids))
+    ).all()
+    new_labels = dict(labels)
+    new_labels.update((item['id'], item['sentiment_label']) for item in updates)
+    current = stored if mentions is None else [(item['article_id'], item['symbol']) for item in mentions]
+    sentiment_buckets.apply_deltas(sentiment_buckets.mention_deltas(
+        [(symbol, created[article_id], labels[article_id]) for article_id, symbol in stored],
+        [(symbol, created[article_id], new_labels[article_id]) for article_id, symbol in current],
+    ))
+
+def replace_symbols(article_ids, mentions, created):
+    """Replace the ``ArticleSymbol`` rows of ``article_ids`` with ``mentions``, stamping each
+    with its article's ``created_at`` from ``created``; committed with the caller's transaction"""
+    db.session.execute(delete(ArticleSymbol).where(ArticleSymbol.article_id.in_(article_ids)))
+    if mentions:
+        db.session.execute(ArticleSymbol.__table__.insert(), [
+            dict(item, created_at=created[item['article_id']]) for item in mentions
+        ])
+
+def process_articles(chunk_size=None, workers=None):
+    """Process all unprocessed articles with sentiment analysis.
+
+    Articles are read in id-ordered (keyset) chunks of ``chunk_size`` (default
+    ``NLP_CHUNK_SIZE``). Up to ``workers`` chunks (default ``NLP_WORKERS``) are
+    analysed in parallel, then each chunk is written with one bulk UPDATE and
+    committed on its own, so memory stays bounded by ``workers * chunk_size``
+    articles and a failure only loses its own chunk. Texts already in the
+    sentiment cache are not analysed again. The symbols each article mentions are
+    indexed in ``ArticleSymbol`` in the same pass. Returns the number of articles processed.
+    """
+    return analyze_matching(UNPROCESSED, chunk_size, workers, format_text=True)
+
+def rescore_stale_articles(chunk_size=None, workers=None):
+    """Re-score only the articles scored under an older lexicon.
+
+    Cache entries of other lexicon versions are dropped first; entries for the
+    current version are kept, so texts already scored with it are not re-analysed.
+    Returns the number of articles re-scored.
+    """
     try:
-        if not text or not isinstance(text, str):
-            logger.warning("Invalid text input for sentiment analysis")
-            return 0.0, 'neutral'
-
-        logger.debug(f"Starting sentiment analysis for text (length: {len(text)})")
-
-        # Enhanced crypto-specific sentiment words and phrases with weights
-        positive_patterns = {
-            # Price movements (weight: 1.0)
-            'surge': 1.2, 'rally': 1.2, 'jump': 1.0, 'gain': 1.0, 'soar': 1.2, 'rise': 1.0, 'climb': 1.0, 
-            'peak': 1.0, 'record high': 1.5, 'breakout': 1.2, 'outperform': 1.2,
-            # Market sentiment (weight: 1.2)
-            'bullish': 1.5, 'optimistic': 1.2, 'confident': 1.2, 'strong': 1.0, 'positive': 1.0, 
-            'opportunity': 1.0, 'support': 1.0,
-            # Adoption/Development (weight: 1.5)
-            'adoption': 1.5, 'partnership': 1.5, 'launch': 1.2, 'upgrade': 1.2, 'integration': 1.2, 
-            'milestone': 1.2, 'development': 1.2, 'progress': 1.2, 'innovation': 1.5, 'breakthrough': 1.5,
-            'success': 1.2, 'approval': 1.3, 'etf': 1.8, 'advance': 1.5, 'ready': 1.3,
-        }
-
-        negative_patterns = {
-            # Price movements (weight: 1.5)
-            'crash': 2.0, 'plunge': 1.8, 'drop': 1.2, 'fall': 1.2, 'decline': 1.2, 'tumble': 1.5, 
-            'slump': 1.5, 'correction': 1.2, 'collapse': 2.0, 'tank': 1.8,
-            # Market sentiment (weight: 1.2)
-            'bearish': 1.5, 'pessimistic': 1.2, 'fear': 1.5, 'concern': 1.2, 'worry': 1.2, 
-            'uncertain': 1.0, 'volatile': 1.2, 'panic': 1.8,
-            # Security/Risk (weight: 2.0)
-            'hack': 2.0, 'breach': 2.0, 'scam': 2.0, 'fraud': 2.0, 'vulnerability': 1.5, 
-            'exploit': 1.5, 'risk': 1.2, 'attack': 1.8,
-            # Regulatory (weight: 1.5)
-            'ban': 1.8, 'restrict': 1.5, 'crack down': 1.8, 'investigate': 1.2, 'sue': 1.5, 
-            'lawsuit': 1.5, 'illegal': 1.5, 'regulation': 1.2,
-            # Market problems (weight: 1.8)
-            'sell-off': 1.8, 'dump': 1.8, 'liquidation': 1.8, 'margin call': 1.8, 'default': 1.8,
-            'loss': 1.5, 'bearish': 1.5
-        }
-
-        # Clean and normalize text
-        text = text.lower()
-        text = re.sub(r'[^\w\s-]', ' ', text)  # Remove special characters except hyphens
-        sentences = [s.strip() for s in text.split('.') if s.strip()]
-
-        weighted_pos_score = 0
-        weighted_neg_score = 0
-        total_matches = 0
-
-        for sentence in sentences:
-            if not sentence.strip():
-                continue
-
-            has_negation = any(neg in sentence for neg in {'not', 'no', "n't", 'never', 'without', 'rarely'})
-            logger.debug(f"Analyzing sentence: '{sentence.strip()}', has_negation: {has_negation}")
-
-            # Calculate weighted sentiment scores
-            for pattern, weight in positive_patterns.items():
-                if pattern in sentence:
-                    if has_negation:
-                        weighted_neg_score += weight
-                        logger.debug(f"Found negated positive pattern '{pattern}' (weight: {weight})")
-                    else:
-                        weighted_pos_score += weight
-                        logger.debug(f"Found positive pattern '{pattern}' (weight: {weight})")
-                    total_matches += 1
-
-            for pattern, weight in negative_patterns.items():
-                if pattern in sentence:
-                    if has_negation:
-                        weighted_pos_score += weight * 0.5  # Negated negative is less positive
-                        logger.debug(f"Found negated negative pattern '{pattern}' (weight: {weight})")
-                    else:
-                        weighted_neg_score += weight
-                        logger.debug(f"Found negative pattern '{pattern}' (weight: {weight})")
-                    total_matches += 1
-
-        if total_matches == 0:
-            logger.debug("No sentiment patterns found in text")
-            return 0.0, 'neutral'
-
-        # Calculate weighted sentiment score
-        sentiment_score = (weighted_pos_score - weighted_neg_score) / max(total_matches, 1)
-
-        logger.debug(f"Final sentiment analysis results:"
-                    f"\n- Positive score: {weighted_pos_score}"
-                    f"\n- Negative score: {weighted_neg_score}"
-                    f"\n- Total matches: {total_matches}"
-                    f"\n- Final score: {sentiment_score:.4f}")
-
-        # Adjusted thresholds with higher sensitivity to negative sentiment
-        if sentiment_score > 0.2:  # Lowered threshold for positive sentiment
-            logger.info(f"Positive sentiment detected with score {sentiment_score:.4f}")
-            return sentiment_score, 'positive'
-        elif sentiment_score < -0.1:  # More sensitive to negative sentiment
-            logger.info(f"Negative sentiment detected with score {sentiment_score:.4f}")
-            return sentiment_score, 'negative'
-        else:
-            logger.info(f"Neutral sentiment detected with score {sentiment_score:.4f}")
-            return sentiment_score, 'neutral'
-
+        removed = get_cache().invalidate_stale()
+        db.session.commit()
+        if removed:
+            logger.info(f"Dropped {removed} sentiment cache entries from older lexicons")
     except Exception as e:
-        logger.error(f"Error in sentiment analysis: {str(e)}", exc_info=True)
-        return 0.0, 'neutral'
+        logger.error(f"Error invalidating sentiment cache: {str(e)}")
+        db.session.rollback()
+        raise
+    return analyze_matching(STALE, chunk_size, workers, format_text=False)
 
-def process_articles():
-    """Process all unprocessed articles with sentiment analysis"""
+def analyze_matching(where, chunk_size=None, workers=None, format_text=True):
+    """Score (and with ``format_text``, asset-format) every article matching ``where``, chunk by chunk"""
+    chunk_size = chunk_size or NLP_CHUNK_SIZE
+    workers = NLP_WORKERS if workers is None else workers
     logger.info("Starting article processing")
     try:
-        # Process articles without sentiment and reprocess articles with empty sentiment
-        articles = Article.query.filter(
-            (Article.sentiment_label.is_(None)) | 
-            (Article.sentiment_label == '')
-        ).all()
-
-        logger.info(f"Found {len(articles)} articles to process")
+        total = db.session.scalar(select(func.count()).select_from(Article).where(where))
+        logger.info(f"Found {total} articles to process (lexicon {LEXICON_VERSION})")
 
-        if not articles:
+        if not total:
             logger.info("No articles found needing sentiment analysis")
-            return
-
-        # Define crypto assets and their tickers
-        crypto_assets = {
-            'bitcoin': 'BTC',
-            'btc': 'BTC',
-            'ethereum': 'ETH',
-            'eth': 'ETH',
-            'binance coin': 'BNB',
-            'bnb': 'BNB',
-            'cardano': 'ADA',
-            'ada': 'ADA',
-            'solana': 'SOL',
-            'sol': 'SOL',
-            'xrp': 'XRP',
-            'ripple': 'XRP',
-            'dogecoin': 'DOGE',
-            'doge': 'DOGE',
-            'polygon': 'MATIC',
-            'matic': 'MATIC',
-            'avalanche': 'AVAX',
-            'avax': 'AVAX'
-        }
+            return 0
 
         processed_count = 0
+        skipped_count = 0
         error_count = 0
-
-        for article in articles:
+        cache = get_cache()
+        hits_before = cache.hits
+        normalizer = asset_normalizer()
+        symbols = symbol_matcher() if format_text else None
+        started = time.monotonic()
+
+        for window in read_windows(where, chunk_size, workers):
+            created = {row[0]: row[3] for chunk in window for row in chunk}
+            labels = {row[0]: row[4] for chunk in window for row in chunk}
             try:
-                logger.debug(f"Processing article {article.id}: {article.title}")
-
-                # Validate content
-                if not article.content or not isinstance(article.content, str):
-                    logger.warning(f"Invalid content for article {article.id}")
-                    continue
-
-                # Combine title and content for better context
-                full_text = f"{article.title}. {article.content}"
-
-                # Format content with bold assets and tickers
-                formatted_content = article.content
-                formatted_title = article.title
-
-                for asset, ticker in crypto_assets.items():
-                    # Create pattern that matches word boundaries
-                    pattern = re.compile(rf'\b{asset}\b', re.IGNORECASE)
-                    # Only show the asset name, without ticker symbols
-                    replacement = asset.title()
-
-                    formatted_content = pattern.sub(replacement, formatted_content)
-                    formatted_title = pattern.sub(replacement, formatted_title)
-
-                # Update article content
-                article.content = formatted_content
-                article.title = formatted_title
-
-                # Analyze sentiment
-                score, label = analyze_sentiment(full_text)
-                article.sentiment_score = score
-                article.sentiment_label = label
-
-                processed_count += 1
-                logger.info(f"Successfully processed article {article.id}: Sentiment={label} (score={score:.4f})")
-
+                prepared = [with_cached_scores(chunk, cache) for chunk in window]
+                results = analyze_chunks([rows for rows, _ in prepared], workers, normalizer, format_text, symbols)
             except Exception as e:
-                error_count += 1
-                logger.error(f"Error processing article {article.id}: {str(e)}", exc_info=True)
+                error_count += sum(len(chunk) for chunk in window)
+                logger.error(f"Error analysing articles up to id {window[-1][-1][0]}: {str(e)}", exc_info=True)
+                db.session.rollback()
                 continue
 
-        # Commit all changes
+            for (rows, keys), (updates, skipped, mentions) in zip(prepared, results):
+                for article_id in skipped:
+                    logger.warning(f"Invalid content for article {article_id}")
+                skipped_count += len(skipped)
+                scored = {row[0] for row in rows if row[3] is None}
+                try:
+                    article_ids = [row[0] for row in rows]
+                    track_sentiment(article_ids, mentions if symbols is not None else None, created, labels, updates)
+                    if updates:
+                        db.session.execute(update(Article), updates)
+                    if symbols is not None:
+                        replace_symbols(article_ids, mentions, created)
+                    cache.put_many({keys[item['id']]: (item['sentiment_score'], item['sentiment_label'])
+                                    for item in updates if item['id'] in scored})
+                    db.session.commit()
+                    processed_count += len(updates)
+                except Exception as e:
+                    db.session.rollback()
+                    error_count += len(updates)
+                    logger.error(f"Error saving articles {rows[0][0]}-{rows[-1][0]}: {str(e)}", exc_info=True)
+
+            done = processed_count + skipped_count + error_count
+            elapsed = time.monotonic() - started
+            logger.info(f"Processed {done}/{total} articles ({done / max(elapsed, 1e-9):.0f}/s, "
+                        f"{cache.hits - hits_before} from cache, {error_count} errors)")
+
         if processed_count > 0:
-            db.session.commit()
             logger.info(f"Successfully processed and committed {processed_count} articles")
             if error_count > 0:
                 logger.warning(f"Encountered {error_count} errors during processing")
         else:
             logger.info("No articles were processed successfully")
+        return processed_count
 
     except Exception as e:
         logger.error(f"Error in process_articles: {str(e)}")
         db.session.rollback()
         raise
 
+def backfill_article_symbols(chunk_size=None, workers=None):
+    """Rebuild the ``ArticleSymbol`` mention index of every article, chunk by chunk.
+
+    For articles stored before the index existed, or after the symbol lists change.
+    Each chunk's rows are replaced and committed on its own, together with the
+    sentiment bucket counts they move, so the backfill can be interrupted and re-run.
+    Returns the number of mention rows written.
+    """
+    chunk_size = chunk_size or NLP_CHUNK_SIZE
+    workers = NLP_WORKERS if workers is None else workers
+    task = partial(index_symbols, matcher=symbol_matcher())
+    total = db.session.scalar(select(func.count()).select_from(Article))
+    logger.info(f"Indexing symbol mentions of {total} articles")
+    indexed = 0
+    written = 0
+    started = time.monotonic()
+    for window in read_windows(true(), chunk_size, workers):
+        created = {row[0]: row[3] for chunk in window for row in chunk}
+        labels = {row[0]: row[4] for chunk in window for row in chunk}
+        results = map_chunks(task, [[row[:3] for row in chunk] for chunk in window], workers)
+        for chunk, mentions in zip(window, results):
+            try:
+                article_ids = [row[0] for row in chunk]
+                track_sentiment(article_ids, mentions, created, labels)
+                replace_symbols(article_ids, mentions, created)
+                db.session.commit()
+                written += len(mentions)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error indexing articles {chunk[0][0]}-{chunk[-1][0]}: {str(e)}", exc_info=True)
+            indexed += len(chunk)
+        elapsed = time.monotonic() - started
+        logger.info(f"Indexed {indexed}/{total} articles ({indexed / max(elapsed, 1e-9):.0f}/s, {written} mentions)")
+    return written
+
+def backfill_symbols_if_missing(chunk_size=None, workers=None):
+    """Run ``backfill_article_symbols`` when there are articles but no ``ArticleSymbol`` rows.
+
+    Only processing fills the mention index, so a database that predates it would keep
+    its older articles out of signals and related news until a manual backfill.
+    Returns the number of mention rows written.
+    """
+    if db.session.scalar(select(ArticleSymbol.article_id).limit(1)) is not None:
+        return 0
+    if db.session.scalar(select(Article.id).limit(1)) is None:
+        return 0
+    logger.info("Symbol mention index is empty, backfilling it")
+    return backfill_article_symbols(chunk_size, workers)
+
+def extract_article_entities(chunk_size=None, workers=None, model=None):
+    """Optional stage: store the organizations, people and assets each article names.
+
+    Runs spaCy's ``nlp.pipe`` with ``model`` (default ``NLP_ENTITY_MODEL``) over the
+    articles not yet extracted with it, in keyset chunks spread across the worker
+    pool; each worker loads the pipeline once. The entities are written to
+    ``ArticleEntity`` so views never parse article text. Does nothing when no model
+    is configured. Returns the number of articles processed.
+    """
+    model = model or NLP_ENTITY_MODEL
+    if not model:
+        return 0
+    # spaCy is only imported when the stage is enabled
+    from entity_extraction import extract_entities
+
+    chunk_size = chunk_size or NLP_CHUNK_SIZE
+    workers = NLP_WORKERS if workers is None else workers
+    pending = Article.entity_model.is_(None) | (Article.entity_model != model)
+    task = partial(extract_entities, model=model)
+    total = db.session.scalar(select(func.count()).select_from(Article).where(pending))
+    if not total:
+        return 0
+    logger.info(f"Extracting entities from {total} articles with {model}")
+    processed = 0
+    found = 0
+    started = time.monotonic()
+    for window in read_windows(pending, chunk_size, workers):
+        results = map_chunks(task, [[row[:3] for row in chunk] for chunk in window], workers)
+        for chunk, entities in zip(window, results):
+            article_ids = [row[0] for row in chunk]
+            try:
+                db.session.execute(delete(ArticleEntity).where(ArticleEntity.article_id.in_(article_ids)))
+                if entities:
+                    db.session.execute(ArticleEntity.__table__.insert(), entities)
+                db.session.execute(update(Article).where(Article.id.in_(article_ids)).values(entity_model=model))
+                db.session.commit()
+                processed += len(chunk)
+                found += len(entities)
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error storing entities of articles {article_ids[0]}-{article_ids[-1]}: {str(e)}",
+                             exc_info=True)
+        elapsed = time.monotonic() - started
+        logger.info(f"Extracted entities from {processed}/{total} articles "
+                    f"({processed / max(elapsed, 1e-9):.0f} docs/s, {found} entities)")
+    return processed
+
 if __name__ == "__main__":
-    process_articles()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Sentiment analysis, symbol indexing and entity extraction '
+                                                 'of stored articles')
+    parser.add_argument('command', nargs='?', default='process',
+                        choices=['process', 'backfill-symbols', 'entities', 'rebuild-buckets', 'verify-buckets'],
+                        help='score unprocessed articles (default), rebuild the symbol mention index, '
+                             'extract entities with NLP_ENTITY_MODEL, recount the symbol sentiment buckets, '
+                             'or check the buckets against a scan of the signal window')
+    args = parser.parse_args()
+    with app.app_context():
+        if args.command == 'backfill-symbols':
+            backfill_article_symbols()
+        elif args.command == 'entities':
+            extract_article_entities()
+        elif args.command == 'rebuild-buckets':
+            sentiment_buckets.rebuild()
+        elif args.command == 'verify-buckets':
+            mismatched = sentiment_buckets.verify(sorted(tracked_symbols()))
+            if mismatched:
+                logger.error(f"Sentiment buckets differ from the window scan for {', '.join(mismatched)}")
+                sys.exit(1)
+            logger.info("Sentiment buckets match the window scan")
+        else:
+            process_articles()
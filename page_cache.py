@@ -0,0 +1,88 @@
+"""Rendered-page cache for pages that only change when the pipeline writes.
+
+Entries are held under a data version: the pipeline calls ``bump`` after each
+write that a cached page shows (prices, signals, processed articles), which drops
+every entry. Between bumps a hit is served without rendering or touching the
+database. Each entry keeps the HTML, its gzip encoding and a weak ETag, so a hit
+is never recompressed and a revalidation with a matching ``If-None-Match`` gets a
+304. The cache lives in the process, like the scheduler thread that bumps it.
+"""
+import gzip
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+from flask import make_response
+
+# Rendered pages kept per process
+PAGE_CACHE_SIZE = int(os.environ.get('PAGE_CACHE_SIZE', 64))
+# gzip level of the stored encoding, Flask-Compress's default
+PAGE_CACHE_GZIP_LEVEL = int(os.environ.get('PAGE_CACHE_GZIP_LEVEL', 6))
+
+class CachedPage:
+    """One rendered page: its HTML, gzip bytes and ETag"""
+    def __init__(self, html, level=PAGE_CACHE_GZIP_LEVEL):
+        body = html.encode('utf-8')
+        self.html = html
+        self.gzipped = gzip.compress(body, compresslevel=level, mtime=0)
+        self.etag = hashlib.sha1(body).hexdigest()[:20]
+
+    def response(self, request):
+        """The response to ``request``: a 304 if it already has this page, gzip if it accepts it"""
+        if request.accept_encodings['gzip']:
+            response = make_response(self.gzipped)
+            # Flask-Compress leaves responses that already carry an encoding alone
+            response.headers['Content-Encoding'] = 'gzip'
+        else:
+            response = make_response(self.html)
+        response.content_type = 'text/html; charset=utf-8'
+        response.set_etag(self.etag, weak=True)
+        response.headers['Cache-Control'] = 'no-cache'
+        response.vary.update(('Accept-Encoding', 'Cookie'))
+        return response.make_conditional(request)
+
+class PageCache:
+    """LRU of ``CachedPage``s for the current data version"""
+    def __init__(self, size=PAGE_CACHE_SIZE):
+        self.size = size
+        self.version = 0
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """The cached page for ``key``, or None"""
+        with self.lock:
+            page = self.entries.get(key)
+            if page is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return page
+
+    def put(self, key, version, html):
+        """Cache ``html`` rendered from the data at ``version`` and return its page.
+
+        A page rendered before a bump is returned but not stored, so it can't
+        outlive the version it was read under.
+        """
+        page = CachedPage(html)
+        with self.lock:
+            if version == self.version:
+                self.entries[key] = page
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.size:
+                    self.entries.popitem(last=False)
+        return page
+
+    def bump(self):
+        """Start a new data version, dropping every cached page"""
+        with self.lock:
+            self.version += 1
+            self.entries.clear()
+
+# The anonymous dashboard, bumped by the pipeline and price updates
+dashboard_cache = PageCache()
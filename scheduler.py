@@ -2,11 +2,17 @@ import time
 import logging
 import schedule
 from datetime import datetime
-from app import app
-from scraper import scrape_articles
-from nlp_processor import process_articles
+from app import app, refresh_crypto_signals
+from scraper import scrape_articles, scrape_due_sources, due_sources
+from nlp_processor import backfill_symbols_if_missing, extract_article_entities, process_articles, rescore_stale_articles
+import sentiment_buckets
 from distributors import distribute_articles
 from crypto_price_tracker import CryptoPriceTracker
+from coin_metadata import COIN_DATA_WARM_INTERVAL, warm_coin_data
+from http_client import get_client
+from page_cache import dashboard_cache
+
+SOURCE_POLL_TICK = 30  # Seconds between checks for sources due a poll
 
 def run_pipeline():
     """Run the complete news pipeline with proper error handling"""
@@ -22,6 +28,7 @@ def run_pipeline():
                 logging.info("Updated cryptocurrency prices")
             except Exception as e:
                 logging.error(f"Price tracking failed: {str(e)}", exc_info=True)
+            refresh_crypto_signals()
 
             # Run scraper
             try:
@@ -32,30 +39,63 @@ def run_pipeline():
                 logging.error(f"Scraping failed: {str(e)}", exc_info=True)
                 articles_added = 0
 
-            # Process articles
-            try:
-                if articles_added > 0:
-                    logging.info("Starting sentiment analysis for new articles")
-                    process_articles()
-                    logging.info("Completed sentiment analysis processing")
-                else:
-                    logging.info("No new articles to process for sentiment")
-            except Exception as e:
-                logging.error(f"Sentiment analysis failed: {str(e)}", exc_info=True)
-
-            # Only distribute if we have new articles
-            if articles_added > 0:
-                try:
-                    logging.info("Starting article distribution")
-                    distribute_articles()
-                    logging.info("Completed article distribution")
-                except Exception as e:
-                    logging.error(f"Distribution failed: {str(e)}", exc_info=True)
+            process_new_articles(articles_added)
+            # New articles and the run time show on the dashboard
+            dashboard_cache.bump()
 
+            get_client().log_metrics()
             logging.info("Completed news pipeline")
         except Exception as e:
             logging.error(f"Pipeline error: {str(e)}", exc_info=True)
 
+def process_new_articles(articles_added):
+    """Run sentiment analysis and distribution after a scrape that added articles"""
+    # Process articles
+    try:
+        if articles_added > 0:
+            logging.info("Starting sentiment analysis for new articles")
+            process_articles()
+            logging.info("Completed sentiment analysis processing")
+        else:
+            logging.info("No new articles to process for sentiment")
+    except Exception as e:
+        logging.error(f"Sentiment analysis failed: {str(e)}", exc_info=True)
+
+    # Signals only change when new articles were labelled
+    if articles_added > 0:
+        refresh_crypto_signals()
+
+    # Optional entity stage; a no-op unless NLP_ENTITY_MODEL is set
+    if articles_added > 0:
+        try:
+            extract_article_entities()
+        except Exception as e:
+            logging.error(f"Entity extraction failed: {str(e)}", exc_info=True)
+
+    # Only distribute if we have new articles
+    if articles_added > 0:
+        try:
+            logging.info("Starting article distribution")
+            distribute_articles()
+            logging.info("Completed article distribution")
+        except Exception as e:
+            logging.error(f"Distribution failed: {str(e)}", exc_info=True)
+
+def poll_due_sources():
+    """Poll the sources whose adaptive interval has elapsed and process what they bring"""
+    with app.app_context():
+        try:
+            sources = due_sources()
+            if not sources:
+                return
+            logging.info(f"Polling due sources: {[source.name for source in sources]}")
+            app.config['LAST_SCRAPER_RUN'] = datetime.utcnow()
+            articles_added = scrape_due_sources(sources)
+            process_new_articles(articles_added)
+            dashboard_cache.bump()
+        except Exception as e:
+            logging.error(f"Source polling failed: {str(e)}", exc_info=True)
+
 def start_scheduler():
     """Initialize and start the scheduler with proper error handling"""
     # Configure logging with more detail
@@ -66,6 +106,20 @@ def start_scheduler():
 
     logging.info("Starting news aggregator scheduler")
 
+    # Databases that predate the symbol mention index get it built before anything reads it
+    try:
+        with app.app_context():
+            backfill_symbols_if_missing()
+    except Exception as e:
+        logging.error(f"Symbol mention backfill failed: {str(e)}", exc_info=True)
+
+    # Signals read incrementally kept buckets; recount them once so they start out exact
+    try:
+        with app.app_context():
+            sentiment_buckets.rebuild()
+    except Exception as e:
+        logging.error(f"Sentiment bucket rebuild failed: {str(e)}", exc_info=True)
+
     # Run once immediately on startup with app context
     try:
         logging.info("Running initial pipeline")
@@ -73,22 +127,34 @@ def start_scheduler():
     except Exception as e:
         logging.error(f"Initial pipeline run failed: {str(e)}", exc_info=True)
 
-    # Schedule regular runs
-    def scheduled_pipeline():
+    # Lexicon changes ship with a restart; re-score only what an older lexicon scored
+    try:
         with app.app_context():
-            run_pipeline()
+            rescore_stale_articles()
+    except Exception as e:
+        logging.error(f"Sentiment re-score failed: {str(e)}", exc_info=True)
+
+    # Start filling the coin page data; refreshes run on their own worker
+    try:
+        warm_coin_data()
+    except Exception as e:
+        logging.error(f"Coin data warm-up failed: {str(e)}", exc_info=True)
 
     def scheduled_price_update():
         with app.app_context():
             CryptoPriceTracker().fetch_current_prices()
+            refresh_crypto_signals()
 
-    schedule.every(10).minutes.do(scheduled_pipeline)
+    # Each source is polled on its own adaptive interval; the tick only checks who is due
+    schedule.every(SOURCE_POLL_TICK).seconds.do(poll_due_sources)
     schedule.every(10).minutes.do(scheduled_price_update)
+    # Coin pages only read cached coin data; keep the top symbols' entries fresh
+    schedule.every(COIN_DATA_WARM_INTERVAL).seconds.do(warm_coin_data)
 
     while True:
         try:
             schedule.run_pending()
-            time.sleep(60)
+            time.sleep(SOURCE_POLL_TICK)
         except Exception as e:
             logging.error(f"Scheduler error: {str(e)}", exc_info=True)
             time.sleep(60)
@@ -1,22 +1,30 @@
 import logging
 import time
-from bs4 import BeautifulSoup, Comment
-import requests
-import trafilatura
 from datetime import datetime, timedelta
-from app import db, socketio, broadcast_new_article
-from models import Article, NewsSourceMetrics
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+from app import db, socketio, broadcast_new_articles
+from database import insert_ignore_returning
+from models import Article, NewsSourceMetrics, FeedState
+from http_client import get_client
 import random
+import hashlib
 import feedparser
-import re
-from html.parser import HTMLParser
-from html.parser import HTMLParser as HTMLParser2
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from html_cleaner import clean_html_batch
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+FEED_FETCH_TIMEOUT = 15  # Per-source deadline in seconds
+FEED_FETCH_BUDGET = 45  # Overall budget for one concurrent fetch round
+FEED_FETCH_WORKERS = 8
+FEED_ENTRY_LIMIT = 500  # Most entries read from a single feed
+FEED_POLL_DEFAULT = 600  # Seconds between polls until a feed's publish rate is known
+FEED_POLL_MIN = 120
+FEED_POLL_MAX = 3600
+FEED_POLL_JITTER = 0.1  # +/- fraction applied to each interval so sources spread out
+FEED_POLL_BACKOFF = 1.5  # Interval growth after a poll that brought nothing new
+FEED_RATE_SAMPLES = 20  # Newest entries used to estimate a feed's publish rate
+
 class NewsSource:
     """News source configuration class"""
     def __init__(self, name, url, article_selector=None, title_selector=None, is_rss=False):
@@ -26,116 +34,11 @@ class NewsSource:
         self.title_selector = title_selector
         self.is_rss = is_rss
 
-class MLStripper(HTMLParser2):
-    def __init__(self):
-        super().__init__()
-        self.reset()
-        self.fed = []
-    def handle_data(self, data):
-        self.fed.append(data)
-    def get_data(self):
-        return ''.join(self.fed)
-
-def strip_tags(html):
-    """Strip HTML tags from content"""
-    try:
-        if not html:
-            return ""
-        s = MLStripper()
-        s.feed(html)
-        return s.get_data()
-    except Exception as e:
-        logger.error(f"Error stripping HTML tags: {str(e)}")
-        return re.sub(r'<[^>]+>', '', html)
-
-def clean_html_content(html_content):
-    """Clean HTML content and extract readable text with enhanced cleaning"""
-    try:
-        if not html_content:
-            return ""
-
-        logger.debug(f"Starting HTML content cleaning (length: {len(html_content)})")
-
-        try:
-            downloaded = trafilatura.extract(html_content, include_links=False, include_images=False, 
-                                          include_tables=False, no_fallback=False)
-            if downloaded:
-                cleaned_text = downloaded.strip()
-                logger.debug("Successfully cleaned content using trafilatura")
-                return cleaned_text
-        except Exception as e:
-            logger.warning(f"Trafilatura extraction failed: {str(e)}, falling back to BeautifulSoup")
-
-        html_content = html_content.replace('\xa0', ' ')
-        html_content = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F-\x9F]', '', html_content)
-
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-        except Exception as e:
-            logger.error(f"BeautifulSoup parsing failed: {str(e)}")
-            return strip_tags(html_content)
-
-        try:
-            for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-                comment.extract()
-        except Exception as e:
-            logger.warning(f"Error removing HTML comments: {str(e)}")
-
-        unwanted_tags = [
-            "script", "style", "iframe", "form", "nav", "header", "footer",
-            "aside", "noscript", "figure", "figcaption", "time", "button",
-            "meta", "link", "img", "svg", "path", "source", "picture"
-        ]
-
-        for tag in unwanted_tags:
-            for element in soup.find_all(tag):
-                try:
-                    element.decompose()
-                except Exception as e:
-                    logger.warning(f"Error removing {tag} tag: {str(e)}")
-
-        for br in soup.find_all("br"):
-            br.replace_with("\n")
-
-        for p in soup.find_all("p"):
-            p.replace_with(f"\n{p.get_text()}\n")
-
-        text = soup.get_text(separator=' ')
-
-        text = re.sub(r'<[^>]+>', '', text)
-        text = re.sub(r'&nbsp;|&amp;|&lt;|&gt;|&quot;|&#39;|&[a-zA-Z]+;', ' ', text)
-        text = re.sub(r'\s+', ' ', text)
-        text = re.sub(r'\n\s*\n', '\n', text)
-        text = text.strip()
-
-        logger.debug(f"Completed HTML cleaning. Final length: {len(text)}")
-        return text
-
-    except Exception as e:
-        logger.error(f"Error cleaning HTML content: {str(e)}")
-        cleaned = strip_tags(html_content)
-        if cleaned:
-            return cleaned.strip()
-        return ""
-
-def create_session():
-    """Create a requests session with advanced retry strategy"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["GET", "HEAD", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("http://", adapter)
-    session.mount("https://", adapter)
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'application/rss+xml,application/xml,application/xhtml+xml,text/html;q=0.9,text/plain;q=0.8,*/*;q=0.7',
-        'Accept-Language': 'en-US,en;q=0.9'
-    })
-    return session
+FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/rss+xml,application/xml,application/xhtml+xml,text/html;q=0.9,text/plain;q=0.8,*/*;q=0.7',
+    'Accept-Language': 'en-US,en;q=0.9'
+}
 
 SOURCES = [
     NewsSource(
@@ -160,6 +63,16 @@ SOURCES = [
     )
 ]
 
+def find_existing_urls(urls, chunk_size=500):
+    """Return the subset of ``urls`` already stored as articles, using one IN query per chunk"""
+    existing = set()
+    urls = list(dict.fromkeys(urls))
+    for i in range(0, len(urls), chunk_size):
+        chunk = urls[i:i + chunk_size]
+        rows = db.session.query(Article.source_url).filter(Article.source_url.in_(chunk)).all()
+        existing.update(row[0] for row in rows)
+    return existing
+
 def init_source_metrics(source_name):
     """Initialize or get source metrics with proper error handling"""
     try:
@@ -200,89 +113,399 @@ def init_source_metrics(source_name):
         db.session.rollback()
         return None
 
+class FeedFetchResult:
+    """Raw outcome of downloading a single feed, before any parsing"""
+    def __init__(self, source, content=None, status_code=None, error=None, elapsed=0.0,
+                 etag=None, last_modified=None):
+        self.source = source
+        self.content = content
+        self.status_code = status_code
+        self.error = error
+        self.elapsed = elapsed
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def ok(self):
+        return self.error is None and self.content is not None
+
+    @property
+    def not_modified(self):
+        return self.error is None and self.status_code == 304
+
+    @property
+    def body_hash(self):
+        return hashlib.sha256(self.content).hexdigest() if self.content is not None else None
+
+def load_feed_validators(source_names):
+    """Return the stored ETag/Last-Modified validators for each source name"""
+    try:
+        states = FeedState.query.filter(FeedState.source_name.in_(source_names)).all()
+        return {state.source_name: {'etag': state.etag, 'last_modified': state.last_modified}
+                for state in states}
+    except Exception as e:
+        logger.error(f"Error loading feed state: {str(e)}")
+        return {}
+
+def get_feed_state(source_name):
+    """Get or create the polling state row for a source"""
+    state = FeedState.query.filter_by(source_name=source_name).first()
+    if not state:
+        state = FeedState(source_name=source_name)
+        db.session.add(state)
+    return state
+
+def record_feed_fetch(source, result, changed, watermark=None, entries=None, complete=True):
+    """Persist cache validators after a feed was fetched and, if changed, fully processed.
+
+    ``watermark`` is an ``(entry_id, published)`` pair for the newest entry processed.
+    ``entries`` are the parsed feed entries, used to re-estimate the poll interval.
+    When an entry failed (``complete`` is false) the previous validators and body hash
+    are kept, so the same body is fetched and walked again to retry it.
+    """
+    try:
+        state = get_feed_state(source.name)
+        now = datetime.utcnow()
+        state.last_fetched = now
+        if changed:
+            if complete:
+                state.etag = result.etag
+                state.last_modified = result.last_modified
+                state.body_hash = result.body_hash
+            state.last_changed = now
+        if watermark:
+            state.last_entry_id, state.last_entry_published = watermark
+        state.poll_interval = next_poll_interval(state.poll_interval, entries)
+        state.next_poll_at = now + timedelta(seconds=jittered(state.poll_interval))
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error saving feed state for {source.name}: {str(e)}")
+        db.session.rollback()
+
+def next_poll_interval(previous, entries=None):
+    """Seconds until the next poll of a feed, from the publish rate of its recent entries.
+
+    The mean gap between the newest ``FEED_RATE_SAMPLES`` entries is halved (about two
+    polls per new item) and averaged with the previous interval to damp bursts. Without
+    usable entries - an unchanged or failed fetch - the previous interval backs off.
+    """
+    previous = previous or FEED_POLL_DEFAULT
+    published = sorted((entry_published(entry) for entry in (entries or [])[:FEED_RATE_SAMPLES]
+                        if entry_published(entry)), reverse=True)
+    if len(published) >= 2:
+        mean_gap = (published[0] - published[-1]).total_seconds() / (len(published) - 1)
+        interval = (previous + mean_gap / 2) / 2
+    else:
+        interval = previous * FEED_POLL_BACKOFF
+    return min(FEED_POLL_MAX, max(FEED_POLL_MIN, interval))
+
+def jittered(interval):
+    """Spread ``interval`` by +/- ``FEED_POLL_JITTER`` so sources do not poll in lockstep"""
+    return interval * random.uniform(1 - FEED_POLL_JITTER, 1 + FEED_POLL_JITTER)
+
+def due_sources(now=None):
+    """RSS sources whose next poll time has passed (or that were never polled)"""
+    now = now or datetime.utcnow()
+    rss_sources = [source for source in SOURCES if source.is_rss]
+    try:
+        states = {state.source_name: state for state in
+                  FeedState.query.filter(FeedState.source_name.in_([source.name for source in rss_sources])).all()}
+    except Exception as e:
+        logger.error(f"Error loading feed poll schedule: {str(e)}")
+        return rss_sources
+    return [source for source in rss_sources
+            if source.name not in states or not states[source.name].next_poll_at
+            or states[source.name].next_poll_at <= now]
+
+def claim_sources(sources, now=None):
+    """Push each source's next poll out by a back-off interval before it is fetched.
+
+    A successful poll replaces this with an estimate from the feed itself, so only a
+    fetch or parse that fails keeps the back-off and stops it being retried every tick.
+    """
+    now = now or datetime.utcnow()
+    try:
+        for source in sources:
+            state = get_feed_state(source.name)
+            state.next_poll_at = now + timedelta(seconds=jittered(next_poll_interval(state.poll_interval)))
+        db.session.commit()
+    except Exception as e:
+        logger.error(f"Error claiming sources for polling: {str(e)}")
+        db.session.rollback()
+
+def entry_key(entry):
+    """Stable identity of a feed entry: its GUID, falling back to the link"""
+    return entry.get('id') or entry.get('link')
+
+def entry_published(entry, default=None):
+    """Published (or updated) time of a feed entry, or ``default`` when it has none"""
+    if entry.get('published_parsed'):
+        return datetime.fromtimestamp(time.mktime(entry.published_parsed))
+    if entry.get('updated_parsed'):
+        return datetime.fromtimestamp(time.mktime(entry.updated_parsed))
+    return default
+
+def iter_new_entries(source, entries, watermark_id, watermark_published=None):
+    """Yield feed entries newer than the stored watermark, newest first.
+
+    Feeds list their newest items first, so the walk stops at the watermark entry. When
+    that entry has dropped out of the feed the walk stops at the first entry published
+    before it instead, and without its published time (or when the feed is not
+    newest-first) every entry is yielded; already stored articles are then filtered
+    out by URL.
+    """
+    entries = entries[:FEED_ENTRY_LIMIT]
+    newest_first = (len(entries) < 2 or
+                    (entry_published(entries[0], datetime.min) >= entry_published(entries[-1], datetime.min)))
+    use_watermark = bool(watermark_id) and newest_first
+    if use_watermark and all(entry_key(entry) != watermark_id for entry in entries):
+        if watermark_published:
+            logger.info(f"Watermark for {source.name} not found in feed, stopping at its published time")
+        else:
+            logger.info(f"Watermark for {source.name} not found in feed, scanning all {len(entries)} entries")
+    else:
+        watermark_published = None
+
+    for walked, entry in enumerate(entries):
+        if use_watermark and entry_key(entry) == watermark_id:
+            logger.info(f"Reached watermark for {source.name} after {walked} new entries")
+            return
+        if use_watermark and watermark_published and entry_published(entry, datetime.max) < watermark_published:
+            return
+        yield entry
+
+def settled_watermark(walked, failed_keys):
+    """The watermark to store after a walk: the newest walked entry that every entry
+    which failed is newer than, so failed entries are walked again on the next poll.
+
+    Returns None, keeping the stored watermark, when the oldest walked entry failed
+    or nothing was walked.
+    """
+    position = 0
+    for index, entry in enumerate(walked):
+        if entry_key(entry) in failed_keys:
+            position = index + 1
+    if position >= len(walked):
+        return None
+    entry = walked[position]
+    return entry_key(entry), entry_published(entry)
+
+def fetch_feed(source, timeout=FEED_FETCH_TIMEOUT, validators=None):
+    """Download the raw feed body for a source, giving up once the per-source deadline passes.
+
+    ``validators`` holds the ETag/Last-Modified from the previous download; when given, the
+    request is conditional and an unchanged feed comes back as a bodiless 304 result.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    try:
+        logger.info(f"Fetching RSS feed from {source.name} at {source.url}")
+        headers = dict(FEED_HEADERS)
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+        with get_client().get(source.url, timeout=timeout, headers=headers, stream=True) as response:
+            if response.status_code == 304:
+                elapsed = time.monotonic() - started
+                logger.info(f"RSS feed from {source.name} not modified since last fetch")
+                return FeedFetchResult(source, status_code=304, elapsed=elapsed,
+                                       etag=response.headers.get('ETag'),
+                                       last_modified=response.headers.get('Last-Modified'))
+            response.raise_for_status()
+            chunks = []
+            for chunk in response.iter_content(chunk_size=65536):
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"exceeded {timeout}s deadline while reading body")
+                chunks.append(chunk)
+            elapsed = time.monotonic() - started
+            logger.info(f"Fetched RSS feed from {source.name} with status code {response.status_code} in {elapsed:.2f}s")
+            return FeedFetchResult(source, content=b''.join(chunks), status_code=response.status_code, elapsed=elapsed,
+                                   etag=response.headers.get('ETag'),
+                                   last_modified=response.headers.get('Last-Modified'))
+    except Exception as e:
+        logger.error(f"Failed to fetch RSS feed for {source.name}: {str(e)}")
+        return FeedFetchResult(source, error=str(e), elapsed=time.monotonic() - started)
+
+def fetch_feeds(sources, timeout=FEED_FETCH_TIMEOUT, budget=FEED_FETCH_BUDGET, validators=None):
+    """Download all feeds concurrently and return their results keyed by source name.
+
+    Each source gets ``timeout`` seconds from the moment its download starts (retries
+    included) and the whole round is capped by ``budget``; sources still in flight when
+    either limit passes are abandoned and reported as failed. ``validators`` maps source
+    names to their stored cache validators (see ``fetch_feed``).
+    """
+    results = {}
+    validators = validators or {}
+    if not sources:
+        return results
+
+    started = time.monotonic()
+    round_deadline = started + budget
+    start_times = {}
+
+    def timed_fetch(source):
+        start_times[source.name] = time.monotonic()
+        return fetch_feed(source, timeout, validators.get(source.name))
+
+    executor = ThreadPoolExecutor(max_workers=min(FEED_FETCH_WORKERS, len(sources)))
+    futures = {executor.submit(timed_fetch, source): source for source in sources}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+            expired = set()
+            for future in pending:
+                source = futures[future]
+                source_started = start_times.get(source.name)
+                if now >= round_deadline:
+                    reason = f"exceeded {budget}s fetch budget"
+                elif source_started is not None and now >= source_started + timeout:
+                    reason = f"exceeded {timeout}s deadline"
+                else:
+                    continue
+                future.cancel()
+                logger.error(f"Fetching {source.name} abandoned: {reason}")
+                results[source.name] = FeedFetchResult(source, error=reason, elapsed=now - started)
+                expired.add(future)
+            pending -= expired
+            if not pending:
+                break
+
+            wake_at = min([round_deadline] + [start_times[futures[f].name] + timeout
+                                              for f in pending if futures[f].name in start_times])
+            done, pending = wait(pending, timeout=max(0.0, wake_at - now), return_when=FIRST_COMPLETED)
+            for future in done:
+                results[futures[future].name] = future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    logger.info(f"Fetched {len(sources)} feeds in {time.monotonic() - started:.2f}s")
+    return results
+
 def scrape_rss_feed(source):
     """Scrape articles from RSS feed with improved content extraction"""
+    validators = load_feed_validators([source.name]).get(source.name)
+    return process_feed(source, fetch_feed(source, validators=validators))
+
+class ParsedFeed:
+    """New article rows of one changed feed, waiting to be stored with the rest of the run"""
+    def __init__(self, source, result, rows, watermark, entries, complete=True):
+        self.source = source
+        self.result = result
+        self.rows = rows
+        self.watermark = watermark
+        self.entries = entries
+        # False when an entry failed and has to be retried on the next poll
+        self.complete = complete
+
+def process_feed(source, result):
+    """Parse a downloaded feed and store any new articles"""
+    parsed = parse_feed(source, result)
+    if parsed is None:
+        return 0
+    return store_feeds([parsed]).get(source.name, 0)
+
+def parse_feed(source, result):
+    """Parse a downloaded feed into a ``ParsedFeed`` of its new article rows.
+
+    Returns None when there is nothing to store: the feed is unchanged (its fetch is
+    recorded here) or could not be parsed (it is fetched again on the next poll).
+    """
     try:
-        logger.info(f"Fetching RSS feed from {source.name} at {source.url}")
+        if result is not None and result.not_modified:
+            logger.info(f"Skipping {source.name}: feed unchanged (304 Not Modified)")
+            record_feed_fetch(source, result, changed=False)
+            return None
+
+        if result is None or not result.ok:
+            logger.error(f"No feed content available for {source.name}")
+            return None
+
+        stored_state = FeedState.query.filter_by(source_name=source.name).first()
+        if stored_state and stored_state.body_hash and stored_state.body_hash == result.body_hash:
+            logger.info(f"Skipping {source.name}: feed body identical to last fetch")
+            record_feed_fetch(source, result, changed=False)
+            return None
+
         try:
-            session = create_session()
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            }
-            response = session.get(source.url, timeout=15, headers=headers)
-            response.raise_for_status()
-            feed_content = response.content
-            logger.info(f"Fetching RSS feed from {source.name} with status code: {response.status_code}")
-            logger.info(f"Found {len(feedparser.parse(feed_content).entries)} entries in {source.name} feed")
+            feed_content = result.content
             logger.debug(f"First 500 chars of RSS content from {source.name}: {feed_content[:500]}")
             feed = feedparser.parse(feed_content)
 
             if hasattr(feed, 'status') and feed.status != 200:
                 logger.error(f"Feed status error for {source.name}: {feed.status} - {feed.get('bozo_exception', 'No details')}")
-                return 0
+                return None
 
             if not feed or not hasattr(feed, 'entries'):
                 logger.error(f"Invalid feed structure from {source.name}")
-                return 0
+                return None
 
             if feed.bozo:
                 logger.error(f"Error parsing RSS feed for {source.name}: {feed.bozo_exception}")
-                return 0
+                return None
 
             if not hasattr(feed, 'entries'):
                 logger.error(f"No entries found in feed for {source.name}")
-                return 0
+                return None
         except Exception as e:
-            logger.error(f"Failed to fetch RSS feed for {source.name}: {str(e)}")
-            return 0
+            logger.error(f"Failed to parse RSS feed for {source.name}: {str(e)}")
+            return None
 
         if not feed.entries:
             logger.warning(f"No entries found in {source.name} RSS feed")
-            return 0
+            return None
 
-        articles_added = 0
         logger.info(f"Found {len(feed.entries)} entries in {source.name} RSS feed")
 
         source_metrics = init_source_metrics(source.name)
         if not source_metrics:
             logger.error(f"Failed to initialize source metrics for {source.name}")
-            return 0
+            return None
 
-        initial_count = source_metrics.article_count
-        logger.info(f"Current article count for {source.name}: {initial_count}")
+        logger.info(f"Current article count for {source.name}: {source_metrics.article_count}")
 
         try:
             # Get current time for comparison
             current_time = datetime.utcnow()
             cutoff_time = current_time - timedelta(days=90)  # Get articles from last 90 days
-            
-            # Increase feed limit and remove date filtering initially
-            feed.entries = feed.entries[:500]  # Get more entries from feed
-            
-            for entry in feed.entries:
-                try:
-                    article_url = entry.link
-                    published_date = None
 
-                    # Try to get the published date
-                    if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                        published_date = datetime.fromtimestamp(time.mktime(entry.published_parsed))
-                    elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-                        published_date = datetime.fromtimestamp(time.mktime(entry.updated_parsed))
-                    else:
-                        published_date = current_time
+            # Walk entries down to the watermark, keeping only those inside the date window
+            watermark_id = stored_state.last_entry_id if stored_state else None
+            watermark_published = stored_state.last_entry_published if stored_state else None
+            walked = list(iter_new_entries(source, feed.entries, watermark_id, watermark_published))
+            # Entries that failed, rather than were stored or deliberately skipped;
+            # the watermark stays behind them so they are retried
+            failed_keys = set()
+            candidates = []
+            for entry in walked:
+                try:
+                    published_date = entry_published(entry, current_time)
 
                     # Skip old articles
                     if published_date < cutoff_time:
                         continue
 
+                    candidates.append(entry)
+                except Exception as e:
+                    logger.error(f"Error reading entry date from {source.name}: {str(e)}")
+                    continue
+
+            # One set-based lookup for the whole feed instead of a query per entry
+            seen_urls = find_existing_urls([entry.get('link') for entry in candidates if entry.get('link')])
+
+            raw_entries = []
+            new_rows = []
+            for entry in candidates:
+                try:
+                    article_url = entry.link
                     logger.debug(f"Processing article from {source.name}: {article_url}")
-                    logger.debug(f"Article date: {published_date}")
 
-                    exists = Article.query.filter_by(source_url=article_url).first()
-                    if exists:
+                    if article_url in seen_urls:
                         logger.debug(f"Article already exists: {article_url}")
                         continue
+                    seen_urls.add(article_url)  # Also drops repeats within the same feed
 
                     try:
                         content = entry.get('description', '')
@@ -303,75 +526,136 @@ def scrape_rss_feed(source):
                         logger.warning(f"No content found for {article_url} from {source.name}")
                         continue
 
-                    cleaned_content = clean_html_content(content)
-                    summary = clean_html_content(entry.get('summary', ''))
+                    raw_entries.append((entry, article_url, content, entry.get('summary', '')))
+
+                except Exception as e:
+                    logger.error(f"Error processing article from {source.name}: {str(e)}")
+                    failed_keys.add(entry_key(entry))
+                    continue
+
+            # Clean content and summaries for all new entries in one batch
+            cleaned = clean_html_batch(html for _, _, content, summary in raw_entries for html in (content, summary))
+            for index, (entry, article_url, _, _) in enumerate(raw_entries):
+                try:
+                    cleaned_content, summary = cleaned[2 * index], cleaned[2 * index + 1]
                     if not summary:
                         summary = ' '.join(cleaned_content.split('. ')[:3]) + '.'
 
                     logger.info(f"Adding new article from {source.name}: {entry.title}")
 
-                    new_article = Article(
-                        title=entry.title,
-                        content=cleaned_content,
-                        summary=summary,
-                        source_url=article_url,
-                        source_name=source.name,
-                        created_at=datetime.utcnow(),
-                        category='Crypto Markets'
-                    )
-
-                    db.session.add(new_article)
-                    source_metrics.article_count += 1
-                    source_metrics.last_updated = datetime.utcnow()
-                    articles_added += 1
-
-                    try:
-                        broadcast_new_article(new_article)
-                    except Exception as e:
-                        logger.error(f"Error broadcasting new article: {str(e)}")
+                    new_rows.append({
+                        'title': entry.title,
+                        'content': cleaned_content,
+                        'summary': summary,
+                        'source_url': article_url,
+                        'source_name': source.name,
+                        'created_at': datetime.utcnow(),
+                        'category': 'Crypto Markets'
+                    })
 
                 except Exception as e:
                     logger.error(f"Error processing article from {source.name}: {str(e)}")
+                    failed_keys.add(entry_key(entry))
                     continue
 
-            if articles_added > 0:
-                db.session.commit()
-                logger.info(f"Successfully committed {articles_added} articles and updated metrics for {source.name}")
-                logger.info(f"Updated article count for {source.name} from {initial_count} to {source_metrics.article_count}")
-            return articles_added
+            return ParsedFeed(source, result, new_rows, settled_watermark(walked, failed_keys), feed.entries,
+                              complete=not failed_keys)
 
         except Exception as e:
             logger.error(f"Error in RSS feed processing for {source.name}: {str(e)}")
             db.session.rollback()
-            return 0
+            return None
 
     except Exception as e:
         logger.error(f"Error fetching RSS feed from {source.name}: {str(e)}")
-        return 0
+        return None
+
+def store_feeds(feeds):
+    """Store the new rows of every ``ParsedFeed`` in ``feeds``, then record each feed's fetch.
+
+    All rows go in one multi-row insert and one broadcast. Returns the number of
+    articles stored per source name; if the insert fails no fetch is recorded, so the
+    feeds are processed again on the next poll.
+    """
+    added = {feed.source.name: 0 for feed in feeds}
+    rows = []
+    urls = set()
+    for feed in feeds:
+        for row in feed.rows:
+            # First feed wins when two sources carry the same article
+            if row['source_url'] not in urls:
+                urls.add(row['source_url'])
+                rows.append(row)
+    if rows:
+        try:
+            # The unique index on source_url backs up each feed's lookup against
+            # concurrent writers, so only inserted rows come back
+            inserted = insert_ignore_returning(Article, rows, Article.source_url, Article.id, Article.source_url)
+            ids = {row.source_url: row.id for row in inserted}
+            stored_rows = [dict(row, id=ids[row['source_url']]) for row in rows if row['source_url'] in ids]
+            for row in stored_rows:
+                added[row['source_name']] += 1
+            now = datetime.utcnow()
+            metrics = NewsSourceMetrics.query.filter(NewsSourceMetrics.source_name.in_(list(added))).all()
+            for source_metrics in metrics:
+                if added[source_metrics.source_name]:
+                    source_metrics.article_count += added[source_metrics.source_name]
+                    source_metrics.last_updated = now
+            db.session.commit()
+            logger.info(f"Successfully committed {len(stored_rows)} articles from {len(feeds)} feeds "
+                        f"and updated metrics: {added}")
+        except Exception as e:
+            logger.error(f"Error storing articles from {len(feeds)} feeds: {str(e)}")
+            db.session.rollback()
+            return {}
+
+        # Only after commit, so clients receive real IDs for rows that exist
+        broadcast_new_articles(stored_rows)
+
+    for feed in feeds:
+        record_feed_fetch(feed.source, feed.result, changed=True, watermark=feed.watermark, entries=feed.entries,
+                          complete=feed.complete)
+    return added
 
 def scrape_articles():
     """Scrape articles from cryptocurrency news sources"""
+    return scrape_sources(SOURCES)
+
+def scrape_due_sources(sources):
+    """Poll only ``sources`` (see ``due_sources``), claiming them first"""
+    claim_sources(sources)
+    return scrape_sources(sources)
+
+def scrape_sources(sources):
+    """Fetch, parse and store new articles for ``sources``"""
     logger.info("Starting article scraping")
-    logger.info(f"Scraping from sources: {[source.name for source in SOURCES]}")
-    total_articles_added = 0
+    logger.info(f"Scraping from sources: {[source.name for source in sources]}")
 
-    for source in SOURCES:
+    for source in sources:
         init_source_metrics(source.name)
 
-    for source in SOURCES:
+    # Download every feed in parallel, parse them in source order, then store the
+    # new articles of every feed together
+    rss_sources = [source for source in sources if source.is_rss]
+    validators = load_feed_validators([source.name for source in rss_sources])
+    fetch_results = fetch_feeds(rss_sources, validators=validators)
+
+    parsed_feeds = []
+    for source in sources:
         try:
             if source.is_rss:
-                articles_added = scrape_rss_feed(source)
+                parsed = parse_feed(source, fetch_results.get(source.name))
+                if parsed is not None:
+                    parsed_feeds.append(parsed)
             else:
                 logger.info(f"Skipping non-RSS source {source.name}")
                 continue
 
-            total_articles_added += articles_added
-
         except Exception as e:
             logger.error(f"Error processing source {source.name}: {str(e)}")
             continue
 
+    total_articles_added = sum(store_feeds(parsed_feeds).values()) if parsed_feeds else 0
     logger.info(f"Completed article scraping. Added {total_articles_added} new articles")
     return total_articles_added
 
@@ -0,0 +1,121 @@
+"""Per-symbol sentiment counts kept incrementally in hourly buckets.
+
+Signals weigh the labelled articles mentioning a symbol over the last
+``SIGNAL_WINDOW_HOURS``. Instead of scanning that window's articles, each
+``symbol_sentiment_bucket`` row counts the positive, neutral and negative
+articles mentioning one symbol that were created within one hour. NLP processing
+adjusts the rows in O(mentions) as articles are labelled or re-labelled, and the
+window is read as a sum over a fixed number of buckets per symbol, however many
+articles it holds.
+
+The window starts on an hour boundary, so it covers up to an hour more than a
+scan from exactly ``now - SIGNAL_WINDOW_HOURS`` would. Labels or mentions changed
+outside NLP processing (by hand, say) aren't seen; ``rebuild`` recounts the window.
+"""
+import logging
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import delete, func, select
+
+from database import db, insert_accumulate
+from models import Article, ArticleSymbol, SymbolSentimentBucket
+
+logger = logging.getLogger(__name__)
+
+# Hours of articles behind a signal
+SIGNAL_WINDOW_HOURS = int(os.environ.get('SIGNAL_WINDOW_HOURS', 72))
+# The sentiment labels counted, each a SymbolSentimentBucket column
+LABELS = ('positive', 'neutral', 'negative')
+
+def bucket_hour(created_at):
+    """Start of the hour ``created_at`` falls in"""
+    return created_at.replace(minute=0, second=0, microsecond=0)
+
+def window_start(now=None):
+    """Start of the first bucket in the signal window ending at ``now``"""
+    return bucket_hour((now or datetime.utcnow()) - timedelta(hours=SIGNAL_WINDOW_HOURS))
+
+def mention_deltas(before, after):
+    """Bucket count changes, ``{(symbol, hour, label): change}``, when an article's
+    ``(symbol, created_at, label)`` mentions go from ``before`` to ``after``"""
+    deltas = Counter()
+    for sign, mentions in ((-1, before), (1, after)):
+        for symbol, created_at, label in mentions:
+            if label in LABELS and created_at is not None:
+                deltas[(symbol, bucket_hour(created_at), label)] += sign
+    return {key: change for key, change in deltas.items() if change}
+
+def apply_deltas(deltas):
+    """Add ``mention_deltas`` to the buckets; committed with the caller's transaction"""
+    rows = {}
+    for (symbol, hour, label), change in deltas.items():
+        row = rows.setdefault((symbol, hour), {'symbol': symbol, 'hour': hour, **dict.fromkeys(LABELS, 0)})
+        row[label] += change
+    if rows:
+        db.session.execute(insert_accumulate(SymbolSentimentBucket, ['symbol', 'hour'], LABELS), list(rows.values()))
+
+def window_counts(symbols, now=None):
+    """``{symbol: {label: articles}}`` over the signal window, summed from the buckets in one query"""
+    counts = {symbol: {} for symbol in symbols}
+    if not counts:
+        return counts
+    rows = db.session.execute(
+        select(SymbolSentimentBucket.symbol,
+               *(func.sum(getattr(SymbolSentimentBucket, label)) for label in LABELS))
+        .where(SymbolSentimentBucket.symbol.in_(list(counts)), SymbolSentimentBucket.hour >= window_start(now))
+        .group_by(SymbolSentimentBucket.symbol)
+    )
+    for symbol, *totals in rows:
+        counts[symbol] = {label: total for label, total in zip(LABELS, totals) if total}
+    return counts
+
+def scan_counts(symbols, now=None):
+    """The same counts as ``window_counts``, from a scan of the window's articles"""
+    counts = {symbol: {} for symbol in symbols}
+    if not counts:
+        return counts
+    rows = db.session.execute(
+        select(ArticleSymbol.symbol, Article.sentiment_label, func.count())
+        .join(Article, Article.id == ArticleSymbol.article_id)
+        .where(ArticleSymbol.symbol.in_(list(counts)), ArticleSymbol.created_at >= window_start(now),
+               Article.sentiment_label.in_(LABELS))
+        .group_by(ArticleSymbol.symbol, Article.sentiment_label)
+    )
+    for symbol, label, count in rows:
+        counts[symbol][label] = count
+    return counts
+
+def prune(now=None):
+    """Delete the buckets that have left the signal window, returning how many"""
+    result = db.session.execute(delete(SymbolSentimentBucket).where(SymbolSentimentBucket.hour < window_start(now)))
+    return result.rowcount
+
+def rebuild(now=None):
+    """Recount the signal window's buckets from scratch and commit them; returns the rows written"""
+    try:
+        db.session.execute(delete(SymbolSentimentBucket))
+        mentions = db.session.execute(
+            select(ArticleSymbol.symbol, ArticleSymbol.created_at, Article.sentiment_label)
+            .join(Article, Article.id == ArticleSymbol.article_id)
+            .where(ArticleSymbol.created_at >= window_start(now))
+            .execution_options(yield_per=10000)
+        )
+        deltas = mention_deltas([], mentions)
+        apply_deltas(deltas)
+        db.session.commit()
+        buckets = len({(symbol, hour) for symbol, hour, _ in deltas})
+        logger.info(f"Rebuilt {buckets} sentiment buckets from {sum(deltas.values())} mentions")
+        return buckets
+    except Exception as e:
+        logger.error(f"Error rebuilding sentiment buckets: {str(e)}")
+        db.session.rollback()
+        raise
+
+def verify(symbols, now=None):
+    """Symbols whose bucket counts differ from a scan of the window's articles"""
+    now = now or datetime.utcnow()
+    buckets = window_counts(symbols, now)
+    scanned = scan_counts(symbols, now)
+    return [symbol for symbol in symbols if buckets[symbol] != scanned[symbol]]
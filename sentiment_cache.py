@@ -0,0 +1,107 @@
+"""Content-hash keyed cache of sentiment scores.
+
+A score depends only on the normalized text and the lexicon, so entries are keyed by
+a hash of ``normalize_text(text)`` together with ``LEXICON_VERSION``. Syndicated
+copies, feed re-edits that only touch markup or case, and articles sent back for
+reprocessing reuse the stored score instead of being analysed again. A bounded
+in-memory LRU sits in front of the ``sentiment_cache`` table.
+"""
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+from database import db, insert_ignore
+from models import SentimentCacheEntry
+from text_analysis import LEXICON_VERSION, normalize_text
+
+logger = logging.getLogger(__name__)
+
+# Entries kept in the in-memory LRU tier
+SENTIMENT_CACHE_SIZE = int(os.environ.get('SENTIMENT_CACHE_SIZE', 20000))
+# Hashes per IN (...) lookup, below SQLite's bound-parameter limit
+LOOKUP_BATCH = 500
+
+def text_key(text):
+    """Cache key of ``text``: the sha256 of its normalized form"""
+    return hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest()
+
+class SentimentCache:
+    """Two-tier ``text_key -> (score, label)`` cache for one lexicon version"""
+    def __init__(self, size=SENTIMENT_CACHE_SIZE, version=LEXICON_VERSION):
+        self.size = size
+        self.version = version
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def get_many(self, keys):
+        """Cached ``(score, label)`` for each of ``keys`` that has one, memory first"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        missing = []
+        with self.lock:
+            for key in keys:
+                if key in self.entries:
+                    self.entries.move_to_end(key)
+                    found[key] = self.entries[key]
+                else:
+                    missing.append(key)
+        for start in range(0, len(missing), LOOKUP_BATCH):
+            rows = db.session.execute(
+                db.select(SentimentCacheEntry.text_hash, SentimentCacheEntry.sentiment_score,
+                          SentimentCacheEntry.sentiment_label)
+                .where(SentimentCacheEntry.lexicon_version == self.version,
+                       SentimentCacheEntry.text_hash.in_(missing[start:start + LOOKUP_BATCH]))
+            )
+            for key, score, label in rows:
+                found[key] = (score, label)
+        with self.lock:
+            for key in missing:
+                if key in found:
+                    self._remember(key, found[key])
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, scores):
+        """Store ``{key: (score, label)}``; the rows are committed with the caller's transaction"""
+        if not scores:
+            return
+        db.session.execute(insert_ignore(SentimentCacheEntry), [
+            {'text_hash': key, 'lexicon_version': self.version, 'sentiment_score': score,
+             'sentiment_label': label}
+            for key, (score, label) in scores.items()
+        ])
+        with self.lock:
+            for key, value in scores.items():
+                self._remember(key, value)
+
+    def invalidate_stale(self):
+        """Delete the entries stored under any other lexicon version, returning how many"""
+        result = db.session.execute(
+            db.delete(SentimentCacheEntry).where(SentimentCacheEntry.lexicon_version != self.version)
+        )
+        return result.rowcount
+
+    def clear(self):
+        """Forget the in-memory tier"""
+        with self.lock:
+            self.entries.clear()
+
+_cache = None
+
+def get_cache():
+    """Return the process-wide ``SentimentCache``, creating it on first use"""
+    global _cache
+    if _cache is None:
+        _cache = SentimentCache()
+    return _cache
@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+# The app binds its database at import, so point it at a scratch SQLite file first.
+# Always overridden: the tests drop indexes and empty every table
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='newstest-'), 'test.db')}"
+
+@pytest.fixture
+def app_context():
+    """An app context over empty tables"""
+    from app import app, db
+    with app.app_context():
+        yield app
+        db.session.rollback()
+        for table in reversed(db.metadata.sorted_tables):
+            db.session.execute(table.delete())
+        db.session.commit()
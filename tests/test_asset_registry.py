@@ -0,0 +1,14 @@
+from asset_registry import ASSETS, AssetRegistry
+
+def test_lookup_resolves_names_and_leaves_missing_fields_none():
+    registry = AssetRegistry({'BTC': 'bitcoin', 'RPL': 'rocket-pool'}, {'BTC': 'Bitcoin', 'MELANX': 'Melania Token'},
+                             {'btc': 'BTC'})
+    assert registry.lookup('rocket pool').symbol == 'RPL'
+    assert registry.lookup('RPL').name is None
+    assert registry.lookup('melania token').coin_id is None
+    assert registry.lookup('btc') == registry.assets['BTC']
+    assert registry.lookup('unknown') is None
+    assert registry.lookup('') is None
+
+def test_every_priced_asset_has_a_coin_id():
+    assert all(ASSETS.lookup(symbol).coin_id == coin_id for symbol, coin_id in ASSETS.coin_ids.items())
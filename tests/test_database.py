@@ -0,0 +1,35 @@
+from sqlalchemy import inspect, text
+
+from database import create_unique_indexes, db, ensure_indexes
+from models import Article, ArticleSymbol, DistributionLog
+
+def seed(url, title):
+    article = Article(title=title, content='content', source_url=url, source_name='Test')
+    db.session.add(article)
+    db.session.flush()
+    return article
+
+def article_indexes():
+    return {index['name'] for index in inspect(db.engine).get_indexes('article')}
+
+def test_unique_index_migration_removes_duplicates(app_context):
+    db.session.execute(text('DROP INDEX ix_article_source_url'))
+    first = seed('https://example.com/a', 'first')
+    duplicate = seed('https://example.com/a', 'duplicate')
+    other = seed('https://example.com/b', 'other')
+    db.session.add(ArticleSymbol(article_id=duplicate.id, symbol='BTC', mention_count=1, in_title=False))
+    db.session.add(DistributionLog(article_id=duplicate.id, platform='telegram', status='sent'))
+    db.session.commit()
+
+    # Startup leaves the missing unique index to the migration instead of deleting rows
+    ensure_indexes()
+    assert 'ix_article_source_url' not in article_indexes()
+    assert db.session.scalar(db.select(db.func.count()).select_from(Article)) == 3
+
+    assert create_unique_indexes() == ['ix_article_source_url']
+
+    assert 'ix_article_source_url' in article_indexes()
+    assert db.session.scalars(db.select(Article.id).order_by(Article.id)).all() == [first.id, other.id]
+    assert db.session.scalars(db.select(ArticleSymbol.article_id)).all() == []
+    # Distribution history is kept, moved onto the surviving article
+    assert db.session.scalars(db.select(DistributionLog.article_id)).all() == [first.id]
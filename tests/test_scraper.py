@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import scraper
+from database import db
+from models import Article, FeedState, NewsSourceMetrics
+from scraper import FeedFetchResult, NewsSource, process_feed
+
+SOURCE = NewsSource('Test Feed', 'https://example.com/rss', is_rss=True)
+
+def build_feed(numbers, start):
+    """RSS document with one item per story number, newest (highest) first"""
+    items = ''.join(
+        f"<item><title>Story {number}</title>"
+        f"<link>https://example.com/story-{number}</link><guid>https://example.com/story-{number}</guid>"
+        f"<pubDate>{format_datetime((start + timedelta(minutes=number)).replace(tzinfo=timezone.utc), usegmt=True)}</pubDate>"
+        f"<description><![CDATA[<p>Bitcoin story {number}.</p>]]></description></item>"
+        for number in sorted(numbers, reverse=True)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Test</title><link>https://example.com/</link><description>Test</description>{items}</channel></rss>"
+    ).encode('utf-8')
+
+def stored_urls():
+    return set(db.session.scalars(db.select(Article.source_url)))
+
+def test_failed_entry_is_retried_on_next_poll(app_context, monkeypatch):
+    start = datetime.utcnow() - timedelta(days=1)
+    clean_html_batch = scraper.clean_html_batch
+
+    def fail_story_2(documents):
+        documents = list(documents)
+        cleaned = clean_html_batch(documents)
+        return [None if 'story 2.' in document else text for document, text in zip(documents, cleaned)]
+
+    monkeypatch.setattr(scraper, 'clean_html_batch', fail_story_2)
+    assert process_feed(SOURCE, FeedFetchResult(SOURCE, content=build_feed([1, 2, 3], start), status_code=200)) == 2
+    assert 'https://example.com/story-2' not in stored_urls()
+    state = FeedState.query.filter_by(source_name=SOURCE.name).one()
+    assert state.last_entry_id == 'https://example.com/story-1'
+
+    assert state.body_hash is None
+
+    # The identical body is walked again rather than skipped as unchanged
+    monkeypatch.setattr(scraper, 'clean_html_batch', clean_html_batch)
+    assert process_feed(SOURCE, FeedFetchResult(SOURCE, content=build_feed([1, 2, 3], start), status_code=200)) == 1
+    assert stored_urls() == {f'https://example.com/story-{number}' for number in (1, 2, 3)}
+    db.session.refresh(state)
+    assert state.last_entry_id == 'https://example.com/story-3'
+    assert state.body_hash is not None
+
+    assert process_feed(SOURCE, FeedFetchResult(SOURCE, content=build_feed([1, 2, 3, 4], start), status_code=200)) == 1
+    db.session.refresh(state)
+    assert state.last_entry_id == 'https://example.com/story-4'
+
+def test_watermark_falls_back_to_published_time(app_context):
+    start = datetime.utcnow() - timedelta(days=1)
+    assert process_feed(SOURCE, FeedFetchResult(SOURCE, content=build_feed([1, 2, 3], start), status_code=200)) == 3
+    db.session.execute(db.delete(Article).where(Article.source_url == 'https://example.com/story-1'))
+    db.session.commit()
+
+    # Story 3, the watermark, dropped out of the feed: nothing published before it is walked again
+    assert process_feed(SOURCE, FeedFetchResult(SOURCE, content=build_feed([1, 4], start), status_code=200)) == 1
+    assert 'https://example.com/story-1' not in stored_urls()
+
+def test_scrape_stores_every_feed_in_one_insert_and_broadcast(app_context, monkeypatch):
+    start = datetime.utcnow() - timedelta(days=1)
+    other = NewsSource('Other Feed', 'https://example.com/other', is_rss=True)
+    bodies = {SOURCE.name: build_feed([1, 2], start), other.name: build_feed([2, 3], start)}
+    monkeypatch.setattr(scraper, 'fetch_feeds', lambda sources, validators=None: {
+        source.name: FeedFetchResult(source, content=bodies[source.name], status_code=200) for source in sources})
+    broadcasts = []
+    monkeypatch.setattr(scraper, 'broadcast_new_articles', broadcasts.append)
+
+    assert scraper.scrape_sources([SOURCE, other]) == 3
+    assert len(broadcasts) == 1
+    assert sorted(row['source_url'] for row in broadcasts[0]) == [
+        f'https://example.com/story-{number}' for number in (1, 2, 3)]
+    counts = {metrics.source_name: metrics.article_count for metrics in NewsSourceMetrics.query}
+    assert counts == {SOURCE.name: 2, other.name: 1}
+    assert {state.source_name for state in FeedState.query if state.last_entry_id} == {SOURCE.name, other.name}
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select, update
+
+import sentiment_buckets
+from database import db
+from models import Article, ArticleSymbol, SymbolSentimentBucket
+from nlp_processor import backfill_symbols_if_missing, replace_symbols, track_sentiment
+
+SYMBOLS = ['BTC', 'ETH', 'SOL']
+
+def grouped_counts(symbols):
+    """The window's counts straight from a GROUP BY over the labelled articles"""
+    counts = {symbol: {} for symbol in symbols}
+    rows = db.session.execute(
+        select(ArticleSymbol.symbol, Article.sentiment_label, func.count())
+        .join(Article, Article.id == ArticleSymbol.article_id)
+        .where(Article.created_at >= sentiment_buckets.window_start(),
+               Article.sentiment_label.in_(sentiment_buckets.LABELS))
+        .group_by(ArticleSymbol.symbol, Article.sentiment_label)
+    )
+    for symbol, label, count in rows:
+        counts[symbol][label] = count
+    return counts
+
+def label(article_ids, mentions, labels):
+    """Label ``article_ids`` the way NLP processing does: buckets, mentions, then the articles"""
+    articles = db.session.execute(
+        select(Article.id, Article.created_at, Article.sentiment_label).where(Article.id.in_(article_ids))).all()
+    created = {article_id: created_at for article_id, created_at, _ in articles}
+    stored = {article_id: stored_label for article_id, _, stored_label in articles}
+    updates = [{'id': article_id, 'sentiment_label': labels[article_id]} for article_id in article_ids]
+    track_sentiment(article_ids, mentions, created, stored, updates)
+    replace_symbols(article_ids, mentions, created)
+    for item in updates:
+        db.session.execute(update(Article).where(Article.id == item['id']).values(sentiment_label=item['sentiment_label']))
+    db.session.commit()
+
+def test_window_counts_match_grouped_articles(app_context):
+    now = datetime.utcnow()
+    ages = [1, 5, 30, 30, 60, 71, 100, 200]
+    articles = [Article(title=f'story {i}', content='content', source_url=f'https://example.com/{i}',
+                        source_name='Test', created_at=now - timedelta(hours=age)) for i, age in enumerate(ages)]
+    db.session.add_all(articles)
+    db.session.commit()
+    ids = [article.id for article in articles]
+    mentions = [{'article_id': article_id, 'symbol': symbol, 'mention_count': 1, 'in_title': False}
+                for index, article_id in enumerate(ids) for symbol in SYMBOLS[:1 + index % 3]]
+    labels = dict(zip(ids, ['positive', 'negative', 'neutral', 'positive', 'negative', 'positive', 'neutral', 'positive']))
+
+    label(ids, mentions, labels)
+    assert sentiment_buckets.window_counts(SYMBOLS) == grouped_counts(SYMBOLS)
+
+    # Re-labelling an article and changing its mentions moves its counts between buckets
+    label([ids[1]], [{'article_id': ids[1], 'symbol': 'SOL', 'mention_count': 2, 'in_title': True}],
+          {ids[1]: 'positive'})
+    counts = sentiment_buckets.window_counts(SYMBOLS)
+    assert counts == grouped_counts(SYMBOLS)
+    assert sum(sum(by_label.values()) for by_label in counts.values()) == 11
+
+    # rebuild recounts buckets that drifted from the articles
+    db.session.execute(update(SymbolSentimentBucket).values(positive=SymbolSentimentBucket.positive + 5))
+    db.session.commit()
+    assert sentiment_buckets.window_counts(SYMBOLS) != grouped_counts(SYMBOLS)
+    sentiment_buckets.rebuild()
+    assert sentiment_buckets.window_counts(SYMBOLS) == grouped_counts(SYMBOLS)
+
+def test_startup_backfills_an_empty_symbol_index(app_context):
+    now = datetime.utcnow()
+    articles = [Article(title=f'Bitcoin story {i}', content='Bitcoin and Ethereum moved.',
+                        source_url=f'https://example.com/{i}', source_name='Test',
+                        created_at=now - timedelta(hours=i), sentiment_label='positive') for i in range(3)]
+    db.session.add_all(articles)
+    db.session.commit()
+
+    assert backfill_symbols_if_missing(workers=0) == 6
+    assert sentiment_buckets.window_counts(SYMBOLS) == grouped_counts(SYMBOLS)
+    # Once anything is indexed the startup pass leaves the index alone
+    assert backfill_symbols_if_missing(workers=0) == 0
@@ -0,0 +1,35 @@
+import os
+import subprocess
+import sys
+
+from worker_pool import WorkerPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_map_returns_results_in_order():
+    pool = WorkerPool(2)
+    try:
+        assert pool.map(sorted, [3, 1, 2, 5, 4], chunksize=2) == [1, 3, 2, 5, 4]
+    finally:
+        pool.close()
+
+def test_workers_do_not_import_the_app(tmp_path):
+    # Workers must not re-run the entry script, which like main.py imports the app
+    (tmp_path / 'probe.py').write_text(
+        'import sys\n'
+        'def loaded(names):\n'
+        '    return [name in sys.modules for name in names]\n'
+    )
+    (tmp_path / 'entry.py').write_text(
+        'import app\n'
+        'import probe\n'
+        'from worker_pool import WorkerPool\n'
+        'pool = WorkerPool(1)\n'
+        "print(pool.map(probe.loaded, ['app', 'scheduler', 'probe']))\n"
+        'pool.close()\n'
+    )
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    result = subprocess.run([sys.executable, str(tmp_path / 'entry.py')], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == '[False, False, True]'
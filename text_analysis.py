@@ -0,0 +1,307 @@
+"""Lexicon sentiment scoring and asset name formatting for article text.
+
+Kept free of app and database imports so ``analyze_articles`` can run in worker
+processes without booting the web application.
+"""
+import hashlib
+import logging
+import re
+
+
+from asset_registry import CRYPTO_ASSETS
+
+logger = logging.getLogger(__name__)
+
+# Crypto-specific sentiment words and phrases with weights
+POSITIVE_PATTERNS = {
+    # Price movements (weight: 1.0)
+    'surge': 1.2, 'rally': 1.2, 'jump': 1.0, 'gain': 1.0, 'soar': 1.2, 'rise': 1.0, 'climb': 1.0, 
+    'peak': 1.0, 'record high': 1.5, 'breakout': 1.2, 'outperform': 1.2,
+    # Market sentiment (weight: 1.2)
+    'bullish': 1.5, 'optimistic': 1.2, 'confident': 1.2, 'strong': 1.0, 'positive': 1.0, 
+    'opportunity': 1.0, 'support': 1.0,
+    # Adoption/Development (weight: 1.5)
+    'adoption': 1.5, 'partnership': 1.5, 'launch': 1.2, 'upgrade': 1.2, 'integration': 1.2, 
+    'milestone': 1.2, 'development': 1.2, 'progress': 1.2, 'innovation': 1.5, 'breakthrough': 1.5,
+    'success': 1.2, 'approval': 1.3, 'etf': 1.8, 'advance': 1.5, 'ready': 1.3,
+}
+
+NEGATIVE_PATTERNS = {
+    # Price movements (weight: 1.5)
+    'crash': 2.0, 'plunge': 1.8, 'drop': 1.2, 'fall': 1.2, 'decline': 1.2, 'tumble': 1.5, 
+    'slump': 1.5, 'correction': 1.2, 'collapse': 2.0, 'tank': 1.8,
+    # Market sentiment (weight: 1.2)
+    'bearish': 1.5, 'pessimistic': 1.2, 'fear': 1.5, 'concern': 1.2, 'worry': 1.2, 
+    'uncertain': 1.0, 'volatile': 1.2, 'panic': 1.8,
+    # Security/Risk (weight: 2.0)
+    'hack': 2.0, 'breach': 2.0, 'scam': 2.0, 'fraud': 2.0, 'vulnerability': 1.5, 
+    'exploit': 1.5, 'risk': 1.2, 'attack': 1.8,
+    # Regulatory (weight: 1.5)
+    'ban': 1.8, 'restrict': 1.5, 'crack down': 1.8, 'investigate': 1.2, 'sue': 1.5, 
+    'lawsuit': 1.5, 'illegal': 1.5, 'regulation': 1.2,
+    # Market problems (weight: 1.8)
+    'sell-off': 1.8, 'dump': 1.8, 'liquidation': 1.8, 'margin call': 1.8, 'default': 1.8,
+    'loss': 1.5, 'bearish': 1.5
+}
+
+NEGATION_WORDS = ('not', 'no', "n't", 'never', 'without', 'rarely')
+
+# Adjusted thresholds with higher sensitivity to negative sentiment
+POSITIVE_THRESHOLD = 0.2  # Lowered threshold for positive sentiment
+NEGATIVE_THRESHOLD = -0.1  # More sensitive to negative sentiment
+
+# Identifies the lexicon contents; changes whenever a pattern, weight or negation changes
+LEXICON_VERSION = hashlib.sha1(repr((sorted(POSITIVE_PATTERNS.items()), sorted(NEGATIVE_PATTERNS.items()),
+                                     NEGATION_WORDS)).encode('utf-8')).hexdigest()[:12]
+
+_NON_WORD = re.compile(r'[^\w\s-]')
+# The same substitution as a translate table, exact for ASCII text and far cheaper than the regex
+_ASCII_NON_WORD = str.maketrans({code: ' ' for code in range(128) if _NON_WORD.match(chr(code))})
+
+def normalize_text(text):
+    """Lower-case ``text`` and replace special characters except hyphens with spaces"""
+    text = text.lower()
+    if text.isascii():
+        return text.translate(_ASCII_NON_WORD)
+    return _NON_WORD.sub(' ', text)
+
+class LexiconMatcher:
+    """The sentiment lexicon flattened into one scan plan.
+
+    Each distinct pattern is checked with a plain substring search, keeping the
+    semantics of the original per-sentence ``pattern in sentence`` checks (a pattern
+    counts once per sentence, also inside longer words). CPython's substring search
+    runs in C and beats a single alternation regex over this lexicon several times
+    over, so the plan is a flat tuple rather than a compiled pattern.
+    """
+    def __init__(self, positive, negative, negations):
+        # Positive entries first, each group in lexicon order, so score sums are reproducible
+        self.entries = tuple([(pattern, weight, True) for pattern, weight in positive.items()] +
+                             [(pattern, weight, False) for pattern, weight in negative.items()])
+        self.negations = tuple(negations)
+
+    def find(self, sentence):
+        """``(pattern, weight, is_positive)`` for every lexicon pattern occurring in ``sentence``"""
+        return [entry for entry in self.entries if entry[0] in sentence]
+
+    def has_negation(self, sentence):
+        return any(negation in sentence for negation in self.negations)
+
+_matchers = {}
+
+def get_matcher():
+    """The matcher for the current lexicon, built once per ``LEXICON_VERSION``"""
+    matcher = _matchers.get(LEXICON_VERSION)
+    if matcher is None:
+        matcher = _matchers[LEXICON_VERSION] = LexiconMatcher(POSITIVE_PATTERNS, NEGATIVE_PATTERNS, NEGATION_WORDS)
+    return matcher
+
+def analyze_sentiment(text):
+    """Analyze sentiment using crypto-specific lexicon and contextual analysis"""
+    try:
+        if not text or not isinstance(text, str):
+            logger.warning("Invalid text input for sentiment analysis")
+            return 0.0, 'neutral'
+
+        logger.debug(f"Starting sentiment analysis for text (length: {len(text)})")
+        matcher = get_matcher()
+
+        # Clean and normalize text
+        text = normalize_text(text)  # Remove special characters except hyphens
+        sentences = [s.strip() for s in text.split('.') if s.strip()]
+
+        weighted_pos_score = 0
+        weighted_neg_score = 0
+        total_matches = 0
+
+        for sentence in sentences:
+            hits = matcher.find(sentence)
+            if not hits:
+                continue
+
+            has_negation = matcher.has_negation(sentence)
+
+            # Calculate weighted sentiment scores; no per-pattern logging, its formatting
+            # costs more than the scoring
+            for pattern, weight, is_positive in hits:
+                if is_positive:
+                    if has_negation:
+                        weighted_neg_score += weight
+                    else:
+                        weighted_pos_score += weight
+                elif has_negation:
+                    weighted_pos_score += weight * 0.5  # Negated negative is less positive
+                else:
+                    weighted_neg_score += weight
+            total_matches += len(hits)
+
+        if total_matches == 0:
+            logger.debug("No sentiment patterns found in text")
+            return 0.0, 'neutral'
+
+        # Calculate weighted sentiment score
+        sentiment_score = (weighted_pos_score - weighted_neg_score) / max(total_matches, 1)
+
+        logger.debug(f"Final sentiment analysis results:"
+                    f"\n- Positive score: {weighted_pos_score}"
+                    f"\n- Negative score: {weighted_neg_score}"
+                    f"\n- Total matches: {total_matches}"
+                    f"\n- Final score: {sentiment_score:.4f}")
+
+        if sentiment_score > POSITIVE_THRESHOLD:
+            logger.info(f"Positive sentiment detected with score {sentiment_score:.4f}")
+            return sentiment_score, 'positive'
+        elif sentiment_score < NEGATIVE_THRESHOLD:
+            logger.info(f"Negative sentiment detected with score {sentiment_score:.4f}")
+            return sentiment_score, 'negative'
+        else:
+            logger.info(f"Neutral sentiment detected with score {sentiment_score:.4f}")
+            return sentiment_score, 'neutral'
+
+    except Exception as e:
+        logger.error(f"Error in sentiment analysis: {str(e)}", exc_info=True)
+        return 0.0, 'neutral'
+
+def trie_regex(words):
+    """Regex source matching any of ``words``, shaped as a trie so each position is tried
+    once per character rather than once per word; longer words are tried before their prefixes"""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+class AssetNormalizer:
+    """Formats asset mentions with one combined regex, compiled once.
+
+    All aliases go into a single word-bounded, case-insensitive trie-shaped
+    alternation, so each text is scanned once whatever the number of aliases,
+    and a callback looks up the replacement for the alias that matched.
+    """
+    def __init__(self, assets):
+        self.assets = dict(assets)
+        aliases = list(dict.fromkeys(alias.lower() for alias in self.assets))
+        # Only show the asset name, without ticker symbols
+        self.replacements = {alias: alias.title() for alias in aliases}
+        self.pattern = re.compile(r'\b(?:' + trie_regex(aliases) + r')\b', re.IGNORECASE)
+        # Case-insensitive matching also folds characters such as 'ſ' that lower() keeps,
+        # so those rare matches are resolved by which alias group matches them
+        self.aliases = aliases
+        self.alias_groups = re.compile('|'.join(f'({re.escape(alias)})' for alias in aliases), re.IGNORECASE)
+
+    def _replace(self, match):
+        text = match.group(0)
+        replacement = self.replacements.get(text.lower())
+        if replacement is None:
+            replacement = self.replacements[self.aliases[self.alias_groups.fullmatch(text).lastindex - 1]]
+        return replacement
+
+    def normalize(self, text):
+        """Replace every mention of a covered asset with its title-cased name"""
+        return self.pattern.sub(self._replace, text)
+
+    def extended(self, crypto_ids):
+        """A normalizer also covering every symbol and coin id of a ``{symbol: coin_id}``
+        mapping such as ``ASSETS.coin_ids``.
+
+        Many tickers are ordinary words ('near', 'one', 'link'), so this is opt-in.
+        """
+        assets = dict(self.assets)
+        for symbol, coin_id in crypto_ids.items():
+            assets.setdefault(symbol.lower(), symbol)
+            assets.setdefault(coin_id.lower(), symbol)
+        return AssetNormalizer(assets)
+
+ASSET_NORMALIZER = AssetNormalizer(CRYPTO_ASSETS)
+
+def format_assets(text, normalizer=None):
+    """Replace every mention of a crypto asset with its title-cased name"""
+    return (normalizer or ASSET_NORMALIZER).normalize(text)
+
+class SymbolMatcher:
+    """Finds the crypto symbols an article mentions, by ticker or by coin name.
+
+    Tickers match case-sensitively as whole words ('SOL', not 'sol' or 'SOLUTION'),
+    as do the title-cased forms ``format_assets`` writes ('Sol'); coin names match
+    whole words in any case. Both go into one trie-shaped regex, so a text is
+    scanned once.
+    """
+    def __init__(self, names):
+        # {symbol: coin name or None}
+        self.tickers = {}
+        self.names = {}
+        for symbol, name in names.items():
+            self.tickers[symbol] = symbol
+            if name:
+                self.names.setdefault(name.lower(), symbol)
+        for alias, symbol in CRYPTO_ASSETS.items():
+            if symbol not in names:
+                continue
+            if alias == symbol.lower():
+                self.tickers.setdefault(alias.title(), symbol)
+            else:
+                self.names.setdefault(alias, symbol)
+        self.pattern = re.compile(r'\b(?:(?i:' + trie_regex(self.names) + ')|'
+                                  + trie_regex(self.tickers) + r')\b')
+
+    def symbol(self, text):
+        """The symbol a matched ticker or name stands for, or None"""
+        return self.tickers.get(text) or self.names.get(text.lower())
+
+    def mentions(self, title, content):
+        """``{symbol: (mention_count, in_title)}`` for every symbol in ``title`` or ``content``"""
+        found = {}
+        for text, in_title in ((title or '', True), (content or '', False)):
+            for match in self.pattern.finditer(text):
+                symbol = self.symbol(match.group(0))
+                if symbol is None:
+                    continue  # A case fold lower() doesn't reproduce, such as 'ſ'
+                count, seen_in_title = found.get(symbol, (0, False))
+                found[symbol] = (count + 1, seen_in_title or in_title)
+        return found
+
+def symbol_rows(matcher, article_id, title, content):
+    """``ArticleSymbol`` column values for each symbol an article mentions"""
+    return [{'article_id': article_id, 'symbol': symbol, 'mention_count': count, 'in_title': in_title}
+            for symbol, (count, in_title) in matcher.mentions(title, content).items()]
+
+def index_symbols(rows, matcher):
+    """Pool task: the ``ArticleSymbol`` rows for a chunk of ``(id, title, content)`` rows"""
+    return [item for article_id, title, content in rows
+            for item in symbol_rows(matcher, article_id, title, content)]
+
+def analyze_articles(rows, normalizer=None, format_text=True, symbols=None):
+    """Pool task: score and format one chunk of ``(id, title, content, cached)`` article rows.
+
+    ``cached`` is the ``(score, label)`` already known for the row's text, or None to
+    score it. Returns the column updates for each article, keyed by ``id``, the ids of
+    articles skipped for having no usable content, and, given a ``SymbolMatcher`` as
+    ``symbols``, the ``ArticleSymbol`` rows of the chunk. ``normalizer`` defaults to
+    ``ASSET_NORMALIZER``; with ``format_text`` off only the sentiment is updated.
+    """
+    valid = [row for row in rows if row[2] and isinstance(row[2], str)]
+    skipped = [row[0] for row in rows if not (row[2] and isinstance(row[2], str))]
+    # Combine title and content for better context; identical texts are scored once
+    texts = list(dict.fromkeys(f"{title}. {content}" for _, title, content, cached in valid if cached is None))
+    scores = {text: analyze_sentiment(text) for text in texts}
+    updates = []
+    for article_id, title, content, cached in valid:
+        score, label = cached if cached is not None else scores[f"{title}. {content}"]
+        update = {'id': article_id, 'sentiment_score': score, 'sentiment_label': label,
+                  'lexicon_version': LEXICON_VERSION}
+        if format_text:
+            update['title'] = format_assets(title, normalizer)
+            update['content'] = format_assets(content, normalizer)
+        updates.append(update)
+    mentions = index_symbols([row[:3] for row in valid], symbols) if symbols is not None else []
+    return updates, skipped, mentions
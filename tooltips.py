@@ -0,0 +1,83 @@
+"""Crypto price tooltips in article summaries, shared by the dashboard and load-more endpoints.
+
+A ``TooltipInjector`` is built once per price snapshot: every symbol goes into one
+compiled, word-bounded, case-insensitive trie regex and each tooltip's HTML is
+rendered up front, so annotating a summary is a single ``sub`` pass with no
+regex compilation. Annotated summaries are cached per ``(article_id, snapshot version)``.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from markupsafe import Markup, escape
+
+from text_analysis import trie_regex
+
+# Annotated summaries kept in memory
+TOOLTIP_CACHE_SIZE = int(os.environ.get('TOOLTIP_CACHE_SIZE', 2000))
+
+def price_snapshot(prices):
+    """The ``(symbol, price_usd, percent_change_24h)`` values a set of tooltips is built from"""
+    return tuple(sorted((price.symbol, price.price_usd, price.percent_change_24h) for price in prices))
+
+def tooltip_html(symbol, price_usd, percent_change_24h):
+    """The tooltip markup that replaces a mention of ``symbol``"""
+    return (
+        f'<span class="crypto-tooltip">{symbol}'
+        f'<div class="tooltip-content">'
+        f'<span class="tooltip-price">${price_usd:.2f}</span>'
+        f'<span class="tooltip-change {("positive" if percent_change_24h > 0 else "negative")}">'
+        f'{percent_change_24h:.1f}%</span>'
+        f'</div></span>'
+    )
+
+class TooltipInjector:
+    """Adds price tooltips for one price snapshot to escaped summaries in one regex pass"""
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+        self.version = hashlib.sha1(repr(snapshot).encode('utf-8')).hexdigest()[:12]
+        self.tooltips = {symbol.upper(): tooltip_html(symbol, price_usd, change)
+                         for symbol, price_usd, change in snapshot}
+        # Not after '&' or '#', so escaped entities such as '&amp;' are never rewritten
+        self.pattern = re.compile(r'(?<![&#])\b(?:' + trie_regex(self.tooltips) + r')\b', re.IGNORECASE)
+
+    def _replace(self, match):
+        text = match.group(0)
+        return self.tooltips.get(text.upper(), text)
+
+    def annotate(self, summary):
+        """``summary``, escaped, with every whole-word symbol mention replaced by its tooltip"""
+        escaped = str(escape(summary))
+        if not self.tooltips:
+            return Markup(escaped)
+        return Markup(self.pattern.sub(self._replace, escaped))
+
+_lock = threading.Lock()
+_injector = None
+_annotations = OrderedDict()
+
+def get_injector(prices):
+    """The injector for ``prices``, rebuilt only when the price snapshot changes"""
+    global _injector
+    snapshot = price_snapshot(prices)
+    with _lock:
+        if _injector is None or _injector.snapshot != snapshot:
+            _injector = TooltipInjector(snapshot)
+            _annotations.clear()
+        return _injector
+
+def annotate_summary(injector, article_id, summary):
+    """The summary of an article annotated by ``injector``, cached per article and price snapshot"""
+    key = (article_id, injector.version)
+    with _lock:
+        if key in _annotations:
+            _annotations.move_to_end(key)
+            return _annotations[key]
+    annotated = injector.annotate(summary)
+    with _lock:
+        _annotations[key] = annotated
+        while len(_annotations) > TOOLTIP_CACHE_SIZE:
+            _annotations.popitem(last=False)
+    return annotated
@@ -0,0 +1,153 @@
+"""Process pool for CPU-bound work started from the eventlet-patched web process.
+
+Kept free of app and database imports; the functions sent to it must be
+module-level (or ``functools.partial`` of one) so the workers can unpickle them.
+"""
+import atexit
+import logging
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Connection, wait
+
+logger = logging.getLogger(__name__)
+
+def _worker_main(conn):
+    """Worker process loop: apply each received function to its chunk until told to stop"""
+    # An eventlet-patched parent leaves the pipe non-blocking, which an unpatched worker can't read
+    os.set_blocking(conn.fileno(), True)
+    while True:
+        try:
+            message = conn.recv()
+            if message is None:
+                break
+            index, function, chunk = message
+            try:
+                conn.send((index, True, function(chunk)))
+            except (EOFError, OSError):
+                raise
+            except Exception as e:
+                conn.send((index, False, e))
+        except (EOFError, OSError):
+            break  # The parent closed the pool or went away
+
+def _worker_entry(fd):
+    """Entry point of a worker process, run on the inherited pipe descriptor ``fd``"""
+    _worker_main(Connection(fd))
+
+# Workers start here rather than through multiprocessing's spawn, which re-imports the
+# parent's ``__main__`` (main.py, and with it the app and scheduler) in every child
+WORKER_COMMAND = 'import sys; from worker_pool import _worker_entry; _worker_entry(int(sys.argv[1]))'
+
+def _start_worker(conn):
+    """Start a worker process reading from the child end ``conn`` of a pipe"""
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(path or os.getcwd() for path in sys.path)
+    return subprocess.Popen([sys.executable, '-c', WORKER_COMMAND, str(conn.fileno())],
+                            pass_fds=(conn.fileno(),), stdin=subprocess.DEVNULL, env=env)
+
+class WorkerPool:
+    """Worker processes that run chunks of work sent to them over pipes.
+
+    Not a ``ProcessPoolExecutor``: under eventlet its feeder and result threads become
+    green threads on one hub, so a feeder blocked writing a full pipe also stops the
+    results being drained, and the whole process deadlocks. Here a chunk is only sent
+    to an idle worker, which is always reading, and results are awaited with
+    ``multiprocessing.connection.wait``, which eventlet makes cooperative.
+    """
+    def __init__(self, workers):
+        # Fresh interpreters: forking the eventlet-patched web process is unsafe
+        self.workers = []
+        for _ in range(workers):
+            parent_conn, child_conn = multiprocessing.Pipe()
+            process = _start_worker(child_conn)
+            child_conn.close()
+            self.workers.append((process, parent_conn))
+
+    def __len__(self):
+        return len(self.workers)
+
+    def map_chunks(self, function, chunks):
+        """Return ``[function(chunk) for chunk in chunks]``, computed across the workers.
+
+        An exception raised by ``function`` is re-raised here once every chunk already
+        sent has come back, so the pipes are left empty for the next call.
+        """
+        results = [None] * len(chunks)
+        pending = list(range(len(chunks) - 1, -1, -1))
+        idle = list(self.workers)
+        busy = {}
+        error = None
+        while (pending and error is None) or busy:
+            while pending and idle and error is None:
+                process, conn = idle.pop()
+                # eventlet's green os.write retries EPIPE forever, so never write to a dead worker
+                if process.poll() is not None:
+                    raise EOFError(f"worker {process.pid} exited with {process.returncode}")
+                index = pending.pop()
+                conn.send((index, function, chunks[index]))
+                busy[conn] = process
+            for conn in wait(list(busy)):
+                index, ok, result = conn.recv()
+                if ok:
+                    results[index] = result
+                else:
+                    error = error or result
+                idle.append((busy.pop(conn), conn))
+        if error is not None:
+            raise error
+        return results
+
+    def map(self, function, items, chunksize=1):
+        """Apply ``function`` to chunks of ``items``; ``function`` takes and returns a list"""
+        chunks = [items[i:i + chunksize] for i in range(0, len(items), chunksize)]
+        return [result for chunk in self.map_chunks(function, chunks) for result in chunk]
+
+    def close(self):
+        for process, conn in self.workers:
+            try:
+                if process.poll() is None:
+                    conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        for process, _ in self.workers:
+            try:
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.terminate()
+                process.wait()
+
+class SharedPool:
+    """A ``WorkerPool`` started on first use and shared by one module's callers.
+
+    Hold ``lock`` around ``get`` and the work sent to the pool.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.pool = None
+        self.lock = threading.Lock()
+        _shared_pools.append(self)
+
+    def get(self, workers):
+        """Return the pool, (re)creating it for the requested worker count"""
+        if self.pool is None or len(self.pool) != workers:
+            self.shutdown()
+            self.pool = WorkerPool(workers)
+            logger.info(f"Started {self.name} pool with {workers} workers")
+        return self.pool
+
+    def shutdown(self):
+        """Stop the pool, if one is running"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
+
+_shared_pools = []
+
+@atexit.register
+def _shutdown_shared_pools():
+    for shared in _shared_pools:
+        shared.shutdown()